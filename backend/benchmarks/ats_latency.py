@@ -0,0 +1,176 @@
+"""
+Latency and throughput of /api/v1/ats/analyze at fixed concurrency levels.
+
+Runs the API in-process on the stub LLM provider, so no network access or
+API key is needed, only a MongoDB at MONGO_URI. Every request uses a unique
+job description so the analysis cache and single-flight layer don't hide
+the LLM path. The load generator runs on its own thread and event loop, so
+the reported event-loop lag is the server's alone.
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.ats_latency \\
+        --levels 1 8 32 --requests 200 --stub-latency 0.2 --stub-jitter 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from .health_check_under_load import ANALYZE_PATH, percentile
+
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "ats_corpus.json"
+RESUMES_PATH = "/api/v1/resumes/"
+
+
+class LoopLagMonitor:
+    """Samples how late a periodic sleep wakes up on the running loop."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def create_resume(base_url: str) -> str:
+    corpus = json.loads(FIXTURE_PATH.read_text())
+    suffix = uuid.uuid4().hex[:8]
+    payload = {
+        **corpus["resumes"]["backend"],
+        "user_id": "benchmark",
+        "resume_info": f"benchmark-{suffix}",
+        "name": f"Benchmark {suffix}",
+    }
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post(RESUMES_PATH, json=payload)
+        response.raise_for_status()
+        return response.json()["_id"]
+
+
+async def drive(
+    base_url: str, resume_id: str, concurrency: int, total: int
+) -> tuple[list[float], list[int], float]:
+    """Send `total` analyze requests with `concurrency` of them in flight."""
+    latencies: list[float] = []
+    statuses: list[int] = []
+    remaining = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient):
+        for _ in remaining:
+            payload = {
+                "resume_id": resume_id,
+                "job_title": "Backend Engineer",
+                "job_description": (
+                    f"Python, FastAPI and MongoDB experience required. #{uuid.uuid4()}"
+                ),
+                "mode": "llm",
+            }
+            started = time.perf_counter()
+            response = await client.post(ANALYZE_PATH, json=payload)
+            latencies.append(time.perf_counter() - started)
+            statuses.append(response.status_code)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=httpx.Timeout(120.0), limits=limits
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def in_thread(coroutine):
+    """Run a coroutine on a fresh event loop in a separate thread."""
+    return asyncio.to_thread(asyncio.run, coroutine)
+
+
+async def run(args):
+    import uvicorn
+
+    from src.main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    monitor = LoopLagMonitor()
+    monitor.start()
+
+    print(
+        f"{'concurrency':>11} {'requests':>8} {'errors':>6} {'req/s':>8} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9} {'lag p99':>9} {'lag max':>9}"
+    )
+    all_lag: list[float] = []
+    try:
+        resume_id = await in_thread(create_resume(base_url))
+        for concurrency in args.levels:
+            monitor.samples.clear()
+            latencies, statuses, elapsed = await in_thread(
+                drive(base_url, resume_id, concurrency, args.requests)
+            )
+            ms = [s * 1000 for s in latencies]
+            lag = [s * 1000 for s in monitor.samples] or [0.0]
+            all_lag.extend(lag)
+            print(
+                f"{concurrency:>11} {len(ms):>8} "
+                f"{sum(1 for s in statuses if s != 200):>6} "
+                f"{len(ms) / elapsed:>8.1f} "
+                f"{percentile(ms, 50):>7.1f}ms {percentile(ms, 95):>7.1f}ms "
+                f"{percentile(ms, 99):>7.1f}ms "
+                f"{percentile(lag, 99):>7.2f}ms {max(lag):>7.2f}ms"
+            )
+        print(f"mean loop lag over the run: {statistics.fmean(all_lag):.3f}ms")
+    finally:
+        await monitor.stop()
+        server.should_exit = True
+        await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stub-latency", type=float, default=0.2)
+    parser.add_argument("--stub-jitter", type=float, default=0.05)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    os.environ.update(
+        LLM_PROVIDER="stub",
+        LLM_STUB_LATENCY_SECONDS=str(args.stub_latency),
+        LLM_STUB_JITTER_SECONDS=str(args.stub_jitter),
+        LLM_STUB_ERROR_RATE=str(args.stub_error_rate),
+        RATE_LIMIT_ENABLED="false",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark response compression: bytes on the wire and CPU per response.
+
+Compresses the JSON of a full Resume and of resume and job application list
+pages with the encoders CompressionMiddleware uses, at several gzip levels
+and brotli qualities (brotli only when the package is installed), and adds
+the time the bytes take on a link of ``--bandwidth-mbps``. No database is
+needed:
+
+    uv run python -m benchmarks.compression --page-size 100
+"""
+
+import argparse
+import statistics
+import time
+
+from src.compression import BrotliEncoder, GzipEncoder, brotli
+
+from .serialization import payloads
+
+
+def encoders(args) -> dict[str, object]:
+    configs = {"identity": None}
+    configs.update({f"gzip-{level}": level for level in args.gzip_levels})
+    if brotli is not None:
+        configs.update({f"br-{quality}": quality for quality in args.brotli_qualities})
+    return configs
+
+
+def compress(label: str, setting, body: bytes) -> bytes:
+    if setting is None:
+        return body
+    if label.startswith("br"):
+        return BrotliEncoder(setting).finish(body)
+    return GzipEncoder(setting).finish(body)
+
+
+def cpu_per_response(label: str, setting, body: bytes, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.process_time()
+        compress(label, setting, body)
+        samples.append(time.process_time() - started)
+    return statistics.median(samples) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0)
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 4, 11])
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed; gzip only")
+    print(f"page size {args.page_size}, {args.bandwidth_mbps:g} Mbit/s link")
+    print(
+        f"{'payload':<26} {'encoding':>9} {'bytes':>8} {'ratio':>6} "
+        f"{'cpu':>10} {'wire':>9}"
+    )
+    for name, (_, payload, exclude) in payloads(args.page_size).items():
+        body = payload.model_dump_json(by_alias=True, exclude=exclude).encode()
+        for label, setting in encoders(args).items():
+            size = len(compress(label, setting, body))
+            cpu_us = cpu_per_response(label, setting, body, args.repeats)
+            wire_ms = size * 8 / (args.bandwidth_mbps * 1000)
+            print(
+                f"{name:<26} {label:>9} {size:>8} {len(body) / size:>5.1f}x "
+                f"{cpu_us:>8.0f}us {wire_ms:>7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark list-query throughput against MongoDB connection pool size.
+
+Seeds ``--size`` applications spread over ``--users`` users in a scratch
+database (``applywise_benchmark`` by default, dropped first), then, for each
+pool size, opens a warmed MongoConnection and has ``--concurrency`` tasks
+read pages of applications for ``--seconds`` seconds, as concurrent list
+requests would. Reports pages per second and the median and p99 latency.
+Pass ``--compressors zlib`` to measure with wire compression:
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.connection_pool \\
+        --pool-sizes 1 4 16 64 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from beanie import init_beanie
+
+from src.database import MongoConnection
+from src.pagination import paginate
+from src.routers.job_application.models import JobApplication, JobApplicationListItem
+from src.routers.job_application.service import build_job_application_query
+
+from .search import seed
+
+
+async def read_pages(users: int, deadline: float, worker: int) -> list[float]:
+    samples = []
+    page = 0
+    while time.perf_counter() < deadline:
+        query = build_job_application_query(user_id=f"user-{(worker + page) % users}")
+        started = time.perf_counter()
+        await paginate(
+            JobApplication,
+            query,
+            "application_date",
+            "desc",
+            page % 5 + 1,
+            20,
+            projection_model=JobApplicationListItem,
+        )
+        samples.append(time.perf_counter() - started)
+        page += 1
+    return samples
+
+
+async def measure(args, pool_size: int) -> tuple[float, float, float]:
+    options = {"maxPoolSize": pool_size, "minPoolSize": pool_size}
+    if args.compressors:
+        options["compressors"] = args.compressors
+    connection = MongoConnection(
+        os.getenv("MONGO_URI", "mongodb://localhost:27017"),
+        database_name=args.database,
+        **options,
+    )
+    await init_beanie(connection.database, document_models=[JobApplication])
+    await connection.warm_up()
+
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    results = await asyncio.gather(
+        *(
+            read_pages(args.users, deadline, worker)
+            for worker in range(args.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    connection.close()
+
+    samples = sorted(sample for worker in results for sample in worker)
+    return (
+        len(samples) / elapsed,
+        statistics.median(samples) * 1000,
+        samples[int(len(samples) * 0.99)] * 1000,
+    )
+
+
+async def run(args):
+    connection = MongoConnection(
+        os.getenv("MONGO_URI", "mongodb://localhost:27017"),
+        database_name=args.database,
+    )
+    await connection.client.drop_database(args.database)
+    await init_beanie(connection.database, document_models=[JobApplication])
+    await seed(args.size, args.users)
+
+    print(
+        f"{args.size} documents, {args.users} users; {args.concurrency} concurrent "
+        f"readers of pages of 20, compressors: {args.compressors or 'none'}"
+    )
+    print(f"{'pool size':>9} {'pages/s':>9} {'median':>10} {'p99':>10}")
+    for pool_size in args.pool_sizes:
+        throughput, median_ms, p99_ms = await measure(args, pool_size)
+        print(f"{pool_size:>9} {throughput:>9.0f} {median_ms:>8.2f}ms {p99_ms:>8.2f}ms")
+
+    await connection.client.drop_database(args.database)
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument(
+        "--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 100]
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--compressors", default="")
+    parser.add_argument("--database", default="applywise_benchmark")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
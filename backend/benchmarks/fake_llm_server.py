@@ -0,0 +1,95 @@
+"""
+Fake OpenAI-compatible LLM server used by the benchmarks.
+
+Serves ``POST /openai/v1/chat/completions`` (the path the Groq SDK calls) and
+answers every request with a canned ATS analysis after an artificial delay.
+Streaming requests get the same answer as SSE chunks spread over the delay.
+
+Run it and point the API at it:
+
+    uv run python -m benchmarks.fake_llm_server --port 9000 --latency 2.0
+    GROQ_BASE_URL=http://127.0.0.1:9000 GROQ_API_KEY=fake uv run fastapi run src/main.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+
+CANNED_ANALYSIS = {
+    "relevance_score": 72,
+    "skills": ["Python", "FastAPI", "MongoDB", "Docker"],
+    "total_years_of_experience": 3,
+    "project_categories": ["Backend", "Web Development"],
+}
+
+
+def create_app(latency: float) -> FastAPI:
+    app = FastAPI()
+
+    async def stream_chunks(body: dict):
+        content = json.dumps(CANNED_ANALYSIS)
+        pieces = [content[i : i + 8] for i in range(0, len(content), 8)]
+        for piece in pieces:
+            await asyncio.sleep(latency / len(pieces))
+            chunk = {
+                "id": "chatcmpl-stream",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {"index": 0, "delta": {"content": piece}, "finish_reason": None}
+                ],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(body: dict):
+        if body.get("stream"):
+            return StreamingResponse(
+                stream_chunks(body), media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(latency)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": json.dumps(CANNED_ANALYSIS),
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--latency", type=float, default=2.0, help="Seconds to wait per completion"
+    )
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Load test: health-check latency while /api/v1/ats/analyze is saturated.
+
+Measures health-check latency on an idle server, then again while
+``--concurrency`` clients hammer the analyze endpoint. With a non-blocking LLM
+client the two distributions should be roughly the same.
+
+    uv run python -m benchmarks.fake_llm_server --latency 2.0 &
+    GROQ_BASE_URL=http://127.0.0.1:9000 GROQ_API_KEY=fake RATE_LIMIT_ENABLED=false \\
+        uv run fastapi run src/main.py &
+    uv run python -m benchmarks.health_check_under_load --resume-id <id>
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+HEALTH_CHECK_PATH = "/api/v1/health-check/"
+ANALYZE_PATH = "/api/v1/ats/analyze"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label: str, samples: list[float]):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<24} n={len(ms):<5} "
+        f"mean={statistics.fmean(ms):8.2f}ms "
+        f"p50={percentile(ms, 50):8.2f}ms "
+        f"p95={percentile(ms, 95):8.2f}ms "
+        f"p99={percentile(ms, 99):8.2f}ms"
+    )
+
+
+async def probe_health_check(
+    client: httpx.AsyncClient, duration: float, interval: float
+) -> list[float]:
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(HEALTH_CHECK_PATH)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def saturate_analyze(
+    client: httpx.AsyncClient, resume_id: str, stop: asyncio.Event, counter: list
+):
+    payload = {
+        "resume_id": resume_id,
+        "job_title": "Backend Engineer",
+        "job_description": "Python, FastAPI and MongoDB experience required.",
+    }
+    while not stop.is_set():
+        response = await client.post(ANALYZE_PATH, json=payload)
+        counter.append(response.status_code)
+
+
+async def run(args):
+    timeout = httpx.Timeout(60.0)
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=timeout, limits=limits
+    ) as client:
+        idle = await probe_health_check(client, args.duration, args.interval)
+
+        stop = asyncio.Event()
+        statuses: list[int] = []
+        workers = [
+            asyncio.create_task(
+                saturate_analyze(client, args.resume_id, stop, statuses)
+            )
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.sleep(1.0)
+        loaded = await probe_health_check(client, args.duration, args.interval)
+        stop.set()
+        await asyncio.gather(*workers)
+
+    report("health-check (idle)", idle)
+    report("health-check (loaded)", loaded)
+    print(
+        f"analyze requests completed: {len(statuses)} "
+        f"(non-200: {sum(1 for s in statuses if s != 200)})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--resume-id", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Micro-benchmark of one resume list page, full documents vs projection.
+
+The legacy path hydrated every ``Resume`` with all of its sections, dumped it
+back to a dict and validated a ``ResumeListItem`` from that; the service now
+projects the query onto ``ResumeListItem``. Reports CPU time per page and the
+BSON bytes the server sends, against a scratch database (``applywise_benchmark``
+by default, dropped first):
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.list_projection
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import bson
+from beanie import PydanticObjectId, init_beanie
+from beanie.odm.utils.projection import get_projection
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.pagination import sort_spec
+from src.routers.resumes.models import Resume, ResumeListItem
+from src.routers.resumes.service import fetch_resumes
+
+from .prompt_size import realistic_resume
+
+
+async def legacy_page(page_size: int) -> list[ResumeListItem]:
+    resumes = (
+        await Resume.find({})
+        .sort(sort_spec("created_at", "desc"))
+        .limit(page_size)
+        .to_list()
+    )
+    items = []
+    for resume in resumes:
+        resume_dict = resume.model_dump(by_alias=True)
+        if "_id" in resume_dict and isinstance(resume_dict["_id"], PydanticObjectId):
+            resume_dict["_id"] = str(resume_dict["_id"])
+        items.append(ResumeListItem.model_validate(resume_dict))
+    return items
+
+
+async def projected_page(page_size: int) -> list[ResumeListItem]:
+    return (await fetch_resumes(page_size=page_size, count="none")).items
+
+
+async def cpu_per_page(fetch, page_size: int, repeats: int) -> tuple[float, float]:
+    cpu, wall = [], []
+    for _ in range(repeats):
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        await fetch(page_size)
+        cpu.append(time.process_time() - cpu_started)
+        wall.append(time.perf_counter() - wall_started)
+    return statistics.median(cpu) * 1000, statistics.median(wall) * 1000
+
+
+async def wire_bytes(page_size: int, projection: dict | None) -> int:
+    rows = (
+        await Resume.get_pymongo_collection()
+        .find({}, projection)
+        .sort(sort_spec("created_at", "desc"))
+        .limit(page_size)
+        .to_list(None)
+    )
+    return sum(len(bson.encode(row)) for row in rows)
+
+
+async def run(args):
+    client = AsyncIOMotorClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    database = client.get_database(args.database)
+    await client.drop_database(args.database)
+    await init_beanie(database, document_models=[Resume])
+
+    template = realistic_resume()
+    await Resume.insert_many(
+        [
+            template.model_copy(
+                update={
+                    "id": PydanticObjectId(),
+                    "name": f"Resume {index}",
+                    "resume_info": f"resume-{index}",
+                }
+            )
+            for index in range(args.documents)
+        ]
+    )
+
+    print(f"{'page size':>9} {'path':>10} {'cpu':>9} {'wall':>9} {'wire':>10}")
+    for page_size in args.page_sizes:
+        for label, fetch, projection in [
+            ("full", legacy_page, None),
+            ("projected", projected_page, get_projection(ResumeListItem)),
+        ]:
+            await fetch(page_size)  # warm up
+            cpu_ms, wall_ms = await cpu_per_page(fetch, page_size, args.repeats)
+            size = await wire_bytes(page_size, projection)
+            print(
+                f"{page_size:>9} {label:>10} {cpu_ms:>7.2f}ms {wall_ms:>7.2f}ms "
+                f"{size / 1024:>8.1f}KB"
+            )
+
+    await client.drop_database(args.database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--database", default="applywise_benchmark")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark the per-request overhead of the Prometheus metrics.
+
+Serves ``--requests`` requests to a few routes of the app in-process, once
+in a worker with METRICS_ENABLED=false and once with it on, each in a fresh
+interpreter against a scratch database (``applywise_benchmark`` by default,
+dropped first), and reports the median and p99 time per request of each
+route and the difference. Then times MetricsMiddleware alone around an
+empty app, which is the cost of matching the route and recording a request:
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.metrics \\
+        --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pymongo import MongoClient
+
+
+WORKER = """
+import asyncio, json, sys, time
+
+import httpx
+
+import src.main as main
+
+requests = int(sys.argv[1])
+
+
+async def serve():
+    samples = {}
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            resume = (
+                await c.post(
+                    "/api/v1/resumes/",
+                    json={"user_id": "bench", "name": "Bench", "resume_info": "Python"},
+                )
+            ).json()
+            routes = {
+                "liveness": "/api/v1/health-check/live",
+                "resume": f"/api/v1/resumes/{resume['_id']}",
+                "resume list": "/api/v1/resumes/?page_size=20",
+            }
+            for label, path in routes.items():
+                for _ in range(requests // 10):
+                    await c.get(path)
+                timings = []
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    (await c.get(path)).raise_for_status()
+                    timings.append(time.perf_counter() - started)
+                samples[label] = timings
+    return samples
+
+
+print(json.dumps(asyncio.run(serve())))
+"""
+
+
+def serve(env: dict, requests: int) -> dict[str, list[float]]:
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER, str(requests)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summary(samples: list[float]) -> tuple[float, float]:
+    samples = sorted(samples)
+    return (
+        statistics.median(samples) * 1_000_000,
+        samples[int(len(samples) * 0.99)] * 1_000_000,
+    )
+
+
+async def middleware_overhead(requests: int) -> tuple[float, float]:
+    """Median time per request of an empty app, bare and behind the middleware."""
+    from src.main import app
+    from src.metrics import MetricsMiddleware
+
+    async def empty_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(path: str) -> dict:
+        return {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "app": app,
+        }
+
+    # The last route matched, the worst case of the route lookup.
+    last = "/api/v1/health-check/ready"
+    timings = {}
+    for label, handler in [
+        ("bare", empty_app),
+        ("middleware", MetricsMiddleware(empty_app)),
+    ]:
+        samples = []
+        for _ in range(requests):
+            request_scope = scope(last)
+            started = time.perf_counter()
+            await handler(request_scope, receive, send)
+            samples.append(time.perf_counter() - started)
+        timings[label] = statistics.median(samples) * 1_000_000
+    return timings["bare"], timings["middleware"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--database", default="applywise_benchmark")
+    args = parser.parse_args()
+
+    mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    env = {
+        **os.environ,
+        "MONGO_URI": mongo_uri,
+        "MONGO_DATABASE": args.database,
+        "LLM_PROVIDER": os.getenv("LLM_PROVIDER", "stub"),
+        "RATE_LIMIT_ENABLED": "false",
+        "RESUME_CACHE_CHANGE_STREAM": "false",
+    }
+    client = MongoClient(mongo_uri)
+
+    results = {}
+    for mode, enabled in [("off", "false"), ("on", "true")]:
+        client.drop_database(args.database)
+        results[mode] = serve({**env, "METRICS_ENABLED": enabled}, args.requests)
+    client.drop_database(args.database)
+    client.close()
+
+    print(f"{args.requests} requests per route, time per request in us")
+    print(
+        f"{'route':<12} {'off median':>10} {'on median':>10} {'overhead':>9} "
+        f"{'off p99':>9} {'on p99':>9}"
+    )
+    for route in results["off"]:
+        off_median, off_p99 = summary(results["off"][route])
+        on_median, on_p99 = summary(results["on"][route])
+        print(
+            f"{route:<12} {off_median:>10.0f} {on_median:>10.0f} "
+            f"{on_median - off_median:>9.0f} {off_p99:>9.0f} {on_p99:>9.0f}"
+        )
+
+    bare_us, middleware_us = asyncio.run(middleware_overhead(args.requests * 10))
+    print(
+        f"middleware alone: {bare_us:.1f}us bare, {middleware_us:.1f}us with "
+        f"metrics, {middleware_us - bare_us:.1f}us per request"
+    )
+
+
+if __name__ == "__main__":
+    main()
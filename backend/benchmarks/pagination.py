@@ -0,0 +1,115 @@
+"""
+Benchmark job-application list latency by page depth, skip vs cursor paging.
+
+Seeds one user with N applications in a scratch database (``applywise_benchmark``
+by default, dropped first) and times the first, middle and last page of
+``fetch_job_applications`` with offset paging and with keyset cursors. Cursor
+pages should stay flat as N grows; skip pages grow with depth.
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.pagination \\
+        --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.pagination import encode_cursor, sort_spec
+from src.routers.job_application.models import JobApplication
+from src.routers.job_application.service import fetch_job_applications
+
+
+USER_ID = "benchmark-user"
+PAGE_SIZE = 20
+
+
+async def seed(size: int, batch_size: int = 10_000):
+    collection = JobApplication.get_pymongo_collection()
+    await collection.delete_many({})
+    started = date(2015, 1, 1)
+    now = datetime.utcnow()
+    for offset in range(0, size, batch_size):
+        await collection.insert_many(
+            [
+                {
+                    "user_id": USER_ID,
+                    "job_title": f"Engineer {index % 97}",
+                    "company_name": f"Company {index % 1013}",
+                    "status": "Applied",
+                    "application_date": datetime.combine(
+                        started + timedelta(days=index % 3650), datetime.min.time()
+                    ),
+                    "last_updated": now,
+                    "interview_dates": [],
+                }
+                for index in range(offset, min(size, offset + batch_size))
+            ],
+            ordered=False,
+        )
+
+
+async def cursor_at(depth: int) -> str | None:
+    """Cursor of the page that starts after `depth` rows (setup, not timed)."""
+    if depth == 0:
+        return None
+    row = (
+        await JobApplication.find({"user_id": USER_ID})
+        .sort(sort_spec("application_date", "desc"))
+        .skip(depth - 1)
+        .first_or_none()
+    )
+    return encode_cursor("application_date", "desc", row.application_date, row.id)
+
+
+async def time_page(repeats: int, **kwargs) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await fetch_job_applications(
+            user_id=USER_ID, page_size=PAGE_SIZE, count="none", **kwargs
+        )
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def run(args):
+    client = AsyncIOMotorClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    database = client.get_database(args.database)
+    await client.drop_database(args.database)
+    await init_beanie(database, document_models=[JobApplication])
+
+    print(f"{'documents':>10} {'page':>8} {'skip':>10} {'cursor':>10}")
+    for size in args.sizes:
+        await seed(size)
+        last_page = (size - 1) // PAGE_SIZE + 1
+        for label, page in [
+            ("first", 1),
+            ("middle", last_page // 2),
+            ("last", last_page),
+        ]:
+            skip_ms = await time_page(args.repeats, page=page)
+            cursor = await cursor_at((page - 1) * PAGE_SIZE)
+            cursor_ms = await time_page(args.repeats, cursor=cursor)
+            print(f"{size:>10} {label:>8} {skip_ms:>8.2f}ms {cursor_ms:>8.2f}ms")
+
+    await client.drop_database(args.database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--database", default="applywise_benchmark")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
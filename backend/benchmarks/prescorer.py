@@ -0,0 +1,134 @@
+"""
+Benchmark the local ATS pre-scorer against reference scores on a fixture corpus.
+
+Reports per-call latency of the local scorer and how well its relevance
+scores agree with the reference: mean absolute error, Spearman rank
+correlation, how often both sides land on the same side of the hybrid
+threshold, and the strong matches hybrid mode would answer locally.
+
+The reference scores in ``fixtures/ats_corpus.json`` are hand-labelled, not
+LLM output; its ``reference`` field says so. Replace them with the scores of
+the configured model (and measure LLM latency) with --record:
+
+    uv run python -m benchmarks.prescorer
+    GROQ_API_KEY=... uv run python -m benchmarks.prescorer --record
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.routers.ats.models import ATSCoreOutput
+from src.routers.ats.scoring import score_resume
+from src.routers.resumes.models import Resume, ResumeUpdate
+
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "ats_corpus.json"
+
+
+def load_resume(data: dict) -> Resume:
+    """Build a Resume without a database connection."""
+    sections = ResumeUpdate.model_validate(data)
+    return Resume.model_construct(
+        user_id=data["user_id"],
+        **{key: value for key, value in sections if value is not None},
+    )
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    rank_a = np.argsort(np.argsort(a)).astype(np.float64)
+    rank_b = np.argsort(np.argsort(b)).astype(np.float64)
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+async def record_llm_scores(corpus: dict, resumes: dict[str, Resume]):
+    from src.routers.ats.llm import close_llm_client, init_llm_client
+    from src.routers.ats.service import build_prompt, serialize_resume_for_prompt
+
+    client = await init_llm_client()
+    if client is None:
+        raise SystemExit("GROQ_API_KEY must be set to record LLM scores.")
+
+    latencies = []
+    try:
+        for pair in corpus["pairs"]:
+            prompt = build_prompt(
+                serialize_resume_for_prompt(resumes[pair["resume"]]),
+                corpus["job_descriptions"][pair["job"]],
+            )
+            started = time.perf_counter()
+            raw = await client.complete_json(prompt)
+            latencies.append(time.perf_counter() - started)
+            analysis = ATSCoreOutput.model_validate(json.loads(raw))
+            pair["reference_score"] = analysis.relevance_score
+        corpus["reference"] = client.model
+    finally:
+        await close_llm_client()
+
+    FIXTURE_PATH.write_text(json.dumps(corpus, indent=2) + "\n")
+    print(f"LLM latency: mean={statistics.fmean(latencies) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--threshold", type=int, default=20)
+    parser.add_argument(
+        "--strong-match", type=int, default=50, help="reference score of a match"
+    )
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    corpus = json.loads(FIXTURE_PATH.read_text())
+    resumes = {key: load_resume(data) for key, data in corpus["resumes"].items()}
+
+    if args.record:
+        asyncio.run(record_llm_scores(corpus, resumes))
+
+    timings = []
+    local_scores = []
+    for pair in corpus["pairs"]:
+        resume = resumes[pair["resume"]]
+        job_description = corpus["job_descriptions"][pair["job"]]
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            result = score_resume(resume, job_description)
+        timings.append((time.perf_counter() - started) / args.iterations)
+        local_scores.append(result.relevance_score)
+
+    local = np.array(local_scores, dtype=np.float64)
+    reference = np.array(
+        [p["reference_score"] for p in corpus["pairs"]], dtype=np.float64
+    )
+    same_side = np.mean((local >= args.threshold) == (reference >= args.threshold))
+    strong = reference >= args.strong_match
+    skipped = np.sum(strong & (local < args.threshold))
+
+    print(f"reference scores: {corpus['reference']}")
+    print(f"{'resume':<10} {'job':<10} {'local':>6} {'ref':>6}")
+    for pair, score in zip(corpus["pairs"], local_scores):
+        print(
+            f"{pair['resume']:<10} {pair['job']:<10} "
+            f"{score:>6} {pair['reference_score']:>6}"
+        )
+    print()
+    print(
+        f"local scorer latency: mean={statistics.fmean(timings) * 1e6:.1f}us "
+        f"max={max(timings) * 1e6:.1f}us"
+    )
+    print(f"mean absolute error: {np.mean(np.abs(local - reference)):.1f} points")
+    print(f"spearman rank correlation: {spearman(local, reference):.3f}")
+    print(f"threshold agreement (>= {args.threshold}): {same_side:.0%}")
+    print(
+        f"matches (>= {args.strong_match}) hybrid mode answers locally: "
+        f"{skipped} of {np.sum(strong)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark ATS prompt size and end-to-end latency, legacy vs compact renderer.
+
+The legacy prompt embeds ``json.dumps(resume, indent=2)``; the compact one
+uses ``render_resume``. End-to-end latency is measured against a stub LLM
+whose latency grows with prompt length, like real prefill does:
+
+    uv run python -m benchmarks.prompt_size --per-token-ms 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from src.routers.ats.prompt import estimate_tokens, render_resume
+from src.routers.ats.service import build_prompt
+from src.routers.resumes.models import (
+    Contact,
+    Education,
+    Experience,
+    Project,
+    Resume,
+    SkillCategory,
+)
+
+
+def legacy_prompt(resume: Resume, job_description: str) -> str:
+    resume_data_for_llm = resume.model_dump(
+        mode="json", exclude_unset=True, by_alias=False
+    )
+    return f"""
+    You are an AI assistant that analyzes resumes for a software engineering job application.
+    Given a resume and a job description, extract the following details:
+
+    1. Identify all skills mentioned in the resume.
+    2. Calculate the total years of experience.
+    3. Categorize the projects based on the domain (e.g., "Web Development", "Data Science", "Mobile", "Backend", "Frontend", "Game Development").
+    4. Rank the resume relevance to the job description on a scale of 0 to 100.
+
+    Resume Data:
+    {json.dumps(resume_data_for_llm, indent=2)}
+
+    Job Description:
+    {job_description}
+
+    Provide the output in valid JSON format with this structure:
+    {{
+        "relevance_score": "<percentage: int>",
+        "skills": ["skill1", "skill2", ......],
+        "total_years_of_experience": "<number of years: int>",
+        "project_categories": ["category1", "category2", ....]
+    }}
+    """
+
+
+def realistic_resume() -> Resume:
+    bullet = (
+        "Designed and shipped {n} customer-facing features in Python and "
+        "TypeScript, improving p95 latency by {n}0% across services"
+    )
+    return Resume.model_construct(
+        id=ObjectId(),
+        user_id="benchmark",
+        resume_info="Senior backend engineer resume",
+        name="Senior Backend Engineer",
+        contact=Contact(
+            phone="+1 555 0100",
+            email="jane@example.com",
+            linkedin="https://linkedin.com/in/jane",
+            github="https://github.com/jane",
+        ),
+        education=[
+            Education(
+                institution="State University",
+                location="Springfield",
+                degree="B.S.",
+                major="Computer Science",
+                start_date="Aug. 2012",
+                end_date="May 2016",
+                description=["Dean's list", "Teaching assistant for Algorithms"],
+            )
+        ],
+        experience=[
+            Experience(
+                title=f"Software Engineer {level}",
+                company=f"Company {level}",
+                location="Remote",
+                start_date=f"Jan. {2016 + level * 2}",
+                end_date=f"Dec. {2017 + level * 2}",
+                description=[bullet.format(n=n) for n in range(1, 7)],
+            )
+            for level in range(4)
+        ],
+        projects=[
+            Project(
+                name=f"Project {n}",
+                technologies="Python, FastAPI, MongoDB, Redis, Docker",
+                date_range="2021 -- Present",
+                link=f"https://github.com/jane/project-{n}",
+                description=[bullet.format(n=n) for n in range(1, 4)],
+            )
+            for n in range(4)
+        ],
+        skills=[
+            SkillCategory(category="Languages", items="Python, Go, TypeScript, SQL"),
+            SkillCategory(category="Tools", items="Docker, Kubernetes, Terraform, AWS"),
+        ],
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+    )
+
+
+async def stub_llm(prompt: str, base_ms: float, per_token_ms: float):
+    await asyncio.sleep((base_ms + estimate_tokens(prompt) * per_token_ms) / 1000)
+
+
+async def measure(build, args) -> tuple[list[float], list[float]]:
+    build_times, total_times = [], []
+    for _ in range(args.iterations):
+        started = time.perf_counter()
+        prompt = build()
+        built = time.perf_counter()
+        await stub_llm(prompt, args.base_ms, args.per_token_ms)
+        build_times.append(built - started)
+        total_times.append(time.perf_counter() - started)
+    return build_times, total_times
+
+
+async def run(args):
+    resume = realistic_resume()
+    job_description = "Backend engineer: Python, FastAPI, MongoDB, Docker, AWS."
+
+    variants = {
+        "legacy": lambda: legacy_prompt(resume, job_description),
+        "compact": lambda: build_prompt(
+            render_resume(resume, args.token_budget), job_description
+        ),
+    }
+
+    print(
+        f"{'variant':<8} {'chars':>7} {'~tokens':>8} "
+        f"{'build p50':>10} {'e2e p50':>9} {'e2e p95':>9}"
+    )
+    for name, build in variants.items():
+        prompt = build()
+        build_times, total_times = await measure(build, args)
+        total_times.sort()
+        print(
+            f"{name:<8} {len(prompt):>7} {estimate_tokens(prompt):>8} "
+            f"{statistics.median(build_times) * 1e6:>8.1f}us "
+            f"{statistics.median(total_times) * 1000:>7.1f}ms "
+            f"{total_times[int(len(total_times) * 0.95) - 1] * 1000:>7.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--token-budget", type=int, default=1500)
+    parser.add_argument("--base-ms", type=float, default=150.0)
+    parser.add_argument("--per-token-ms", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark rate limiter overhead per hit, per storage and strategy.
+
+Hits a few limits from ``--clients`` client keys in turn, with the counters
+in process memory, in MongoDB through the `limits` storage, in MongoDB
+buckets, and in MongoDB buckets behind the local lease tier, and reports the
+median and p99 time per hit, the database round trips per hit and the hits
+let through. The Mongo counters go to a scratch database
+(``applywise_benchmark`` by default), cleared before each run:
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.rate_limiter \\
+        --hits 20000
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from limits import parse
+from limits.storage import MemoryStorage, Storage, storage_from_string
+from limits.strategies import FixedWindowRateLimiter, RateLimiter
+
+from src.rate_limit_storage import LeasedRateLimiter, MongoBucketStorage
+
+
+def count_round_trips(storage: Storage) -> dict[str, int]:
+    """Count calls to the storage's `incr`, one round trip each."""
+    calls = {"incr": 0}
+    incr = storage.incr
+
+    def counted(*args, **kwargs):
+        calls["incr"] += 1
+        return incr(*args, **kwargs)
+
+    storage.incr = counted
+    return calls
+
+
+def strategies(args) -> dict[str, tuple[RateLimiter, dict[str, int] | None]]:
+    mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    limits_storage = storage_from_string(mongo_uri, database_name=args.database)
+    bucket_storage = MongoBucketStorage(
+        f"buckets+{mongo_uri}", database_name=args.database
+    )
+    leased_storage = MongoBucketStorage(
+        f"buckets+{mongo_uri}",
+        database_name=args.database,
+        collection_name="rate_limits_leased",
+    )
+    return {
+        "memory": (FixedWindowRateLimiter(MemoryStorage()), None),
+        "mongodb": (
+            FixedWindowRateLimiter(limits_storage),
+            count_round_trips(limits_storage),
+        ),
+        "buckets": (
+            FixedWindowRateLimiter(bucket_storage),
+            count_round_trips(bucket_storage),
+        ),
+        "buckets+lease": (
+            LeasedRateLimiter(leased_storage, args.lease_fraction),
+            count_round_trips(leased_storage),
+        ),
+    }
+
+
+def run(limiter: RateLimiter, limit: str, clients: int, hits: int) -> tuple:
+    item = parse(limit)
+    samples = []
+    allowed = 0
+    for index in range(hits):
+        started = time.perf_counter()
+        allowed += limiter.hit(item, f"client-{index % clients}", "/benchmark")
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return (
+        statistics.median(samples) * 1_000_000,
+        samples[int(len(samples) * 0.99)] * 1_000_000,
+        allowed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hits", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument(
+        "--limits", nargs="+", default=["5/minute", "60/minute", "1000/hour"]
+    )
+    parser.add_argument("--lease-fraction", type=float, default=0.1)
+    parser.add_argument("--database", default="applywise_benchmark")
+    args = parser.parse_args()
+
+    configured = strategies(args)
+    print(f"{args.hits} hits from {args.clients} clients")
+    print(
+        f"{'limit':<10} {'storage':>14} {'median':>9} {'p99':>9} "
+        f"{'trips/hit':>9} {'allowed':>8}"
+    )
+    for limit in args.limits:
+        for label, (limiter, round_trips) in configured.items():
+            limiter.storage.reset()
+            if round_trips is not None:
+                round_trips["incr"] = 0
+            median_us, p99_us, allowed = run(limiter, limit, args.clients, args.hits)
+            trips = round_trips["incr"] / args.hits if round_trips is not None else 0
+            print(
+                f"{limit:<10} {label:>14} {median_us:>7.1f}us {p99_us:>7.1f}us "
+                f"{trips:>9.3f} {allowed:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
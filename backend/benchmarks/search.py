@@ -0,0 +1,130 @@
+"""
+Benchmark job-application search, legacy $regex vs indexed search terms.
+
+Seeds ``--size`` applications spread over ``--users`` users in a scratch
+database (``applywise_benchmark`` by default, dropped first), then times a
+page of results for a few searches with the old unanchored case-insensitive
+regex filter and with the ``search_terms`` filter the service now uses.
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.search \\
+        --size 100000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.pagination import sort_spec
+from src.routers.job_application.models import (
+    JobApplication,
+    job_application_search_terms,
+)
+from src.routers.job_application.service import build_job_application_query
+
+
+TITLES = ["Backend", "Frontend", "Data", "Platform", "Mobile", "Security", "ML"]
+ROLES = ["Engineer", "Developer", "Scientist", "Analyst", "Architect", "Lead"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne"]
+SEARCHES = [
+    {"job_title": "data eng"},
+    {"job_title": "architect"},
+    {"company_name": "hoo"},
+    {"job_title": "ml", "company_name": "wayne"},
+]
+
+
+async def seed(size: int, users: int, batch_size: int = 10_000):
+    collection = JobApplication.get_pymongo_collection()
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    for offset in range(0, size, batch_size):
+        batch = []
+        for index in range(offset, min(size, offset + batch_size)):
+            job_title = f"{rng.choice(TITLES)} {rng.choice(ROLES)} {index}"
+            company_name = f"{rng.choice(COMPANIES)} {rng.randrange(1000)}"
+            batch.append(
+                {
+                    "user_id": f"user-{index % users}",
+                    "job_title": job_title,
+                    "company_name": company_name,
+                    "status": "Applied",
+                    "application_date": now,
+                    "last_updated": now,
+                    "interview_dates": [],
+                    "search_terms": job_application_search_terms(
+                        job_title, company_name
+                    ),
+                }
+            )
+        await collection.insert_many(batch, ordered=False)
+
+
+def regex_query(user_id: str, job_title: str = None, company_name: str = None):
+    query = {"user_id": user_id}
+    if job_title:
+        query["job_title"] = {"$regex": job_title, "$options": "i"}
+    if company_name:
+        query["company_name"] = {"$regex": company_name, "$options": "i"}
+    return query
+
+
+async def time_query(query: dict, repeats: int) -> tuple[float, int]:
+    collection = JobApplication.get_pymongo_collection()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        rows = (
+            await collection.find(query)
+            .sort(sort_spec("application_date", "desc"))
+            .limit(20)
+            .to_list(None)
+        )
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, len(rows)
+
+
+async def run(args):
+    client = AsyncIOMotorClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    database = client.get_database(args.database)
+    await client.drop_database(args.database)
+    await init_beanie(database, document_models=[JobApplication])
+    await seed(args.size, args.users)
+
+    user_id = "user-0"
+    print(f"{args.size} documents, {args.users} users; one user's page of 20")
+    print(f"{'search':<36} {'regex':>10} {'terms':>10} {'rows':>9}")
+    for search in SEARCHES:
+        regex_ms, regex_rows = await time_query(
+            regex_query(user_id, **search), args.repeats
+        )
+        terms_query = JobApplication.find(
+            build_job_application_query(user_id=user_id, **search)
+        ).get_filter_query()
+        terms_ms, terms_rows = await time_query(terms_query, args.repeats)
+        label = ", ".join(f"{key}={value!r}" for key, value in search.items())
+        print(
+            f"{label:<36} {regex_ms:>8.2f}ms {terms_ms:>8.2f}ms "
+            f"{regex_rows:>4}/{terms_rows:<4}"
+        )
+
+    await client.drop_database(args.database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--database", default="applywise_benchmark")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
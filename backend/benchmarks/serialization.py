@@ -0,0 +1,150 @@
+"""
+Benchmark response serialization, FastAPI's default path vs ModelJSONRoute.
+
+Serves prebuilt payloads from two in-process apps, one with FastAPI's
+default route and response classes and one with the classes the routers
+use, and reports the median time per request and the throughput of each.
+No database is needed:
+
+    uv run python -m benchmarks.serialization --page-size 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+from beanie import PydanticObjectId
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+
+from src.responses import ModelJSONResponse, ModelJSONRoute
+from src.routers.job_application.models import (
+    JobApplicationListItem,
+    PaginatedJobApplications,
+)
+from src.routers.resumes.models import PaginatedResumes, Resume, ResumeListItem
+
+from .prompt_size import realistic_resume
+
+
+def payloads(page_size: int) -> dict[str, tuple[type[BaseModel], BaseModel, set]]:
+    """(response model, payload, excluded fields) per endpoint shape."""
+    resume = realistic_resume().model_copy(update={"id": PydanticObjectId()})
+    now = datetime.utcnow()
+
+    resume_page = PaginatedResumes(
+        total=10_000,
+        page=1,
+        page_size=page_size,
+        items=[
+            ResumeListItem(
+                _id=PydanticObjectId(),
+                name=f"Resume {index}",
+                resume_info=f"Backend resume, variant {index}",
+                starred=index % 3 == 0,
+                created_at=now - timedelta(days=index),
+                updated_at=now - timedelta(hours=index),
+            )
+            for index in range(page_size)
+        ],
+        next_cursor="eyJmIjoiY3JlYXRlZF9hdCJ9",
+    )
+    application_page = PaginatedJobApplications(
+        total=10_000,
+        page=1,
+        page_size=page_size,
+        items=[
+            JobApplicationListItem(
+                _id=PydanticObjectId(),
+                user_id="user-0",
+                job_title=f"Backend Engineer {index}",
+                company_name=f"Acme {index}",
+                status="Applied",
+                application_date=date.today() - timedelta(days=index),
+                last_updated=now - timedelta(hours=index),
+                associated_resume_id=str(PydanticObjectId()),
+            )
+            for index in range(page_size)
+        ],
+        next_cursor="eyJmIjoiYXBwbGljYXRpb25fZGF0ZSJ9",
+    )
+
+    return {
+        "Resume": (Resume, resume, {"search_terms"}),
+        "PaginatedResumes": (PaginatedResumes, resume_page, set()),
+        "PaginatedJobApplications": (PaginatedJobApplications, application_page, set()),
+    }
+
+
+def returning(payload: BaseModel):
+    async def endpoint():
+        return payload
+
+    return endpoint
+
+
+def build_app(shapes: dict, fast: bool) -> FastAPI:
+    router = APIRouter(route_class=ModelJSONRoute) if fast else APIRouter()
+    for name, (model, payload, exclude) in shapes.items():
+        router.add_api_route(
+            f"/{name}",
+            returning(payload),
+            response_model=model,
+            response_model_exclude=exclude,
+        )
+
+    app = FastAPI()
+    if fast:
+        app.include_router(router, default_response_class=ModelJSONResponse)
+    else:
+        app.include_router(router)
+    return app
+
+
+async def time_requests(
+    app: FastAPI, path: str, requests: int
+) -> tuple[float, float, int]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        response = await client.get(path)  # warm up
+        samples = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            await client.get(path)
+            samples.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+    return statistics.median(samples) * 1000, requests / elapsed, len(response.content)
+
+
+async def run(args):
+    shapes = payloads(args.page_size)
+    apps = {"default": build_app(shapes, False), "model_json": build_app(shapes, True)}
+
+    print(f"page size {args.page_size}, {args.requests} sequential requests")
+    print(f"{'payload':<26} {'path':>10} {'median':>10} {'req/s':>9} {'bytes':>9}")
+    for name in shapes:
+        for label, app in apps.items():
+            median_ms, throughput, size = await time_requests(
+                app, f"/{name}", args.requests
+            )
+            print(
+                f"{name:<26} {label:>10} {median_ms:>8.3f}ms "
+                f"{throughput:>9.0f} {size:>9}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
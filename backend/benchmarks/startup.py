@@ -0,0 +1,114 @@
+"""
+Benchmark worker startup: import time and time to first request.
+
+Boots the app ``--runs`` times in fresh interpreters, once with Beanie
+creating the indexes at startup and once with MONGO_SKIP_INDEXES, against a
+scratch database (``applywise_benchmark`` by default). Each run reports the
+time to import ``src.main``, to run the lifespan startup and to answer a
+first health check and a first resume list; the medians are printed. The
+scratch database is dropped first, so only the first boot builds the
+indexes and later ones find them in place, as after a redeploy:
+
+    MONGO_URI=mongodb://localhost:27017 uv run python -m benchmarks.startup \\
+        --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pymongo import MongoClient
+
+
+WORKER = """
+import asyncio, json, time
+
+started = time.perf_counter()
+import src.main as main
+imported = time.perf_counter()
+
+import httpx
+
+
+async def boot():
+    async with main.lifespan(main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://boot") as c:
+            (await c.get("/api/v1/health-check/")).raise_for_status()
+            health = time.perf_counter()
+            (await c.get("/api/v1/resumes/", params={"page_size": 1})).raise_for_status()
+            listed = time.perf_counter()
+    return ready, health, listed
+
+
+ready, health, listed = asyncio.run(boot())
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "health check": health - ready,
+    "resume list": listed - health,
+    "to first request": health - started,
+}))
+"""
+
+
+def boot(env: dict) -> tuple[dict[str, float], float]:
+    """One fresh worker; its own timings and the process wall time."""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    elapsed = time.perf_counter() - started
+    return json.loads(output.strip().splitlines()[-1]), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database", default="applywise_benchmark")
+    args = parser.parse_args()
+
+    mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    env = {
+        **os.environ,
+        "MONGO_URI": mongo_uri,
+        "MONGO_DATABASE": args.database,
+        "LLM_PROVIDER": os.getenv("LLM_PROVIDER", "stub"),
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    client = MongoClient(mongo_uri)
+
+    print(f"median of {args.runs} boots, in ms")
+    print(
+        f"{'indexes':<8} {'import':>8} {'startup':>8} {'health':>8} "
+        f"{'list':>8} {'first req':>10} {'process':>8}"
+    )
+    client.drop_database(args.database)
+    for mode, skip in [("built", "false"), ("skipped", "true")]:
+        runs = [boot({**env, "MONGO_SKIP_INDEXES": skip}) for _ in range(args.runs)]
+        median = {
+            key: statistics.median(timings[key] for timings, _ in runs) * 1000
+            for key in runs[0][0]
+        }
+        process_ms = statistics.median(elapsed for _, elapsed in runs) * 1000
+        print(
+            f"{mode:<8} {median['import']:>8.0f} {median['startup']:>8.0f} "
+            f"{median['health check']:>8.1f} {median['resume list']:>8.1f} "
+            f"{median['to first request']:>10.0f} {process_ms:>8.0f}"
+        )
+
+    client.drop_database(args.database)
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
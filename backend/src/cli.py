@@ -0,0 +1,258 @@
+"""
+Maintenance commands for the ApplyWise backend.
+
+    uv run python -m src.cli explain-queries
+    uv run python -m src.cli backfill-search-terms
+    uv run python -m src.cli sync-indexes [--drop]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from typing import Any
+
+from beanie import Document, PydanticObjectId, init_beanie
+from pymongo import UpdateOne
+
+from .database import DOCUMENT_MODELS, init_db
+from .pagination import seek_query, sort_spec
+from .routers.job_application.models import (
+    JobApplication,
+    job_application_search_terms,
+)
+from .routers.job_application.service import build_job_application_query
+from .routers.resumes.models import Resume, resume_search_terms
+from .routers.resumes.service import build_resume_query
+
+
+# Stages that mean a query reads the whole collection or sorts in memory.
+FLAGGED_STAGES = {"COLLSCAN", "SORT"}
+
+
+def canonical_queries() -> list[tuple[str, type[Document], dict, str, str]]:
+    """
+    The filter and sort combinations the list endpoints issue, as
+    (label, model, filter, sort_by, sort_order).
+    """
+    now = datetime.utcnow()
+    last_quarter = {
+        "min_application_date": now - timedelta(days=90),
+        "max_application_date": now,
+    }
+    application_sorts = [
+        "application_date",
+        "last_updated",
+        "job_title",
+        "company_name",
+    ]
+    resume_sorts = ["created_at", "updated_at", "name"]
+    everyone = build_job_application_query()
+    by_user = build_job_application_query(user_id="explain")
+    by_status = build_job_application_query(user_id="explain", status="Applied")
+    by_date = build_job_application_query(user_id="explain", **last_quarter)
+    by_title = build_job_application_query(user_id="explain", job_title="data eng")
+    after_cursor = seek_query(
+        by_user, "application_date", "desc", now, PydanticObjectId()
+    )
+
+    shapes = [
+        (f"applications, sort {sort_by}", JobApplication, everyone, sort_by)
+        for sort_by in application_sorts
+    ]
+    shapes += [
+        (f"applications by user, sort {sort_by}", JobApplication, by_user, sort_by)
+        for sort_by in application_sorts
+    ]
+    shapes += [
+        (f"applications by status, sort {sort_by}", JobApplication, by_status, sort_by)
+        for sort_by in ["application_date", "last_updated"]
+    ]
+    shapes += [
+        (
+            f"applications by title search, sort {sort_by}",
+            JobApplication,
+            by_title,
+            sort_by,
+        )
+        for sort_by in application_sorts
+    ]
+    shapes += [
+        ("applications by date range", JobApplication, by_date, "application_date"),
+        (
+            "applications after a cursor",
+            JobApplication,
+            after_cursor,
+            "application_date",
+        ),
+    ]
+    shapes += [
+        (f"resumes, sort {sort_by}", Resume, build_resume_query(), sort_by)
+        for sort_by in resume_sorts
+    ]
+    shapes += [
+        (
+            f"starred resumes, sort {sort_by}",
+            Resume,
+            build_resume_query(starred=True),
+            sort_by,
+        )
+        for sort_by in ["created_at", "updated_at"]
+    ]
+    shapes += [
+        (
+            f"resumes by name search, sort {sort_by}",
+            Resume,
+            build_resume_query(search_name="backend"),
+            sort_by,
+        )
+        for sort_by in resume_sorts
+    ]
+    shapes.append(
+        (
+            "resumes by creation range",
+            Resume,
+            build_resume_query(min_created_at=now - timedelta(days=90)),
+            "created_at",
+        )
+    )
+
+    # Indexes serve both sort orders, so explaining one of them is enough.
+    return [(*shape, "desc") for shape in shapes]
+
+
+def plan_stages(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    """Flatten a winning plan into its stages, root first."""
+    stages = [plan]
+    for child in [plan.get("inputStage"), *plan.get("inputStages", [])]:
+        if child:
+            stages.extend(plan_stages(child))
+    return stages
+
+
+async def explain_query(
+    model: type[Document], query: dict, sort_by: str, sort_order: str
+) -> list[dict[str, Any]]:
+    filter_query = model.find(query).get_filter_query()
+    explanation = await (
+        model.get_pymongo_collection()
+        .find(filter_query)
+        .sort(sort_spec(sort_by, sort_order))
+        .limit(10)
+        .explain()
+    )
+    winning_plan = explanation["queryPlanner"]["winningPlan"]
+    return plan_stages(winning_plan.get("queryPlan", winning_plan))
+
+
+async def explain_queries() -> int:
+    """
+    Explain every canonical list query and flag collection scans and
+    in-memory sorts. Returns the number of flagged queries.
+    """
+    await init_db()
+
+    flagged = 0
+    for label, model, query, sort_by, sort_order in canonical_queries():
+        stages = await explain_query(model, query, sort_by, sort_order)
+        problems = sorted({s["stage"] for s in stages} & FLAGGED_STAGES)
+        indexes = sorted({s["indexName"] for s in stages if "indexName" in s})
+
+        flagged += bool(problems)
+        status = ", ".join(problems) if problems else "OK"
+        print(f"{status:<14} {label:<48} {', '.join(indexes) or '-'}")
+
+    return flagged
+
+
+async def backfill_search_terms(batch_size: int = 1000):
+    """Recompute `search_terms` of every resume and job application."""
+    await init_db()
+
+    backfills = [
+        (Resume, lambda doc: resume_search_terms(doc.get("name"))),
+        (
+            JobApplication,
+            lambda doc: job_application_search_terms(
+                doc.get("job_title"), doc.get("company_name")
+            ),
+        ),
+    ]
+    for model, terms_of in backfills:
+        collection = model.get_pymongo_collection()
+        updates = []
+        updated = 0
+        async for doc in collection.find(
+            {}, {"name": 1, "job_title": 1, "company_name": 1}
+        ):
+            updates.append(
+                UpdateOne(
+                    {"_id": doc["_id"]}, {"$set": {"search_terms": terms_of(doc)}}
+                )
+            )
+            if len(updates) == batch_size:
+                await collection.bulk_write(updates, ordered=False)
+                updated += len(updates)
+                updates = []
+        if updates:
+            await collection.bulk_write(updates, ordered=False)
+            updated += len(updates)
+        print(f"{model.get_collection_name()}: {updated} documents updated")
+
+
+async def sync_indexes(drop: bool = False):
+    """
+    Create the indexes the document models declare and, with `drop`, drop
+    the ones they no longer declare. Run once per deploy when the workers
+    start with MONGO_SKIP_INDEXES.
+    """
+    database = await init_db(skip_indexes=True, check_indexes=False)
+
+    before = {
+        model: await model.get_pymongo_collection().index_information()
+        for model in DOCUMENT_MODELS
+    }
+    await init_beanie(
+        database, document_models=DOCUMENT_MODELS, allow_index_dropping=drop
+    )
+    for model in DOCUMENT_MODELS:
+        after = await model.get_pymongo_collection().index_information()
+        created = sorted(after.keys() - before[model].keys())
+        dropped = sorted(before[model].keys() - after.keys())
+        changes = [f"+{name}" for name in created] + [f"-{name}" for name in dropped]
+        print(f"{model.get_collection_name():<24} {', '.join(changes) or 'up to date'}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "explain-queries",
+        help="flag list queries that scan the collection or sort in memory",
+    )
+    commands.add_parser(
+        "backfill-search-terms",
+        help="recompute search terms of documents written before search existed",
+    )
+    sync = commands.add_parser(
+        "sync-indexes",
+        help="create the indexes of the document models, for MONGO_SKIP_INDEXES",
+    )
+    sync.add_argument(
+        "--drop",
+        action="store_true",
+        help="also drop indexes the models no longer declare",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "explain-queries":
+        return 1 if asyncio.run(explain_queries()) else 0
+    if args.command == "backfill-search-terms":
+        asyncio.run(backfill_search_terms())
+    if args.command == "sync-indexes":
+        asyncio.run(sync_indexes(drop=args.drop))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
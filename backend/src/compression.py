@@ -0,0 +1,193 @@
+import zlib
+from typing import Iterable
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+DEFAULT_CONTENT_TYPES = ["application/json", "application/x-ndjson", "text/csv"]
+
+# Bodies that are never compressed, whatever their content type.
+NO_BODY_STATUSES = {204, 304}
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress a streamed chunk and flush it, so it reaches the client now."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick br or gzip from an Accept-Encoding header by q-value, preferring
+    br on a tie. None when neither is acceptable.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    candidates = [
+        (weights.get(coding, weights.get("*", 0.0)), -rank, coding)
+        for rank, coding in enumerate(["br", "gzip"])
+    ]
+    weight, _, coding = max(candidates)
+    return coding if weight > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, as the client
+    accepts. Only allowlisted content types are compressed, and complete
+    bodies only from `minimum_size` bytes, so small responses such as the
+    health check go out as they are. Streamed bodies are compressed chunk
+    by chunk and flushed after each one, so NDJSON lines still arrive as
+    they are produced. Strong ETags become weak, as the bytes now differ
+    per encoding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = {
+            content_type.strip().lower()
+            for content_type in content_types
+            if content_type.strip()
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def encoder(self, encoding: str) -> GzipEncoder | BrotliEncoder:
+        if encoding == "br":
+            return BrotliEncoder(self.brotli_quality)
+        return GzipEncoder(self.gzip_level)
+
+
+class CompressionResponder:
+    """Compresses the messages of one response; decides on its first body."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str | None, send: Send
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Message | None = None
+        self.encoder: GzipEncoder | BrotliEncoder | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body shows whether to compress.
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+        if self.encoder is not None:
+            await self.send_compressed(message)
+            return
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        streaming = message.get("more_body", False)
+
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        compressible = (
+            media_type in self.middleware.content_types
+            and self.start_message["status"] not in NO_BODY_STATUSES
+            and "content-encoding" not in headers
+        )
+        if compressible:
+            # Also on uncompressed replies, so caches keep variants apart.
+            headers.add_vary_header("Accept-Encoding")
+        if (
+            not compressible
+            or self.encoding is None
+            or (not streaming and len(body) < self.middleware.minimum_size)
+        ):
+            self.passthrough = True
+            await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        self.encoder = self.middleware.encoder(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        if streaming:
+            del headers["content-length"]
+            await self.downstream(self.start_message)
+            await self.send_compressed(message)
+            return
+
+        compressed = self.encoder.finish(body)
+        headers["Content-Length"] = str(len(compressed))
+        await self.downstream(self.start_message)
+        await self.downstream(
+            {"type": "http.response.body", "body": compressed, "more_body": False}
+        )
+
+    async def send_compressed(self, message: Message):
+        more_body = message.get("more_body", False)
+        body = message.get("body", b"")
+        compressed = (
+            self.encoder.chunk(body) if more_body else self.encoder.finish(body)
+        )
+        if compressed or not more_body:
+            await self.downstream(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
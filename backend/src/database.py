@@ -1,19 +1,325 @@
+import asyncio
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
+import threading
+from collections import defaultdict
+
+from beanie import Document, init_beanie
+from beanie.odm.utils.pydantic import get_model_fields
+from beanie.odm.utils.typing import get_index_attributes
 from dotenv import load_dotenv
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pydantic import BaseModel
+from pymongo import IndexModel, ReadPreference
+from pymongo.monitoring import ConnectionPoolListener
 
+from .metrics import mongo_command_listeners
 from .routers.job_application.models import JobApplication
-from .routers.ats.models import ATSAnalysis
+from .routers.ats.models import ATSAnalysis, ATSJob, ATSLock
 from .routers.resumes.models import Resume
 
 load_dotenv()
 
 
-async def init_db():
-    client = AsyncIOMotorClient(os.getenv("MONGO_URI"))
-    database = client.get_database("applywise")
+DATABASE_NAME = "applywise"
+
+DOCUMENT_MODELS = [Resume, ATSAnalysis, ATSJob, ATSLock, JobApplication]
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def _milliseconds(name: str, default: str) -> int | None:
+    """A timeout in milliseconds from the environment, 0 meaning none."""
+    value = int(os.getenv(name, default))
+    return value or None
+
+
+def client_options() -> dict:
+    """Pool, timeout and compression settings of the MongoDB client."""
+    compressors = os.getenv("MONGO_COMPRESSORS", "zlib").strip()
+    options = {
+        "appname": "applywise",
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+        "maxIdleTimeMS": _milliseconds("MONGO_MAX_IDLE_TIME_MS", "300000"),
+        "waitQueueTimeoutMS": _milliseconds("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"),
+        "serverSelectionTimeoutMS": int(
+            os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+        ),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": _milliseconds("MONGO_SOCKET_TIMEOUT_MS", "0"),
+    }
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def analytics_read_preference():
+    name = os.getenv("MONGO_ANALYTICS_READ_PREFERENCE", "primary")
+    if name not in READ_PREFERENCES:
+        raise ValueError(
+            f"Unknown MONGO_ANALYTICS_READ_PREFERENCE {name!r}, "
+            f"expected one of {sorted(READ_PREFERENCES)}"
+        )
+    return READ_PREFERENCES[name]
+
+
+class PoolStats(BaseModel):
+    """Connections of the client's pools, summed over the servers."""
+
+    max_size: int
+    open: int
+    in_use: int
+    waiting: int
+    # Busiest server pool: connections in use over max_size.
+    saturation: float
+
+
+class PoolMonitor(ConnectionPoolListener):
+    """
+    Counts the connections of each server pool from pymongo's connection
+    pool events, as the driver has no public counters. Events arrive on the
+    driver's threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: dict[tuple, dict[str, int]] = defaultdict(
+            lambda: {"open": 0, "in_use": 0, "waiting": 0}
+        )
+
+    def _count(self, address: tuple, **changes: int):
+        with self._lock:
+            pool = self._pools[address]
+            for name, change in changes.items():
+                pool[name] += change
+
+    def stats(self, max_size: int) -> PoolStats:
+        with self._lock:
+            pools = [dict(pool) for pool in self._pools.values()]
+        return PoolStats(
+            max_size=max_size,
+            open=sum(pool["open"] for pool in pools),
+            in_use=sum(pool["in_use"] for pool in pools),
+            waiting=sum(pool["waiting"] for pool in pools),
+            saturation=max(
+                (pool["in_use"] / max_size for pool in pools if max_size), default=0.0
+            ),
+        )
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(event.address, None)
+
+    def connection_created(self, event):
+        self._count(event.address, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count(event.address, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._count(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._count(event.address, waiting=-1)
+
+    def connection_checked_out(self, event):
+        self._count(event.address, waiting=-1, in_use=1)
+
+    def connection_checked_in(self, event):
+        self._count(event.address, in_use=-1)
+
+
+class MongoConnection:
+    """
+    The MongoDB client of the application and its connection pool. Owned by
+    the lifespan: the pool is opened before the first request and closed at
+    shutdown.
+    """
+
+    def __init__(
+        self,
+        uri: str | None,
+        database_name: str = DATABASE_NAME,
+        analytics_read_preference=ReadPreference.PRIMARY,
+        **options,
+    ):
+        self.pool_monitor = PoolMonitor()
+        self.client = AsyncIOMotorClient(
+            uri,
+            event_listeners=[self.pool_monitor, *mongo_command_listeners()],
+            **options,
+        )
+        self.database: AsyncIOMotorDatabase = self.client.get_database(database_name)
+        self.analytics_read_preference = analytics_read_preference
+        self.min_pool_size = options.get("minPoolSize", 0)
+        self.max_pool_size = options.get("maxPoolSize", 100)
+
+    async def warm_up(self):
+        """
+        Open `minPoolSize` connections now, with as many concurrent pings,
+        rather than on the first requests. Fails if the server is down.
+        """
+        await asyncio.gather(
+            *(
+                self.client.admin.command("ping")
+                for _ in range(max(1, self.min_pool_size))
+            )
+        )
+
+    async def ping(self):
+        await self.client.admin.command("ping")
+
+    def pool_stats(self) -> PoolStats:
+        return self.pool_monitor.stats(self.max_pool_size)
+
+    def close(self):
+        self.client.close()
+
+
+# Index options that change what is stored, not just how fast it is read.
+CONSTRAINT_OPTIONS = ("unique", "sparse", "expireAfterSeconds")
+
+
+def constraint_indexes(model: type[Document]) -> list[IndexModel]:
+    """
+    The unique and TTL indexes `model` declares, in its settings or with
+    Indexed fields. Without them job deduplication, single-flight locks and
+    lock expiry silently stop working.
+    """
+    indexes = [
+        IndexModel([(field.alias or name, attributes[0])], **attributes[1])
+        for name, field in get_model_fields(model).items()
+        if (attributes := get_index_attributes(field)) is not None
+    ]
+    # Only IndexModel entries can carry options; plain field names can't.
+    indexes += [
+        index
+        for index in getattr(model.Settings, "indexes", [])
+        if isinstance(index, IndexModel)
+    ]
+    return [
+        index
+        for index in indexes
+        if index.document.get("unique") or "expireAfterSeconds" in index.document
+    ]
+
+
+async def missing_constraint_indexes() -> list[str]:
+    """`collection.index` names of the constraint indexes not in the database."""
+    missing = []
+    for model in DOCUMENT_MODELS:
+        collection = model.get_pymongo_collection()
+        existing = [
+            (list(info["key"]), {o: info.get(o) for o in CONSTRAINT_OPTIONS})
+            for info in (await collection.index_information()).values()
+        ]
+        for index in constraint_indexes(model):
+            spec = index.document
+            wanted = (
+                list(spec["key"].items()),
+                {o: spec.get(o) for o in CONSTRAINT_OPTIONS},
+            )
+            if wanted not in existing:
+                missing.append(f"{collection.name}.{spec['name']}")
+    return missing
+
+
+_connection: MongoConnection | None = None
+
+
+async def init_db(
+    skip_indexes: bool | None = None, check_indexes: bool = True
+) -> AsyncIOMotorDatabase:
+    """
+    Connect to MongoDB, initialise Beanie and warm the connection pool.
+    Called once from the application lifespan and by the CLI.
+
+    With MONGO_SKIP_INDEXES Beanie doesn't create the indexes of the models,
+    so workers boot without a round of index builds; `python -m src.cli
+    sync-indexes` must then create them once per deploy, before the workers
+    start. Unless `check_indexes` is off, startup fails while the unique and
+    TTL indexes are missing, as the app relies on them for correctness.
+    """
+    global _connection
+
+    if skip_indexes is None:
+        skip_indexes = os.getenv("MONGO_SKIP_INDEXES", "false").lower() == "true"
+
+    _connection = MongoConnection(
+        os.getenv("MONGO_URI"),
+        database_name=os.getenv("MONGO_DATABASE", DATABASE_NAME),
+        analytics_read_preference=analytics_read_preference(),
+        **client_options(),
+    )
+    await init_beanie(
+        _connection.database,
+        document_models=DOCUMENT_MODELS,
+        skip_indexes=skip_indexes,
+    )
+    await _connection.warm_up()
+
+    if skip_indexes and check_indexes:
+        missing = await missing_constraint_indexes()
+        if missing:
+            raise RuntimeError(
+                f"Missing indexes {', '.join(missing)} with MONGO_SKIP_INDEXES; "
+                "run `python -m src.cli sync-indexes` before starting the app"
+            )
+
+    return _connection.database
+
+
+async def close_db():
+    """Close the MongoDB client and its connection pool."""
+    global _connection
+
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
+
+async def ping_db():
+    """Round trip to MongoDB; raises when it can't be reached."""
+    if _connection is None:
+        raise RuntimeError("The database is not initialised")
+    await _connection.ping()
+
+
+def get_pool_stats() -> PoolStats | None:
+    return _connection.pool_stats() if _connection is not None else None
 
-    await init_beanie(database, document_models=[Resume, ATSAnalysis, JobApplication])
 
-    return database
+def read_collection(model: type[Document]) -> AsyncIOMotorCollection:
+    """
+    The collection of `model` for list and analytics reads, which go to
+    secondaries when MONGO_ANALYTICS_READ_PREFERENCE allows it. Those reads
+    may then lag recent writes; reads of one document stay on the primary.
+    """
+    collection = model.get_pymongo_collection()
+    if _connection is None:
+        return collection
+    return collection.with_options(
+        read_preference=_connection.analytics_read_preference
+    )
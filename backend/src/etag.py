@@ -0,0 +1,76 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable
+
+from beanie import Document, PydanticObjectId
+from fastapi import Request, Response, status
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _version(value: datetime) -> str:
+    # Mongo keeps milliseconds, so a document read back must tag like the
+    # in-memory one it was written from.
+    return value.isoformat(timespec="milliseconds")
+
+
+def strong_etag(document_id: str, version: datetime) -> str:
+    """Strong ETag of one document from its ID and last modification time."""
+    return f'"{_digest(str(document_id), _version(version))}"'
+
+
+def weak_etag(*parts: object, versions: Iterable[tuple[str, datetime]] = ()) -> str:
+    """
+    Weak ETag of a listing: the page parameters plus the ID and modification
+    time of every item. Equal tags mean the same items, not the same bytes.
+    """
+    return 'W/"{}"'.format(
+        _digest(
+            *(str(part) for part in parts),
+            *(
+                f"{document_id}@{_version(version)}"
+                for document_id, version in versions
+            ),
+        )
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether `If-None-Match` names `etag`. If-None-Match uses the weak
+    comparison, so a W/ prefix on either side is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+async def document_version(
+    model: type[Document], document_id: str, field: str
+) -> datetime | None:
+    """
+    Read only the modification time of a document, so a conditional GET can
+    be answered without loading it. None for a malformed or unknown ID.
+    """
+    try:
+        object_id = PydanticObjectId(document_id)
+    except Exception:
+        return None
+
+    document = await model.get_pymongo_collection().find_one(
+        {"_id": object_id}, {field: 1}
+    )
+    return document.get(field) if document else None
@@ -1,9 +1,20 @@
+import os
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from .database import init_db
+from .compression import DEFAULT_CONTENT_TYPES, CompressionMiddleware
+from .database import close_db, init_db
 from .logging import configure_logging, LogLevels
+from .metrics import MetricsMiddleware, metrics, metrics_endpoint
+from .rate_limiter import limiter
 from .register_routes import register_routes
+from .routers.ats.jobs import start_job_workers, stop_job_workers
+from .routers.ats.llm import close_llm_client, init_llm_client
+from .routers.health_check.probes import start_health_probes, stop_health_probes
+from .routers.resumes.cache import (
+    start_resume_cache_watcher,
+    stop_resume_cache_watcher,
+)
 
 
 configure_logging(LogLevels.info)
@@ -12,7 +23,17 @@ configure_logging(LogLevels.info)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await init_llm_client()
+    await start_resume_cache_watcher()
+    await start_job_workers()
+    await start_health_probes()
     yield
+    limiter.close()
+    await stop_health_probes()
+    await stop_job_workers()
+    await stop_resume_cache_watcher()
+    await close_llm_client()
+    await close_db()
 
 
 app = FastAPI(
@@ -22,5 +43,20 @@ app = FastAPI(
     version="1.0.0",
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024")),
+    gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    content_types=os.getenv(
+        "COMPRESSION_CONTENT_TYPES", ",".join(DEFAULT_CONTENT_TYPES)
+    ).split(","),
+)
+
+# Added last, so it runs first and its timings include the middleware above.
+if metrics is not None:
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 
 register_routes(app)
@@ -0,0 +1,217 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import prometheus_client
+from prometheus_client import multiprocess
+from pymongo.monitoring import CommandListener
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Mongo commands mostly take well under the 5ms of the smallest default bucket.
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 60)
+
+
+class Metrics:
+    """
+    Collectors of the application, in prometheus_client's default registry.
+    Under several workers, set PROMETHEUS_MULTIPROC_DIR to a directory shared
+    by them and /metrics reports the sum over all of them.
+    """
+
+    def __init__(self):
+        self.http_duration = prometheus_client.Histogram(
+            "applywise_http_request_duration_seconds",
+            "Time to answer a request, until its last body chunk is sent.",
+            ["method", "route", "status"],
+        )
+        self.http_in_progress = prometheus_client.Gauge(
+            "applywise_http_requests_in_progress",
+            "Requests being answered.",
+            ["method", "route"],
+            multiprocess_mode="livesum",
+        )
+        self.mongo_duration = prometheus_client.Histogram(
+            "applywise_mongo_command_duration_seconds",
+            "Time MongoDB commands take, as measured by the driver.",
+            ["command"],
+            buckets=MONGO_BUCKETS,
+        )
+        self.mongo_failures = prometheus_client.Counter(
+            "applywise_mongo_command_failures",
+            "MongoDB commands that failed.",
+            ["command"],
+        )
+        self.llm_duration = prometheus_client.Histogram(
+            "applywise_llm_request_duration_seconds",
+            "Time LLM completions take, until the whole answer has arrived.",
+            ["model", "operation"],
+            buckets=LLM_BUCKETS,
+        )
+        self.llm_failures = prometheus_client.Counter(
+            "applywise_llm_request_failures",
+            "LLM completions that failed or gave an unusable answer.",
+            ["model", "operation", "error"],
+        )
+        self.ats_failures = prometheus_client.Counter(
+            "applywise_ats_analysis_failures",
+            "ATS analyses that ended in an error, LLM or otherwise.",
+            ["operation", "error"],
+        )
+        self.llm_tokens = prometheus_client.Counter(
+            "applywise_llm_tokens",
+            "Tokens used by LLM completions, as reported by the provider.",
+            ["model", "kind"],
+        )
+
+
+metrics = Metrics() if os.getenv("METRICS_ENABLED", "true").lower() != "false" else None
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request per method, route and status, and counts the
+    requests in progress per route. Outermost, so the time includes the
+    other middleware, compression among them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes: list[tuple[str, bool, BaseRoute]] | None = None
+
+    def route_path(self, scope: Scope) -> str:
+        """
+        Path template of the route a request goes to, so all the requests of
+        a route share a label whatever their ids. Requests to no route are
+        pooled under one label, as their paths are unbounded. Only the routes
+        whose template equals the path, or starts like it for templates with
+        parameters, are matched, in the router's order, as matching all of
+        them would cost more than the rest of the request's metrics.
+        """
+        if self._routes is None:
+            self._routes = []
+            for route in scope["app"].router.routes:
+                template = getattr(route, "path", "")
+                prefix, parameter, _ = template.partition("{")
+                self._routes.append((prefix, not parameter, route))
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+
+        partial = None
+        for prefix, static, route in self._routes:
+            if path != prefix if static else not path.startswith(prefix):
+                continue
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "unmatched")
+            if match == Match.PARTIAL and partial is None:
+                partial = getattr(route, "path", "unmatched")
+        return partial or "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or metrics is None:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route_path(scope)
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = metrics.http_in_progress.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.http_duration.labels(method, route, str(status)).observe(
+                time.perf_counter() - started
+            )
+            in_progress.dec()
+
+
+class CommandMetrics(CommandListener):
+    """
+    Records the duration and failures of MongoDB commands from pymongo's
+    command monitoring events, which carry the driver's own timing.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        metrics.mongo_duration.labels(event.command_name).observe(
+            event.duration_micros / 1_000_000
+        )
+
+    def failed(self, event):
+        metrics.mongo_duration.labels(event.command_name).observe(
+            event.duration_micros / 1_000_000
+        )
+        metrics.mongo_failures.labels(event.command_name).inc()
+
+
+def mongo_command_listeners() -> list[CommandListener]:
+    """Listeners to register on the MongoDB client, none without metrics."""
+    return [CommandMetrics()] if metrics is not None else []
+
+
+@contextmanager
+def llm_call(model: str, operation: str) -> Iterator[None]:
+    """
+    Time an LLM completion and count it as failed if it raises. A stream
+    closed by its consumer is timed but not counted as a failure.
+    """
+    if metrics is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        metrics.llm_failures.labels(model, operation, type(e).__name__).inc()
+        raise
+    finally:
+        metrics.llm_duration.labels(model, operation).observe(
+            time.perf_counter() - started
+        )
+
+
+def count_llm_tokens(model: str, prompt_tokens: int, completion_tokens: int):
+    if metrics is None:
+        return
+    metrics.llm_tokens.labels(model, "prompt").inc(prompt_tokens)
+    metrics.llm_tokens.labels(model, "completion").inc(completion_tokens)
+
+
+def count_ats_failure(operation: str, error: Exception):
+    if metrics is None:
+        return
+    metrics.ats_failures.labels(operation, type(error).__name__).inc()
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """The metrics of this worker, or of all of them, in Prometheus' format."""
+    registry = prometheus_client.REGISTRY
+    # An empty value, as in .env.example, means a single worker.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(
+        prometheus_client.generate_latest(registry),
+        media_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
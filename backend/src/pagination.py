@@ -0,0 +1,157 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from typing import Any, Literal
+
+from beanie import Document, PydanticObjectId, SortDirection
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from .database import read_collection
+
+
+CountMode = Literal["exact", "estimated", "none"]
+
+
+class InvalidCursorError(HTTPException):
+    """Exception raised when a pagination cursor can't be decoded."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor for this sort order.",
+        )
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, id: Any) -> str:
+    """
+    Opaque cursor pointing just after the row with this sort value and id.
+    Dates are stored as datetimes by Beanie, so both are encoded as such.
+    """
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if isinstance(value, datetime):
+        value = {"$date": value.isoformat()}
+
+    payload = json.dumps(
+        {"f": sort_by, "o": sort_order, "v": value, "id": str(id)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(
+    cursor: str, sort_by: str, sort_order: str
+) -> tuple[Any, PydanticObjectId]:
+    """Return the (sort value, id) of a cursor made for this sort order."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["f"] != sort_by or payload["o"] != sort_order:
+            raise InvalidCursorError()
+
+        value = payload["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["$date"])
+        return value, PydanticObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error, InvalidId):
+        raise InvalidCursorError()
+
+
+def sort_spec(sort_by: str, sort_order: str) -> list[tuple[str, SortDirection]]:
+    """Sort on the requested field with `_id` as the tie breaker."""
+    direction = (
+        SortDirection.ASCENDING if sort_order == "asc" else SortDirection.DESCENDING
+    )
+    return [(sort_by, direction), ("_id", direction)]
+
+
+def seek_query(
+    query: dict, sort_by: str, sort_order: str, value: Any, last_id: PydanticObjectId
+) -> dict:
+    """Restrict `query` to the rows after (value, last_id) in the sort order."""
+    operator = "$gt" if sort_order == "asc" else "$lt"
+    seek = {
+        "$or": [
+            {sort_by: {operator: value}},
+            {sort_by: value, "_id": {operator: last_id}},
+        ]
+    }
+    return {"$and": [query, seek]} if query else seek
+
+
+async def count_documents(
+    model: type[Document], query: dict, mode: CountMode
+) -> int | None:
+    """
+    Total for a list response. `estimated` reads the collection metadata
+    instead of scanning, which is only possible when nothing is filtered.
+    """
+    if mode == "none":
+        return None
+    collection = read_collection(model)
+    if mode == "estimated" and not query:
+        return await collection.estimated_document_count()
+    return await collection.count_documents(model.find(query).get_filter_query())
+
+
+async def paginate(
+    model: type[Document],
+    query: dict,
+    sort_by: str,
+    sort_order: str,
+    page: int,
+    page_size: int,
+    cursor: str | None = None,
+    projection_model: type[BaseModel] | None = None,
+    count: CountMode = "none",
+) -> tuple[list[BaseModel], str | None, int | None]:
+    """
+    Return one page of `query`, the cursor of the next page, if any, and
+    the total of `query` counted as `count` says.
+
+    Given a cursor the page is found with a seek predicate on
+    (sort_by, _id), so its cost doesn't grow with depth; otherwise `page`
+    is used with skip. One extra row is read to know whether more follow.
+    With a `projection_model` only its fields are fetched and rows are
+    parsed straight into it; it must include `id` and the sort field.
+    The cursor is checked before anything is read, count included.
+    """
+    page_query = query
+    skip = 0
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        page_query = seek_query(query, sort_by, sort_order, value, last_id)
+    else:
+        skip = (page - 1) * page_size
+
+    total = await count_documents(model, query, count)
+
+    # Beanie's find can't take a read preference, so the page is read from
+    # the analytics collection; find() still encodes the filter.
+    row_model = projection_model or model
+    documents = await (
+        read_collection(model)
+        .find(
+            model.find(page_query).get_filter_query(),
+            projection=get_projection(row_model),
+            sort=sort_spec(sort_by, sort_order),
+            skip=skip,
+            limit=page_size + 1,
+        )
+        .to_list(None)
+    )
+    rows = [parse_obj(row_model, document) for document in documents]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_order, getattr(last, sort_by), last.id
+        )
+
+    return rows, next_cursor, total
@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from limits import RateLimitItem
+from limits.storage import MemoryStorage, Storage
+from limits.strategies import FixedWindowRateLimiter
+from pymongo import ASCENDING, DESCENDING, MongoClient, ReturnDocument
+from pymongo.errors import PyMongoError
+
+from .cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class MongoBucketStorage(Storage):
+    """
+    Fixed-window counters shared by every worker, one MongoDB document per
+    key and window. A hit is a single upserting `$inc` on the bucket of the
+    current window, and a TTL index on `expireAt` drops spent buckets.
+
+    Windows are aligned to the clock, offset per key so they don't all reset
+    at once, which lets `window` tell when a counter resets without asking
+    the database. Select it with a ``buckets+mongodb://`` (or
+    ``buckets+mongodb+srv://``) storage URI; the rest is passed to pymongo.
+    """
+
+    STORAGE_SCHEME = ["buckets+mongodb", "buckets+mongodb+srv"]
+
+    def __init__(
+        self,
+        uri: str,
+        database_name: str = "applywise",
+        collection_name: str = "rate_limits",
+        wrap_exceptions: bool = False,
+        **options,
+    ):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # A lost database must fail fast rather than after pymongo's 30 second
+        # default, so hits soon fall back to memory.
+        options.setdefault("serverSelectionTimeoutMS", 1000)
+        options.setdefault("socketTimeoutMS", 1000)
+        self._client = MongoClient(uri.removeprefix("buckets+"), **options)
+        self.buckets = self._client[database_name][collection_name]
+        self._indexed = False
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return PyMongoError
+
+    def _collection(self):
+        if not self._indexed:
+            self.buckets.create_index("expireAt", expireAfterSeconds=0)
+            self.buckets.create_index([("key", ASCENDING), ("expireAt", DESCENDING)])
+            self._indexed = True
+        return self.buckets
+
+    @staticmethod
+    def window(key: str, expiry: int, now: float) -> tuple[float, float]:
+        """Start and end, as timestamps, of the window of `key` holding `now`."""
+        offset = zlib.crc32(key.encode("utf-8")) % expiry
+        start = (now - offset) // expiry * expiry + offset
+        return start, start + expiry
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        start, end = self.window(key, expiry, time.time())
+        bucket = self._collection().find_one_and_update(
+            {"_id": f"{key}@{start:.0f}"},
+            {
+                "$inc": {"count": amount},
+                "$setOnInsert": {
+                    "key": key,
+                    "expireAt": datetime.fromtimestamp(end, timezone.utc),
+                },
+            },
+            projection={"count": True},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return bucket["count"]
+
+    def _current(self, key: str) -> dict | None:
+        return self._collection().find_one(
+            {"key": key, "expireAt": {"$gt": datetime.now(timezone.utc)}},
+            sort=[("expireAt", DESCENDING)],
+        )
+
+    def get(self, key: str) -> int:
+        bucket = self._current(key)
+        return bucket["count"] if bucket else 0
+
+    def get_expiry(self, key: str) -> float:
+        bucket = self._current(key)
+        if bucket is None:
+            return time.time()
+        return bucket["expireAt"].replace(tzinfo=timezone.utc).timestamp()
+
+    def check(self) -> bool:
+        try:
+            self._client.admin.command("ping")
+            return True
+        except PyMongoError:
+            return False
+
+    def reset(self) -> int:
+        count = self._collection().count_documents({})
+        self.buckets.drop()
+        self._indexed = False
+        return count
+
+    def clear(self, key: str):
+        self._collection().delete_many({"key": key})
+
+    def close(self):
+        self._client.close()
+
+
+class _Lease:
+    __slots__ = ("reset_at", "remaining", "count", "debt", "reserving")
+
+    def __init__(self, reset_at: float):
+        self.reset_at = reset_at
+        # Hits reserved in the storage and not spent yet.
+        self.remaining = 0
+        # The window's count as of the last reservation.
+        self.count = 0
+        # Hits let through ahead of the reservation that will cover them.
+        self.debt = 0
+        self.reserving = False
+
+
+class LeasedRateLimiter(FixedWindowRateLimiter):
+    """
+    Fixed-window strategy over a `MongoBucketStorage` that answers every hit
+    in process, so a request never waits on the database. Hits are spent
+    from a lease, a block of hits reserved in the shared counter from a
+    background thread, a `lease_fraction` of the limit; the lease is renewed
+    once half spent, and a window seen full rejects hits until it resets.
+
+    A hit finding no reserved hits left goes through ahead of the next
+    reservation, up to a block. A worker can so overshoot a limit by at most
+    a block per window, and its unspent lease makes a limit stricter by at
+    most a block. Blocks shrink as the window fills up, down to a single hit
+    for the small limits of the API.
+
+    While the storage is unreachable, hits are counted per process in
+    memory and the storage is retried every `retry_seconds`.
+    """
+
+    def __init__(
+        self,
+        storage: MongoBucketStorage,
+        lease_fraction: float = 0.1,
+        cache_size: int = 10_000,
+        retry_seconds: float = 30,
+        executor: Executor | None = None,
+    ):
+        super().__init__(storage)
+        self.lease_fraction = lease_fraction
+        self.retry_seconds = retry_seconds
+        self._leases = LRUCache(maxsize=cache_size)
+        self._fallback = FixedWindowRateLimiter(MemoryStorage())
+        self._storage_down_until = 0.0
+        # Reservations complete on the executor's threads, and hits may come
+        # from the threadpool of sync endpoints.
+        self._lock = threading.RLock()
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="rate-limit"
+        )
+        self._closed = False
+
+    def block_size(self, item: RateLimitItem, cost: int, lease: _Lease | None) -> int:
+        block = max(1, int(item.amount * self.lease_fraction))
+        if lease is not None:
+            # Leave what is left of the window to the other workers too.
+            block = min(block, (item.amount - lease.count) // 2)
+        return max(cost, block)
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        key = item.key_for(*identifiers)
+        now = time.time()
+
+        if self._closed or now < self._storage_down_until:
+            return self._fallback.hit(item, *identifiers, cost=cost)
+
+        with self._lock:
+            lease: _Lease | None = self._leases.get(key)
+            if lease is None or lease.reset_at <= now:
+                _, reset_at = self.storage.window(key, item.get_expiry(), now)
+                lease = _Lease(reset_at)
+                self._leases.set(key, lease)
+
+            if lease.remaining >= cost:
+                lease.remaining -= cost
+            elif lease.count >= item.amount:
+                return False
+            elif lease.debt + cost <= self.block_size(item, cost, lease):
+                lease.debt += cost
+            else:
+                return False
+
+            self._renew(item, key, lease)
+            return True
+
+    def _renew(self, item: RateLimitItem, key: str, lease: _Lease):
+        """Reserve the next block once the lease is half spent or owed hits."""
+        if lease.reserving or lease.count >= item.amount or self._closed:
+            return
+        block = self.block_size(item, 1, lease)
+        if not lease.debt and lease.remaining > block // 2:
+            return
+        lease.reserving = True
+        self._executor.submit(self._reserve, item, key, lease, max(block, lease.debt))
+
+    def _reserve(self, item: RateLimitItem, key: str, lease: _Lease, block: int):
+        try:
+            count = self.storage.incr(key, item.get_expiry(), amount=block)
+        except PyMongoError as e:
+            logger.warning("Rate limit storage unreachable, counting locally: %s", e)
+            with self._lock:
+                self._storage_down_until = time.time() + self.retry_seconds
+                lease.reserving = False
+            return
+
+        # The hits of this block that still fit in the limit.
+        granted = max(0, min(block, item.amount - (count - block)))
+        with self._lock:
+            lease.reserving = False
+            lease.count = max(lease.count, count)
+            paid = min(lease.debt, granted)
+            lease.debt -= paid
+            lease.remaining += granted - paid
+            if lease.count >= item.amount:
+                # Hits still owed went through over the limit; none follow.
+                lease.debt = 0
+            self._renew(item, key, lease)
+
+    def clear(self, item: RateLimitItem, *identifiers: str):
+        with self._lock:
+            self._leases.delete(item.key_for(*identifiers))
+        super().clear(item, *identifiers)
+
+    def close(self):
+        """Stop reserving; later hits are counted in memory."""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
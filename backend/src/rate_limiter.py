@@ -1,5 +1,61 @@
+import os
+
+from fastapi import Request
+from limits.strategies import RateLimiter
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from .rate_limit_storage import LeasedRateLimiter, MongoBucketStorage
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Limit per authenticated user when an auth layer has set
+    `request.state.user_id`, per client address otherwise. A `user_id` sent
+    in the query or body is not used, as any client can change it.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if user_id:
+        return f"user:{user_id}"
+    return get_remote_address(request)
+
+
+class SharedLimiter(Limiter):
+    """
+    slowapi Limiter whose counters live in any `limits` storage, chosen by
+    URI. On a `MongoBucketStorage` hits go through a `LeasedRateLimiter`,
+    so they are answered without waiting on a round trip.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lease_fraction: float = 0.1,
+        lease_cache_size: int = 10_000,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._leased_limiter = (
+            LeasedRateLimiter(self._storage, lease_fraction, lease_cache_size)
+            if isinstance(self._storage, MongoBucketStorage)
+            else None
+        )
+
+    @property
+    def limiter(self) -> RateLimiter:
+        return self._leased_limiter or super().limiter
+
+    def close(self):
+        """Stop the lease reservations and close the MongoDB bucket client."""
+        if self._leased_limiter is not None:
+            self._leased_limiter.close()
+            self._storage.close()
+
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+limiter = SharedLimiter(
+    key_func=rate_limit_key,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+    lease_fraction=float(os.getenv("RATE_LIMIT_LEASE_FRACTION", "0.1")),
+    lease_cache_size=int(os.getenv("RATE_LIMIT_LEASE_CACHE_SIZE", "10000")),
+    enabled=os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false",
+)
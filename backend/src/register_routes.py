@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 
+from .responses import ModelJSONResponse
+
 
 def register_routes(app: FastAPI):
     from .routers.resumes.controller import router as resumes_router
@@ -7,7 +9,7 @@ def register_routes(app: FastAPI):
     from .routers.job_application.controller import router as job_application_router
     from .routers.health_check.controller import router as health_check_router
 
-    app.include_router(resumes_router)
-    app.include_router(ats_router)
-    app.include_router(job_application_router)
-    app.include_router(health_check_router)
+    app.include_router(resumes_router, default_response_class=ModelJSONResponse)
+    app.include_router(ats_router, default_response_class=ModelJSONResponse)
+    app.include_router(job_application_router, default_response_class=ModelJSONResponse)
+    app.include_router(health_check_router, default_response_class=ModelJSONResponse)
@@ -0,0 +1,104 @@
+import functools
+import inspect
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's Rust serializer rather than
+    `json.dumps`. Also renders a model passed as content directly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return to_json(content)
+
+
+class ModelJSONRoute(APIRoute):
+    """
+    Route that answers with `model_dump_json` when the endpoint returns an
+    instance of exactly its `response_model`, skipping FastAPI's second
+    validation of the model and its round trip through a dict. Any other
+    return value takes the default path, so a response model still filters
+    what a route returns.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_model = kwargs.get("response_model")
+        if (
+            isinstance(response_model, type)
+            and issubclass(response_model, BaseModel)
+            and inspect.iscoroutinefunction(endpoint)
+        ):
+            endpoint = dump_model_json(
+                endpoint,
+                response_model,
+                status_code=kwargs.get("status_code"),
+                include=kwargs.get("response_model_include"),
+                exclude=kwargs.get("response_model_exclude"),
+                by_alias=kwargs.get("response_model_by_alias", True),
+                exclude_unset=kwargs.get("response_model_exclude_unset", False),
+                exclude_defaults=kwargs.get("response_model_exclude_defaults", False),
+                exclude_none=kwargs.get("response_model_exclude_none", False),
+            )
+        super().__init__(path, endpoint, **kwargs)
+
+
+def dump_model_json(
+    endpoint: Callable[..., Any],
+    response_model: type[BaseModel],
+    status_code: int | None,
+    **dump_options: Any,
+) -> Callable[..., Any]:
+    """
+    Wrap an endpoint so a returned `response_model` becomes a ready JSON
+    response. A returned response skips FastAPI's merge of the headers and
+    status code set on the injected `Response`, so the wrapper asks for that
+    response too and merges it itself.
+    """
+    signature = inspect.signature(endpoint)
+    response_param = next(
+        (
+            name
+            for name, param in signature.parameters.items()
+            if isinstance(param.annotation, type)
+            and issubclass(param.annotation, Response)
+        ),
+        None,
+    )
+    injected_param = response_param or "_sub_response"
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        sub_response: Response = (
+            kwargs[injected_param] if response_param else kwargs.pop(injected_param)
+        )
+        content = await endpoint(*args, **kwargs)
+        if type(content) is not response_model:
+            return content
+
+        response = Response(
+            content=content.model_dump_json(**dump_options),
+            status_code=sub_response.status_code or status_code or 200,
+            media_type="application/json",
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    if response_param is None:
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    injected_param, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+                ),
+            ]
+        )
+    return wrapper
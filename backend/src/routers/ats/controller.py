@@ -1,30 +1,127 @@
 from typing import List
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from ...rate_limiter import limiter
+from ...responses import ModelJSONRoute
+from .jobs import enqueue_analysis, get_job
 from .service import (
     analyze_resume,
+    analyze_resume_batch,
+    analyze_resume_stream,
     delete_analysis_by_id,
+    get_analysis_stats,
     list_ats_analyses,
     update_title_and_description,
 )
-from .models import ATSAnalysis, ATSRequest, ATSResponse
+from .streaming import format_sse
+from .models import (
+    ATSAnalysis,
+    ATSBatchRequest,
+    ATSJobResponse,
+    ATSRequest,
+    ATSResponse,
+    ATSStats,
+)
 
 
-router = APIRouter(prefix="/api/v1/ats", tags=["ATS"])
+router = APIRouter(prefix="/api/v1/ats", tags=["ATS"], route_class=ModelJSONRoute)
 
 
-@router.post("/analyze", summary="Analyze Resume", response_model=ATSResponse)
+@router.post(
+    "/analyze",
+    summary="Analyze Resume",
+    response_model=ATSResponse | ATSJobResponse,
+)
 @limiter.limit("1/10seconds;5/minute;20/hour")
-async def post_analyze(request: Request, data: ATSRequest):
+async def post_analyze(
+    request: Request,
+    response: Response,
+    data: ATSRequest,
+    background: bool = Query(
+        False, description="Queue the analysis and return a job to poll"
+    ),
+):
     """
     Analyze a resume based on job description and generate a report and score.
+    With `background=true` the analysis is queued and a job is returned
+    immediately; poll `/jobs/{job_id}` for the result.
     """
 
+    if background:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await enqueue_analysis(data)
+
     analysis_result = await analyze_resume(data)
     return analysis_result
 
 
+@router.get(
+    "/jobs/{job_id}", summary="Get ATS Analysis Job", response_model=ATSJobResponse
+)
+@limiter.limit("60/minute")
+async def get_analysis_job(request: Request, job_id: str):
+    """
+    Get the status of a queued analysis, and its result once it is done.
+    """
+    return await get_job(job_id)
+
+
+@router.post(
+    "/analyze/stream",
+    summary="Analyze Resume (Server-Sent Events)",
+    response_class=StreamingResponse,
+)
+@limiter.limit("1/10seconds;5/minute;20/hour")
+async def post_analyze_stream(request: Request, data: ATSRequest):
+    """
+    Analyze a resume and stream the result as Server-Sent Events.
+    Emits a `field` event per completed field, then `result` or `error`.
+    """
+
+    events = await analyze_resume_stream(data)
+
+    async def sse_messages():
+        async for event, payload in events:
+            yield format_sse(event, payload)
+
+    return StreamingResponse(
+        sse_messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/analyze/batch",
+    summary="Analyze Resume Against Many Job Descriptions",
+    response_class=StreamingResponse,
+)
+@limiter.limit("1/minute;10/hour")
+async def post_analyze_batch(request: Request, data: ATSBatchRequest):
+    """
+    Analyze a resume against a list of job descriptions.
+    Streams one NDJSON line per job as soon as its analysis finishes.
+    """
+
+    results = await analyze_resume_batch(data)
+
+    async def ndjson_lines():
+        async for result in results:
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/stats", summary="Get ATS Counters", response_model=ATSStats)
+@limiter.limit("60/minute")
+async def get_stats(request: Request):
+    """
+    Get cache and request coalescing counters of the worker serving the call.
+    """
+    return get_analysis_stats()
+
+
 @router.get(
     "/history", summary="Get ATS Analysis History", response_model=List[ATSAnalysis]
 )
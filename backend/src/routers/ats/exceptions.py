@@ -39,3 +39,37 @@ class ATSAnalysisNotFoundError(ATSError):
                 else "ATS Analysis not found."
             ),
         )
+
+
+class LLMUnavailableError(ATSError):
+    """Exception raised when the LLM client is not configured."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="ATS analysis is unavailable: the LLM client is not configured.",
+        )
+
+
+class LLMProviderError(ATSError):
+    """Exception raised when the LLM provider fails to answer."""
+
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"LLM provider request failed: {detail}",
+        )
+
+
+class ATSJobNotFoundError(ATSError):
+    """Exception raised when an ATS analysis job is not found."""
+
+    def __init__(self, id: str | None = None):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=(
+                f"ATS analysis job with id {id} not found."
+                if id
+                else "ATS analysis job not found."
+            ),
+        )
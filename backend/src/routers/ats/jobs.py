@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from beanie import PydanticObjectId, UpdateResponse
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from .exceptions import ATSJobNotFoundError
+from .models import ATSJob, ATSJobResponse, ATSJobStatus, ATSRequest
+from .service import analyze_resume
+
+
+logger = logging.getLogger(__name__)
+
+
+def job_dedupe_key(request: ATSRequest) -> str:
+    """Requests with the same resume, job description and mode share a job."""
+    payload = json.dumps(
+        [request.resume_id, request.job_description, request.mode],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def to_job_response(job: ATSJob) -> ATSJobResponse:
+    return ATSJobResponse(
+        job_id=str(job.id), status=job.status, result=job.result, error=job.error
+    )
+
+
+def is_retryable(error: Exception) -> bool:
+    """Client errors such as a missing resume will fail again; don't retry them."""
+    return not (isinstance(error, HTTPException) and error.status_code < 500)
+
+
+class ATSJobWorkerPool:
+    """
+    In-process workers draining the `ats_jobs` collection.
+
+    Jobs are claimed atomically with a lease, so several uvicorn workers can
+    share the queue and a job whose worker died is picked up again once its
+    lease expires. Failed attempts are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        max_attempts: int = 3,
+        retry_backoff: float = 2.0,
+        lease: float = 120.0,
+        poll_interval: float = 1.0,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease = timedelta(seconds=lease)
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+    def start(self):
+        self._workers = [
+            asyncio.create_task(self._run(), name=f"ats-job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self):
+        """Wake idle workers up after a job was enqueued."""
+        self._wakeup.set()
+
+    async def _claim(self) -> ATSJob | None:
+        now = datetime.utcnow()
+        return await ATSJob.find_one(
+            {
+                "$or": [
+                    {"status": ATSJobStatus.QUEUED, "not_before": {"$lte": now}},
+                    {"status": ATSJobStatus.RUNNING, "lease_expires_at": {"$lt": now}},
+                ]
+            }
+        ).update(
+            {
+                "$set": {
+                    "status": ATSJobStatus.RUNNING,
+                    "lease_expires_at": now + self.lease,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            response_type=UpdateResponse.NEW_DOCUMENT,
+            sort=[("created_at", 1)],
+        )
+
+    async def _run(self):
+        while True:
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim an ATS job")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                await self._process(job)
+            except Exception:
+                # The job stays leased and is claimed again once the lease
+                # expires; this worker keeps draining the queue meanwhile.
+                logger.exception("Failed to process ATS job %s", job.id)
+
+    async def _process(self, job: ATSJob):
+        try:
+            result = await analyze_resume(job.request)
+        except Exception as e:
+            await self._handle_failure(job, e)
+            return
+
+        await ATSJob.find_one(ATSJob.id == job.id).update(
+            {
+                "$set": {
+                    "status": ATSJobStatus.DONE,
+                    "result": result.model_dump(),
+                    "error": None,
+                    "updated_at": datetime.utcnow(),
+                },
+                "$unset": {"active_key": "", "lease_expires_at": ""},
+            }
+        )
+
+    async def _handle_failure(self, job: ATSJob, error: Exception):
+        detail = error.detail if isinstance(error, HTTPException) else str(error)
+        now = datetime.utcnow()
+
+        if is_retryable(error) and job.attempts < self.max_attempts:
+            delay = self.retry_backoff * 2 ** (job.attempts - 1)
+            logger.warning(
+                "ATS job %s failed (attempt %s), retrying in %.1fs: %s",
+                job.id,
+                job.attempts,
+                delay,
+                detail,
+            )
+            await ATSJob.find_one(ATSJob.id == job.id).update(
+                {
+                    "$set": {
+                        "status": ATSJobStatus.QUEUED,
+                        "not_before": now + timedelta(seconds=delay),
+                        "error": detail,
+                        "updated_at": now,
+                    },
+                    "$unset": {"lease_expires_at": ""},
+                }
+            )
+            return
+
+        logger.error("ATS job %s failed: %s", job.id, detail)
+        await ATSJob.find_one(ATSJob.id == job.id).update(
+            {
+                "$set": {
+                    "status": ATSJobStatus.FAILED,
+                    "error": detail,
+                    "updated_at": now,
+                },
+                "$unset": {"active_key": "", "lease_expires_at": ""},
+            }
+        )
+
+
+_worker_pool: ATSJobWorkerPool | None = None
+
+
+async def start_job_workers() -> ATSJobWorkerPool:
+    """Start the ATS job workers. Called once from the application lifespan."""
+    global _worker_pool
+
+    _worker_pool = ATSJobWorkerPool(
+        concurrency=int(os.getenv("ATS_JOB_WORKERS", "2")),
+        max_attempts=int(os.getenv("ATS_JOB_MAX_ATTEMPTS", "3")),
+        retry_backoff=float(os.getenv("ATS_JOB_RETRY_BACKOFF_SECONDS", "2")),
+        lease=float(os.getenv("ATS_JOB_LEASE_SECONDS", "120")),
+        poll_interval=float(os.getenv("ATS_JOB_POLL_SECONDS", "1")),
+    )
+    _worker_pool.start()
+    return _worker_pool
+
+
+async def stop_job_workers():
+    global _worker_pool
+
+    if _worker_pool is not None:
+        await _worker_pool.stop()
+        _worker_pool = None
+
+
+async def enqueue_analysis(request: ATSRequest) -> ATSJobResponse:
+    """
+    Queue an analysis and return its job. A request identical to one that is
+    still queued or running returns the existing job instead.
+    """
+    active_key = job_dedupe_key(request)
+
+    job = await ATSJob.find_one(ATSJob.active_key == active_key)
+    if job is None:
+        job = ATSJob(request=request, active_key=active_key)
+        try:
+            await job.insert()
+        except DuplicateKeyError:
+            # Another request queued the same analysis between our read and write.
+            job = await ATSJob.find_one(ATSJob.active_key == active_key)
+            if job is None:
+                raise
+
+    if _worker_pool is not None:
+        _worker_pool.notify()
+
+    return to_job_response(job)
+
+
+async def get_job(job_id: str) -> ATSJobResponse:
+    """Return the status, and the result once done, of a queued analysis."""
+    try:
+        job_obj_id = PydanticObjectId(job_id)
+    except Exception:
+        raise ATSJobNotFoundError(id=job_id)
+
+    job = await ATSJob.get(job_obj_id)
+    if not job:
+        raise ATSJobNotFoundError(id=job_id)
+
+    return to_job_response(job)
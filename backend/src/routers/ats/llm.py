@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable
+
+import httpx
+from groq import APIError, AsyncGroq
+
+from ...metrics import count_llm_tokens
+from .exceptions import LLMProviderError, LLMUnavailableError
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_PROVIDER = "groq"
+DEFAULT_LLM_MODEL = "llama3-8b-8192"
+
+
+class LLMProvider(ABC):
+    """Interface of the LLM backends ATS analysis can run on."""
+
+    model: str
+
+    @abstractmethod
+    async def complete_json(self, prompt: str, temperature: float = 0.7) -> str:
+        """Run a JSON-mode chat completion and return the raw message content."""
+
+    @abstractmethod
+    def stream_json(self, prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """Stream a chat completion and yield content deltas as they arrive."""
+
+    async def ping(self):
+        """Check the backend can be reached; raise LLMProviderError if not."""
+
+    async def close(self):
+        pass
+
+
+class GroqProvider(LLMProvider):
+    """
+    Pooled async Groq client shared by every request of the ATS router.
+    Keeps HTTP connections alive between calls and bounds the number of
+    completions in flight so a burst of analyses can't exhaust the pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str | None = None,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        keepalive_expiry: float = 30.0,
+        max_retries: int = 2,
+    ):
+        self.model = model
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+        self._client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=max_retries,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            http_client=self._http_client,
+        )
+
+    async def complete_json(self, prompt: str, temperature: float = 0.7) -> str:
+        """Run a JSON-mode chat completion and return the raw message content."""
+        async with self._semaphore:
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    response_format={"type": "json_object"},
+                )
+            except APIError as e:
+                raise LLMProviderError(detail=str(e))
+        if response.usage is not None:
+            count_llm_tokens(
+                self.model,
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+            )
+        return response.choices[0].message.content
+
+    async def stream_json(
+        self, prompt: str, temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion and yield content deltas as they arrive.
+        JSON mode does not support streaming, so the prompt itself must ask
+        for a JSON answer.
+        """
+        async with self._semaphore:
+            try:
+                stream = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    # Groq reports the usage of a stream on its last chunk.
+                    usage = chunk.x_groq.usage if chunk.x_groq else None
+                    if usage is not None:
+                        count_llm_tokens(
+                            self.model, usage.prompt_tokens, usage.completion_tokens
+                        )
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+            except APIError as e:
+                raise LLMProviderError(detail=str(e))
+
+    async def ping(self):
+        """List the models: a request that reaches the API without using tokens."""
+        try:
+            await self._client.with_options(max_retries=0).models.list()
+        except APIError as e:
+            raise LLMProviderError(detail=str(e))
+
+    async def close(self):
+        await self._client.close()
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline provider for development, load tests and benchmarks.
+
+    Answers are derived from a hash of the prompt, so the same prompt always
+    gets the same analysis. Latency, jitter and the error rate are drawn from
+    a seeded RNG, which makes a benchmark run reproducible.
+    """
+
+    SKILLS = ["Python", "FastAPI", "MongoDB", "Docker", "React", "TypeScript"]
+    PROJECT_CATEGORIES = ["Backend", "Web Development", "Frontend", "DevOps"]
+
+    def __init__(
+        self,
+        model: str = "stub",
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        chunk_size: int = 16,
+    ):
+        self.model = model
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+        self._random = random.Random(seed)
+
+    def answer(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        return json.dumps(
+            {
+                "relevance_score": digest[0] * 100 // 255,
+                "skills": self.SKILLS[: 2 + digest[1] % (len(self.SKILLS) - 1)],
+                "total_years_of_experience": digest[2] % 15,
+                "project_categories": self.PROJECT_CATEGORIES[
+                    : 1 + digest[3] % len(self.PROJECT_CATEGORIES)
+                ],
+            }
+        )
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _maybe_fail(self):
+        if self._random.random() < self.error_rate:
+            raise LLMProviderError(detail="stub provider injected error")
+
+    async def complete_json(self, prompt: str, temperature: float = 0.7) -> str:
+        await asyncio.sleep(self._delay())
+        self._maybe_fail()
+        return self.answer(prompt)
+
+    async def stream_json(
+        self, prompt: str, temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        answer = self.answer(prompt)
+        chunks = [
+            answer[index : index + self.chunk_size]
+            for index in range(0, len(answer), self.chunk_size)
+        ]
+        # Spend half of the latency before the first token, like a real model.
+        delay = self._delay()
+        await asyncio.sleep(delay / 2)
+        self._maybe_fail()
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(delay / 2 / len(chunks))
+
+
+def create_groq_provider() -> LLMProvider | None:
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        logger.warning("GROQ_API_KEY is not set, ATS analysis is disabled.")
+        return None
+
+    return GroqProvider(
+        api_key=api_key,
+        model=os.getenv("GROQ_MODEL", DEFAULT_LLM_MODEL),
+        base_url=os.getenv("GROQ_BASE_URL") or None,
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
+        connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5")),
+        keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_SECONDS", "30")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+    )
+
+
+def create_stub_provider() -> LLMProvider:
+    logger.warning("Using the stub LLM provider, ATS analyses are not real.")
+    return StubProvider(
+        latency=float(os.getenv("LLM_STUB_LATENCY_SECONDS", "0.5")),
+        jitter=float(os.getenv("LLM_STUB_JITTER_SECONDS", "0")),
+        error_rate=float(os.getenv("LLM_STUB_ERROR_RATE", "0")),
+        seed=int(os.getenv("LLM_STUB_SEED", "0")),
+    )
+
+
+LLM_PROVIDERS: dict[str, Callable[[], LLMProvider | None]] = {
+    "groq": create_groq_provider,
+    "stub": create_stub_provider,
+}
+
+
+_llm_client: LLMProvider | None = None
+
+
+async def init_llm_client() -> LLMProvider | None:
+    """
+    Create the LLM provider selected by LLM_PROVIDER. Called once from the
+    application lifespan.
+    """
+    global _llm_client
+
+    name = os.getenv("LLM_PROVIDER", DEFAULT_LLM_PROVIDER).lower()
+    if name not in LLM_PROVIDERS:
+        raise ValueError(
+            f"Unknown LLM_PROVIDER {name!r}, expected one of {sorted(LLM_PROVIDERS)}"
+        )
+
+    _llm_client = LLM_PROVIDERS[name]()
+    return _llm_client
+
+
+async def close_llm_client():
+    """Close the LLM provider and its connection pool."""
+    global _llm_client
+
+    if _llm_client is not None:
+        await _llm_client.close()
+        _llm_client = None
+
+
+def get_llm_model() -> str:
+    """Return the name of the model used for ATS analysis."""
+    if _llm_client is not None:
+        return _llm_client.model
+    return os.getenv("GROQ_MODEL", DEFAULT_LLM_MODEL)
+
+
+def get_llm_client() -> LLMProvider:
+    """Return the LLM provider, or raise if it was never initialised."""
+    if _llm_client is None:
+        raise LLMUnavailableError()
+    return _llm_client
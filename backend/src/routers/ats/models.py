@@ -1,7 +1,11 @@
 from datetime import datetime
-from typing import List
+from enum import Enum
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 from beanie import Document, Indexed
+from pymongo import ASCENDING, IndexModel
+
+from ...cache import CacheStats
 
 
 class ATSRequest(BaseModel):
@@ -12,6 +16,13 @@ class ATSRequest(BaseModel):
     resume_id: str
     job_title: str
     job_description: str
+    mode: Literal["fast", "llm", "hybrid"] = Field(
+        default="llm",
+        description=(
+            "fast: local scoring only; llm: always ask the LLM; "
+            "hybrid: ask the LLM only when the local score clears the threshold"
+        ),
+    )
 
 
 class ATSCoreOutput(BaseModel):
@@ -36,10 +47,12 @@ class ATSAnalysis(Document):
     job_title: str = Indexed(str, unique=True)
     job_description: str
     resume_id: str = Indexed(str)
+    cache_key: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "ats_analyses"
+        indexes = ["cache_key"]
 
 
 class ATSResponse(ATSCoreOutput):
@@ -48,4 +61,114 @@ class ATSResponse(ATSCoreOutput):
     This will be a subset of ATSAnalysis, containing just the LLM-derived data.
     """
 
-    pass
+    scored_by: Literal["llm", "local"] = "llm"
+
+
+class ATSBatchJob(BaseModel):
+    """
+    A single job posting to score in a batch analysis.
+    """
+
+    job_title: str
+    job_description: str
+
+
+class ATSBatchRequest(BaseModel):
+    """
+    Model for the request to analyze one resume against many job postings.
+    """
+
+    resume_id: str
+    jobs: List[ATSBatchJob] = Field(min_length=1, max_length=50)
+    mode: Literal["fast", "llm", "hybrid"] = "llm"
+
+
+class ATSBatchResult(BaseModel):
+    """
+    One line of the batch analysis stream. Exactly one of `analysis` and
+    `error` is set.
+    """
+
+    index: int
+    job_title: str
+    analysis: Optional[ATSResponse] = None
+    error: Optional[str] = None
+
+
+class ATSJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ATSJob(Document):
+    """
+    Model for a queued ATS analysis, stored in the database.
+    `active_key` is only set while the job is queued or running; its unique
+    sparse index coalesces duplicate in-flight requests into one job.
+    """
+
+    request: ATSRequest
+    status: ATSJobStatus = ATSJobStatus.QUEUED
+    active_key: Optional[str] = None
+    attempts: int = 0
+    not_before: datetime = Field(default_factory=datetime.utcnow)
+    lease_expires_at: Optional[datetime] = None
+    result: Optional[ATSResponse] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "ats_jobs"
+        indexes = [
+            IndexModel([("active_key", ASCENDING)], unique=True, sparse=True),
+            IndexModel([("status", ASCENDING), ("not_before", ASCENDING)]),
+        ]
+
+
+class ATSJobResponse(BaseModel):
+    """
+    Model for the HTTP response describing a queued ATS analysis.
+    `result` is set once the job is done, `error` once it has failed.
+    """
+
+    job_id: str
+    status: ATSJobStatus
+    result: Optional[ATSResponse] = None
+    error: Optional[str] = None
+
+
+class ATSLock(Document):
+    """
+    Cross-worker lock on an in-flight analysis, stored in the database.
+    Mongo's TTL monitor removes locks whose holder died without releasing.
+    """
+
+    key: Indexed(str, unique=True)
+    owner: str
+    expires_at: datetime
+
+    class Settings:
+        name = "ats_locks"
+        indexes = [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)]
+
+
+class SingleFlightStats(BaseModel):
+    """Counters of the analysis single-flight layer."""
+
+    calls: int
+    executed: int
+    coalesced_local: int
+    coalesced_remote: int
+    in_flight: int
+
+
+class ATSStats(BaseModel):
+    """
+    Model for the HTTP response of the ATS stats endpoint.
+    """
+
+    single_flight: SingleFlightStats
+    analysis_cache: CacheStats
@@ -0,0 +1,115 @@
+import math
+import os
+
+from ...cache import LRUCache
+from ..resumes.models import Resume
+
+
+# Rough characters-per-token ratio of English text for Llama-family tokenizers.
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("ATS_PROMPT_TOKEN_BUDGET", "1500"))
+
+_rendered_resumes = LRUCache(maxsize=int(os.getenv("ATS_PROMPT_CACHE_SIZE", "1024")))
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _join(*parts: str | None, separator: str = ", ") -> str:
+    return separator.join(part for part in parts if part)
+
+
+def _date_range(start: str | None, end: str | None) -> str:
+    if start or end:
+        return f" ({_join(start, end, separator=' - ')})"
+    return ""
+
+
+class _Entry:
+    """A heading line followed by bullet lines that may be trimmed."""
+
+    def __init__(self, heading: str, bullets: list[str]):
+        self.heading = heading
+        self.bullets = [f"- {bullet.strip()}" for bullet in bullets if bullet.strip()]
+
+    def lines(self) -> list[str]:
+        return [self.heading, *self.bullets]
+
+
+def render_resume(resume: Resume, token_budget: int | None = None) -> str:
+    """
+    Render a resume as compact, deterministic text for the ATS prompt.
+
+    Only fields that matter for scoring are included (no contact details,
+    IDs or timestamps). When the result exceeds `token_budget`, bullets are
+    dropped starting from the oldest entries: education notes first, then
+    projects and finally experience, each from the bottom of the list up.
+    """
+    token_budget = token_budget or DEFAULT_TOKEN_BUDGET
+    cache_key = (str(resume.id), resume.updated_at, token_budget)
+    if resume.id is not None:
+        rendered = _rendered_resumes.get(cache_key)
+        if rendered is not None:
+            return rendered
+
+    skills = [f"{skill.category}: {skill.items}" for skill in resume.skills]
+    experience = [
+        _Entry(
+            f"{item.title} @ {_join(item.company, item.location)}"
+            f"{_date_range(item.start_date, item.end_date)}",
+            item.description,
+        )
+        for item in resume.experience
+    ]
+    projects = [
+        _Entry(
+            f"{item.name}"
+            + (f" [{item.technologies}]" if item.technologies else "")
+            + (f" ({item.date_range})" if item.date_range else ""),
+            item.description,
+        )
+        for item in resume.projects
+    ]
+    education = [
+        _Entry(
+            f"{_join(item.degree, item.major)} @ {item.institution}"
+            + (f", minor {item.minor}" if item.minor else "")
+            + _date_range(item.start_date, item.end_date),
+            item.description or [],
+        )
+        for item in resume.education
+    ]
+
+    sections = [
+        ("SKILLS", skills),
+        ("EXPERIENCE", experience),
+        ("PROJECTS", projects),
+        ("EDUCATION", education),
+    ]
+
+    def all_lines() -> list[str]:
+        lines = []
+        for title, items in sections:
+            if not items:
+                continue
+            lines.append(title)
+            for item in items:
+                lines.extend(item.lines() if isinstance(item, _Entry) else [item])
+        return lines
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    used_chars = sum(len(line) + 1 for line in all_lines())
+
+    trim_order = [*reversed(education), *reversed(projects), *reversed(experience)]
+    for entry in trim_order:
+        while entry.bullets and used_chars > budget_chars:
+            used_chars -= len(entry.bullets.pop()) + 1
+        if used_chars <= budget_chars:
+            break
+
+    rendered = "\n".join(all_lines())
+    if resume.id is not None:
+        _rendered_resumes.set(cache_key, rendered)
+    return rendered
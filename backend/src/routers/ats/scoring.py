@@ -0,0 +1,205 @@
+import re
+from datetime import date
+
+from .models import ATSCoreOutput
+from ..resumes.models import Resume
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+YEAR_PATTERN = re.compile(r"(19|20)\d{2}")
+
+STOP_WORDS = frozenset(
+    """
+    a about above across after all also an and any are as at be been being both
+    but by can could do does etc for from has have having how if in including
+    into is it its job may more most must new of on or our other per plus
+    preferred required role should so such than that the their them then there
+    these this those through to under up us using we were what when where which
+    while who will with within work working would you your years year experience
+    strong ability team teams knowledge understanding skills
+    hiring wanted looking join build building senior junior
+    """.split()
+)
+
+# Resume-side weight of terms that come from the skills and technologies
+# sections relative to terms that only appear in experience bullets.
+SKILL_TERM_WEIGHT = 2.0
+
+# Raw similarity scored 100. Calibrated with benchmarks/prescorer.py, where
+# the resumes written for a posting land between 0.5 and 0.65.
+FULL_MATCH_SIMILARITY = 0.6
+
+PROJECT_CATEGORY_KEYWORDS = {
+    "Web Development": {"html", "css", "javascript", "typescript", "web", "website"},
+    "Frontend": {"react", "vue", "angular", "svelte", "next.js", "tailwind", "redux"},
+    "Backend": {
+        "api",
+        "fastapi",
+        "django",
+        "flask",
+        "express",
+        "node.js",
+        "spring",
+        "postgresql",
+        "mongodb",
+        "redis",
+        "graphql",
+    },
+    "Mobile": {
+        "android",
+        "ios",
+        "swift",
+        "kotlin",
+        "flutter",
+        "react-native",
+        "mobile",
+    },
+    "Data Science": {
+        "pandas",
+        "numpy",
+        "scikit-learn",
+        "tensorflow",
+        "pytorch",
+        "ml",
+        "machine",
+        "data",
+        "analytics",
+    },
+    "DevOps": {"docker", "kubernetes", "terraform", "aws", "gcp", "azure", "ci", "cd"},
+    "Game Development": {"unity", "unreal", "godot", "game"},
+}
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase word tokens, keeping tech names like c++, c#, node.js."""
+    if not text:
+        return []
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS and len(token) > 1
+    ]
+
+
+def split_skill_list(text: str | None) -> list[str]:
+    """Split a comma separated list like "Python, Flask, React" into skills."""
+    if not text:
+        return []
+    return [item.strip() for item in re.split(r"[,;|]", text) if item.strip()]
+
+
+def extract_skills(resume: Resume) -> list[str]:
+    """Skills and technologies listed on the resume, deduplicated in order."""
+    skills: dict[str, str] = {}
+    for category in resume.skills:
+        for skill in split_skill_list(category.items):
+            skills.setdefault(skill.lower(), skill)
+    for project in resume.projects:
+        for skill in split_skill_list(project.technologies):
+            skills.setdefault(skill.lower(), skill)
+    return list(skills.values())
+
+
+def estimate_years_of_experience(resume: Resume) -> int:
+    """Sum of the year spans of every experience entry."""
+    total = 0
+    current_year = date.today().year
+    for experience in resume.experience:
+        start = YEAR_PATTERN.search(experience.start_date or "")
+        if not start:
+            continue
+        end = YEAR_PATTERN.search(experience.end_date or "")
+        end_year = int(end.group(0)) if end else current_year
+        total += max(0, end_year - int(start.group(0)))
+    return total
+
+
+def categorize_projects(resume: Resume) -> list[str]:
+    categories = []
+    for project in resume.projects:
+        tokens = set(tokenize(project.technologies)) | set(
+            tokenize(" ".join([project.name, *project.description]))
+        )
+        for category, keywords in PROJECT_CATEGORY_KEYWORDS.items():
+            if category not in categories and tokens & keywords:
+                categories.append(category)
+    return categories
+
+
+def resume_terms(resume: Resume) -> tuple[list[str], list[str]]:
+    """Return (skill terms, free-text terms) of a resume."""
+    skill_terms = []
+    for category in resume.skills:
+        skill_terms.extend(tokenize(category.items))
+    for project in resume.projects:
+        skill_terms.extend(tokenize(project.technologies))
+
+    text_terms = []
+    for experience in resume.experience:
+        text_terms.extend(tokenize(experience.title))
+        for bullet in experience.description:
+            text_terms.extend(tokenize(bullet))
+    for project in resume.projects:
+        for bullet in project.description:
+            text_terms.extend(tokenize(bullet))
+
+    return skill_terms, text_terms
+
+
+def relevance_score(
+    skill_terms: list[str], text_terms: list[str], job_terms: list[str]
+) -> int:
+    """
+    Score 0-100 from the overlap of resume and job terms.
+
+    Both sides are bag-of-words vectors over their joint vocabulary with
+    sublinear term frequency; there is no IDF, as two documents are no
+    corpus to tell rare terms from common ones. The raw similarity blends
+    their cosine with the share of job-term weight the resume covers, and
+    FULL_MATCH_SIMILARITY of it scores 100.
+    """
+    if not job_terms or not (skill_terms or text_terms):
+        return 0
+
+    # Imported here so workers boot without numpy; only ATS requests need it.
+    import numpy as np
+
+    vocabulary = {term: index for index, term in enumerate(dict.fromkeys(job_terms))}
+    size = len(vocabulary)
+    for term in (*skill_terms, *text_terms):
+        vocabulary.setdefault(term, len(vocabulary))
+
+    def counts(terms: list[str]) -> np.ndarray:
+        indices = np.fromiter((vocabulary[t] for t in terms), dtype=np.intp)
+        return np.bincount(indices, minlength=len(vocabulary)).astype(np.float64)
+
+    job_vector = np.log1p(counts(job_terms))
+    resume_vector = np.log1p(
+        SKILL_TERM_WEIGHT * counts(skill_terms) + counts(text_terms)
+    )
+
+    norms = np.linalg.norm(job_vector) * np.linalg.norm(resume_vector)
+    cosine = float(job_vector @ resume_vector / norms) if norms else 0.0
+
+    job_weights = job_vector[:size]
+    covered = job_weights[resume_vector[:size] > 0].sum()
+    coverage = float(covered / job_weights.sum())
+
+    similarity = 0.4 * cosine + 0.6 * coverage
+    return int(round(100 * min(1.0, similarity / FULL_MATCH_SIMILARITY)))
+
+
+def score_resume(resume: Resume, job_description: str) -> ATSCoreOutput:
+    """
+    Deterministic local ATS analysis. Orders of magnitude cheaper than the
+    LLM and good enough to rule out obvious mismatches.
+    """
+    skill_terms, text_terms = resume_terms(resume)
+    return ATSCoreOutput(
+        relevance_score=relevance_score(
+            skill_terms, text_terms, tokenize(job_description)
+        ),
+        skills=extract_skills(resume),
+        total_years_of_experience=estimate_years_of_experience(resume),
+        project_categories=categorize_projects(resume),
+    )
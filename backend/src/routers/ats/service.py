@@ -1,14 +1,38 @@
 from datetime import datetime
+from typing import AsyncIterator
+import asyncio
+import hashlib
 import json
-
+import logging
 import os
+
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.odm.utils.parsing import parse_obj
 from fastapi import HTTPException, status
-from groq import Groq
 from pydantic import ValidationError
-
-from .models import ATSCoreOutput, ATSRequest, ATSAnalysis, ATSResponse
+from pymongo.errors import BulkWriteError
+
+from ...cache import LRUCache
+from ...database import read_collection
+from ...metrics import count_ats_failure, llm_call
+from .models import (
+    ATSAnalysis,
+    ATSBatchJob,
+    ATSBatchRequest,
+    ATSBatchResult,
+    ATSCoreOutput,
+    ATSRequest,
+    ATSResponse,
+    ATSStats,
+)
+from ..resumes.cache import get_resume
 from ..resumes.models import Resume
 from ..resumes.exceptions import ResumeNotFoundError
+from .llm import get_llm_client, get_llm_model
+from .prompt import render_resume
+from .scoring import score_resume
+from .singleflight import SingleFlight
+from .streaming import IncrementalJSONParser
 from .exceptions import (
     ATSAnalysisNotFoundError,
     DataValidationError,
@@ -16,77 +40,194 @@ from .exceptions import (
 )
 
 
-async def analyze_resume(request: ATSRequest) -> ATSAnalysis:
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "2"
+
+ATS_BATCH_CONCURRENCY = int(os.getenv("ATS_BATCH_CONCURRENCY", "4"))
+ATS_HYBRID_THRESHOLD = int(os.getenv("ATS_HYBRID_THRESHOLD", "20"))
+
+_analysis_cache = LRUCache(maxsize=int(os.getenv("ATS_CACHE_SIZE", "1024")))
+
+_single_flight = SingleFlight(
+    lock_ttl=float(os.getenv("ATS_SINGLE_FLIGHT_LOCK_TTL_SECONDS", "120")),
+    poll_interval=float(os.getenv("ATS_SINGLE_FLIGHT_POLL_SECONDS", "0.5")),
+    wait_timeout=float(os.getenv("ATS_SINGLE_FLIGHT_WAIT_SECONDS", "120")),
+)
+
+
+def serialize_resume_for_prompt(resume: Resume) -> str:
+    """Render the resume the way it is embedded in the prompt."""
+    return render_resume(resume)
+
+
+def build_prompt(resume_text: str, job_description: str) -> str:
     """
-    Analyze a resume based on job description and generate a report and score.
+    Build the ATS analysis prompt. Bump PROMPT_VERSION whenever this changes.
     """
+    return f"""You are an AI assistant that analyzes resumes for a software engineering job application.
+Given a resume and a job description, extract the following details:
+1. Identify all skills mentioned in the resume.
+2. Calculate the total years of experience.
+3. Categorize the projects based on the domain (e.g., "Web Development", "Data Science", "Mobile", "Backend", "Frontend", "Game Development").
+4. Rank the resume relevance to the job description on a scale of 0 to 100.
 
-    resume = await Resume.get(request.resume_id)
-    if not resume:
-        raise ResumeNotFoundError(id=request.resume_id)
+Resume:
+{resume_text}
+
+Job Description:
+{job_description}
+
+Answer with a JSON object of this shape:
+{{"relevance_score": <int 0-100>, "skills": ["..."], "total_years_of_experience": <int>, "project_categories": ["..."]}}"""
 
-    resume_data_for_llm = resume.model_dump(
-        mode="json", exclude_unset=True, by_alias=False
+
+def resume_fingerprint(resume: Resume) -> str:
+    """
+    Stable hash of the canonical resume payload. It includes `updated_at`, so
+    editing a resume changes its fingerprint and every derived cache key.
+    """
+    canonical = json.dumps(
+        resume.model_dump(mode="json"), sort_keys=True, separators=(",", ":")
     )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 
-    prompt = f"""
-    You are an AI assistant that analyzes resumes for a software engineering job application.
-    Given a resume and a job description, extract the following details:
+def analysis_cache_key(fingerprint: str, job_description: str) -> str:
+    """
+    Stable hash of everything that determines an analysis result.
+    """
+    payload = {
+        "resume": fingerprint,
+        "job_description": job_description,
+        "model": get_llm_model(),
+        "prompt_version": PROMPT_VERSION,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    1. Identify all skills mentioned in the resume.
-    2. Calculate the total years of experience.
-    3. Categorize the projects based on the domain (e.g., "Web Development", "Data Science", "Mobile", "Backend", "Frontend", "Game Development").
-    4. Rank the resume relevance to the job description on a scale of 0 to 100.
 
-    Resume Data:
-    {json.dumps(resume_data_for_llm, indent=2)}
+async def get_cached_analysis(cache_key: str) -> ATSCoreOutput | None:
+    """
+    Look up a previous analysis in the in-process LRU, then in `ats_analyses`.
+    """
+    cached = _analysis_cache.get(cache_key)
+    if cached is not None:
+        return cached[1]
 
-    Job Description:
-    {request.job_description}
+    stored = await ATSAnalysis.find_one(ATSAnalysis.cache_key == cache_key)
+    if not stored:
+        return None
 
-    Provide the output in valid JSON format with this structure:
-    {{
-        "relevance_score": "<percentage: int>",
-        "skills": ["skill1", "skill2", ......],
-        "total_years_of_experience": "<number of years: int>",
-        "project_categories": ["category1", "category2", ....]
-    }}
+    _analysis_cache.set(cache_key, (stored.resume_id, stored.llm_analysis))
+    return stored.llm_analysis
+
+
+def single_flight_key(request: ATSRequest) -> str:
+    """Identical concurrent analyze requests share this key."""
+    description_hash = hashlib.sha256(
+        request.job_description.encode("utf-8")
+    ).hexdigest()
+    return f"{request.resume_id}:{request.job_title}:{description_hash}"
+
+
+def get_analysis_stats() -> ATSStats:
+    """Counters of the analysis cache and single-flight layer of this worker."""
+    return ATSStats(
+        single_flight=_single_flight.stats(),
+        analysis_cache=_analysis_cache.stats(),
+    )
+
+
+def invalidate_resume_analyses(resume_id: str):
+    """Evict every cached analysis of a resume from the in-process LRU."""
+    _analysis_cache.delete_where(lambda key, value: value[0] == resume_id)
+
+
+def local_analysis(
+    resume: Resume, job_description: str, mode: str
+) -> ATSResponse | None:
+    """
+    Return the local analysis when `mode` lets us skip the LLM: always in
+    fast mode, and in hybrid mode when the score is below the threshold.
     """
+    if mode == "llm":
+        return None
 
-    try:
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        response = client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            response_format={"type": "json_object"},
-        )
+    local_result = score_resume(resume, job_description)
+    if mode == "fast" or local_result.relevance_score < ATS_HYBRID_THRESHOLD:
+        return ATSResponse(**local_result.model_dump(), scored_by="local")
+
+    return None
 
-        llm_raw_content = response.choices[0].message.content
 
-        llm_output_dict = json.loads(llm_raw_content)
+async def request_llm_analysis(prompt: str) -> ATSCoreOutput:
+    """
+    Run the prompt through the LLM and validate its JSON answer.
+    """
+    llm_client = get_llm_client()
+    with llm_call(llm_client.model, "complete"):
+        llm_raw_content = await llm_client.complete_json(prompt)
 
-        core_analysis_data = ATSCoreOutput.model_validate(llm_output_dict)
+        try:
+            llm_output_dict = json.loads(llm_raw_content)
+            return ATSCoreOutput.model_validate(llm_output_dict)
+        except ValidationError as e:
+            raise DataValidationError(detail=f"LLM output validation failed: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise InvalidJSONFormatError(
+                detail=f"LLM returned invalid JSON: {llm_raw_content}. Error: {str(e)}",
+            )
+
+
+async def analyze_resume(request: ATSRequest) -> ATSAnalysis:
+    """
+    Analyze a resume based on job description and generate a report and score.
+    """
+
+    resume = await get_resume(request.resume_id)
+    if not resume:
+        raise ResumeNotFoundError(id=request.resume_id)
+
+    local_result = local_analysis(resume, request.job_description, request.mode)
+    if local_result:
+        return local_result
+
+    cache_key = analysis_cache_key(resume_fingerprint(resume), request.job_description)
+    cached_analysis = await get_cached_analysis(cache_key)
+    if cached_analysis:
+        return ATSResponse(**cached_analysis.model_dump())
+
+    prompt = build_prompt(serialize_resume_for_prompt(resume), request.job_description)
+
+    async def analyze_and_store() -> ATSCoreOutput:
+        core_analysis_data = await request_llm_analysis(prompt)
 
         ats_analysis_to_store = ATSAnalysis(
             llm_analysis=core_analysis_data,
             job_title=request.job_title,
             job_description=request.job_description,
             resume_id=request.resume_id,
+            cache_key=cache_key,
         )
 
         await ats_analysis_to_store.insert()
+        _analysis_cache.set(cache_key, (request.resume_id, core_analysis_data))
 
-        return ATSResponse(**core_analysis_data.model_dump())
+        return core_analysis_data
 
-    except ValidationError as e:
-        raise DataValidationError(detail=f"LLM output validation failed: {str(e)}")
-    except json.JSONDecodeError as e:
-        raise InvalidJSONFormatError(
-            detail=f"LLM returned invalid JSON: {llm_raw_content}. Error: {str(e)}",
+    try:
+        core_analysis_data = await _single_flight.do(
+            single_flight_key(request),
+            analyze_and_store,
+            lambda: get_cached_analysis(cache_key),
         )
+
+        return ATSResponse(**core_analysis_data.model_dump())
+
     except Exception as e:
-        print(f"General error in analyze_resume: {e.__class__.__name__}: {e}")
+        logger.exception("General error in analyze_resume")
+        count_ats_failure("analyze", e)
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(
@@ -95,6 +236,172 @@ async def analyze_resume(request: ATSRequest) -> ATSAnalysis:
         )
 
 
+async def analyze_resume_batch(
+    request: ATSBatchRequest,
+) -> AsyncIterator[ATSBatchResult]:
+    """
+    Analyze one resume against many job descriptions.
+
+    The resume is loaded and serialized once, LLM calls run with bounded
+    concurrency, and results are yielded in completion order. New analyses
+    are persisted with a single insert_many once the batch is finished.
+    """
+    resume = await get_resume(request.resume_id)
+    if not resume:
+        raise ResumeNotFoundError(id=request.resume_id)
+
+    fingerprint = resume_fingerprint(resume)
+    resume_text = serialize_resume_for_prompt(resume)
+    semaphore = asyncio.Semaphore(ATS_BATCH_CONCURRENCY)
+
+    async def analyze_job(index: int, job: ATSBatchJob):
+        cache_key = analysis_cache_key(fingerprint, job.job_description)
+        try:
+            local_result = local_analysis(resume, job.job_description, request.mode)
+            if local_result:
+                return index, local_result, None, None
+
+            cached_analysis = await get_cached_analysis(cache_key)
+            if cached_analysis:
+                return index, cached_analysis, None, None
+
+            async with semaphore:
+                core_analysis_data = await request_llm_analysis(
+                    build_prompt(resume_text, job.job_description)
+                )
+            return index, core_analysis_data, cache_key, None
+        except Exception as e:
+            count_ats_failure("batch", e)
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            return index, None, None, detail
+
+    async def stream_results():
+        tasks = [
+            asyncio.create_task(analyze_job(index, job))
+            for index, job in enumerate(request.jobs)
+        ]
+        analyses_to_store: list[ATSAnalysis] = []
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, core_analysis_data, cache_key, error = await next_done
+                job = request.jobs[index]
+
+                if cache_key:
+                    analyses_to_store.append(
+                        ATSAnalysis(
+                            llm_analysis=core_analysis_data,
+                            job_title=job.job_title,
+                            job_description=job.job_description,
+                            resume_id=request.resume_id,
+                            cache_key=cache_key,
+                        )
+                    )
+                    _analysis_cache.set(
+                        cache_key, (request.resume_id, core_analysis_data)
+                    )
+
+                yield ATSBatchResult(
+                    index=index,
+                    job_title=job.job_title,
+                    analysis=(
+                        ATSResponse(**core_analysis_data.model_dump())
+                        if core_analysis_data
+                        else None
+                    ),
+                    error=error,
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            if analyses_to_store:
+                try:
+                    await ATSAnalysis.insert_many(analyses_to_store, ordered=False)
+                except BulkWriteError as e:
+                    logger.warning(
+                        "Some batch analyses were not stored: %s",
+                        e.details.get("writeErrors"),
+                    )
+
+    return stream_results()
+
+
+async def analyze_resume_stream(
+    request: ATSRequest,
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Analyze a resume and yield (event, data) pairs as the LLM answer streams in.
+
+    A `field` event is yielded as soon as each top-level field of the answer
+    is complete, then a `result` event with the validated analysis, which is
+    persisted like a regular analysis. Failures yield a final `error` event.
+    """
+    resume = await get_resume(request.resume_id)
+    if not resume:
+        raise ResumeNotFoundError(id=request.resume_id)
+
+    async def replay(analysis: ATSResponse):
+        for name, value in analysis.model_dump().items():
+            yield "field", {"name": name, "value": value}
+        yield "result", analysis.model_dump()
+
+    local_result = local_analysis(resume, request.job_description, request.mode)
+    if local_result:
+        return replay(local_result)
+
+    cache_key = analysis_cache_key(resume_fingerprint(resume), request.job_description)
+    cached_analysis = await get_cached_analysis(cache_key)
+    if cached_analysis:
+        return replay(ATSResponse(**cached_analysis.model_dump()))
+
+    llm_client = get_llm_client()
+    prompt = build_prompt(serialize_resume_for_prompt(resume), request.job_description)
+
+    async def stream_events():
+        parser = IncrementalJSONParser()
+        try:
+            with llm_call(llm_client.model, "stream"):
+                async for delta in llm_client.stream_json(prompt):
+                    for name, value in parser.feed(delta):
+                        yield "field", {"name": name, "value": value}
+
+                if not parser.done:
+                    raise InvalidJSONFormatError(
+                        detail=f"LLM returned incomplete JSON: {parser.text}"
+                    )
+
+                try:
+                    core_analysis_data = ATSCoreOutput.model_validate(parser.document)
+                except ValidationError as e:
+                    raise DataValidationError(
+                        detail=f"LLM output validation failed: {str(e)}"
+                    )
+
+            await ATSAnalysis(
+                llm_analysis=core_analysis_data,
+                job_title=request.job_title,
+                job_description=request.job_description,
+                resume_id=request.resume_id,
+                cache_key=cache_key,
+            ).insert()
+            _analysis_cache.set(cache_key, (request.resume_id, core_analysis_data))
+
+            yield "result", ATSResponse(**core_analysis_data.model_dump()).model_dump()
+
+        except Exception as e:
+            logger.exception("General error in analyze_resume_stream")
+            count_ats_failure("stream", e)
+            detail = (
+                e.detail
+                if isinstance(e, HTTPException)
+                else f"An unexpected error occurred during resume analysis: {str(e)}"
+            )
+            yield "error", {"detail": detail}
+
+    return stream_events()
+
+
 async def delete_analysis_by_id(analysis_id: str):
     """
     Delete an ATS analysis by its ID.
@@ -123,12 +430,12 @@ async def list_ats_analyses(
     if job_title:
         query["job_title"] = job_title
 
-    if query:
-        analyses = await ATSAnalysis.find(query).skip(skip).limit(limit).to_list()
-    else:
-        analyses = await ATSAnalysis.find_all().skip(skip).limit(limit).to_list()
-
-    return analyses
+    documents = await (
+        read_collection(ATSAnalysis)
+        .find(ATSAnalysis.find(query).get_filter_query(), skip=skip, limit=limit)
+        .to_list(None)
+    )
+    return [parse_obj(ATSAnalysis, document) for document in documents]
 
 
 async def update_title_and_description(
@@ -137,13 +444,16 @@ async def update_title_and_description(
     """
     Update the job title and description of an existing ATS analysis.
     """
-    analysis = await ATSAnalysis.get(analysis_id)
-    if not analysis:
+    try:
+        analysis_obj_id = PydanticObjectId(analysis_id)
+    except Exception:
         raise ATSAnalysisNotFoundError(id=analysis_id)
 
-    analysis.job_title = job_title
-    analysis.job_description = job_description
-
-    await analysis.save()
+    analysis = await ATSAnalysis.find_one(ATSAnalysis.id == analysis_obj_id).update(
+        {"$set": {"job_title": job_title, "job_description": job_description}},
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    if not analysis:
+        raise ATSAnalysisNotFoundError(id=analysis_id)
 
     return analysis
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, TypeVar
+
+from pymongo.errors import DuplicateKeyError
+
+from .models import ATSLock, SingleFlightStats
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one execution.
+
+    Callers in the same process share one in-flight future; if the caller
+    running it is cancelled, one of the waiting callers runs it instead.
+    Across uvicorn workers an `ats_locks` document with a TTL elects a single
+    leader; the other workers poll `load_result` until the leader has stored
+    its result, and fall back to running the call themselves if the lock
+    goes away without one (leader failed or died).
+    """
+
+    def __init__(
+        self,
+        lock_ttl: float = 120.0,
+        poll_interval: float = 0.5,
+        wait_timeout: float = 120.0,
+    ):
+        self.lock_ttl = timedelta(seconds=lock_ttl)
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.calls = 0
+        self.executed = 0
+        self.coalesced_local = 0
+        self.coalesced_remote = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            calls=self.calls,
+            executed=self.executed,
+            coalesced_local=self.coalesced_local,
+            coalesced_remote=self.coalesced_remote,
+            in_flight=len(self._in_flight),
+        )
+
+    async def do(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        load_result: Callable[[], Awaitable[T | None]],
+    ) -> T:
+        self.calls += 1
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced_local += 1
+        while in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+            # The leader's request was cancelled, not ours. The first follower
+            # to wake up leads the retry and the others wait on it.
+            in_flight = self._in_flight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._run_once(key, call, load_result)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved when nobody else awaited it.
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _run_once(self, key, call, load_result):
+        if await self._acquire(key):
+            try:
+                self.executed += 1
+                return await call()
+            finally:
+                await self._release(key)
+
+        self.coalesced_remote += 1
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+
+            result = await load_result()
+            if result is not None:
+                return result
+
+            if await ATSLock.find_one(ATSLock.key == key) is None:
+                break
+
+        logger.info("Single-flight leader for %s gave up, running the call", key)
+        self.executed += 1
+        return await call()
+
+    async def _acquire(self, key: str) -> bool:
+        now = datetime.utcnow()
+        try:
+            await ATSLock(
+                key=key, owner=self.owner, expires_at=now + self.lock_ttl
+            ).insert()
+            return True
+        except DuplicateKeyError:
+            pass
+
+        # The TTL monitor only runs once a minute, so take over expired locks.
+        stolen = await ATSLock.find_one(
+            ATSLock.key == key, ATSLock.expires_at < now
+        ).update({"$set": {"owner": self.owner, "expires_at": now + self.lock_ttl}})
+        return stolen.modified_count == 1
+
+    async def _release(self, key: str):
+        try:
+            await ATSLock.find_one(
+                ATSLock.key == key, ATSLock.owner == self.owner
+            ).delete()
+        except Exception:
+            logger.exception("Failed to release single-flight lock %s", key)
@@ -0,0 +1,103 @@
+import json
+from typing import Any
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Feed it chunks of text as they arrive; `feed` returns every top-level
+    field whose value became complete in that chunk. Text before the opening
+    brace and after the closing brace is ignored, so chatty model output
+    around the JSON document does not break parsing.
+    """
+
+    def __init__(self):
+        self.fields: dict[str, Any] = {}
+        self.document: dict[str, Any] | None = None
+        self._buffer = ""
+        self._position = 0
+        self._start: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.document is not None
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self._buffer += chunk
+        completed = []
+
+        for index in range(self._position, len(self._buffer)):
+            if self.done:
+                break
+
+            char = self._buffer[index]
+
+            if self._start is None:
+                if char == "{":
+                    self._start = index
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None and self._key is None:
+                        self._key = json.loads(
+                            self._buffer[self._key_start : index + 1]
+                        )
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = index
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._complete_field(index))
+                    self.document = json.loads(self._buffer[self._start : index + 1])
+            elif char == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = index + 1
+            elif char == "," and self._depth == 1:
+                completed.extend(self._complete_field(index))
+
+        self._position = len(self._buffer)
+        return completed
+
+    def _complete_field(self, end: int) -> list[tuple[str, Any]]:
+        key, value_start = self._key, self._value_start
+        self._key_start = self._key = self._value_start = None
+
+        if key is None or value_start is None:
+            return []
+
+        try:
+            value = json.loads(self._buffer[value_start:end])
+        except json.JSONDecodeError:
+            return []
+
+        self.fields[key] = value
+        return [(key, value)]
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
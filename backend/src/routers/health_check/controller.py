@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response, status
 
 from ...rate_limiter import limiter
-from .models import HealthCheckResponse
+from ...responses import ModelJSONRoute
+from .models import HealthCheckResponse, ReadinessResponse
+from .probes import get_readiness
 
-router = APIRouter(prefix="/api/v1/health-check", tags=["Health Check"])
+router = APIRouter(
+    prefix="/api/v1/health-check", tags=["Health Check"], route_class=ModelJSONRoute
+)
 
 
 @router.get("/", summary="Health Check", response_model=HealthCheckResponse)
@@ -14,3 +18,36 @@ async def health_check(request: Request):
     Returns a simple status message.
     """
     return HealthCheckResponse(status="ok")
+
+
+@router.get("/live", summary="Liveness", response_model=HealthCheckResponse)
+async def liveness():
+    """
+    Whether the process is up and serving. Touches no dependency, so a
+    failing database never gets a live worker restarted.
+    """
+    return HealthCheckResponse(status="ok")
+
+
+@router.get(
+    "/ready",
+    summary="Readiness",
+    response_model=ReadinessResponse,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "model": ReadinessResponse,
+            "description": "MongoDB is unreachable",
+        }
+    },
+)
+async def readiness(response: Response):
+    """
+    Whether the worker should receive traffic: 200 while MongoDB answers,
+    503 otherwise. Served from the results of background probes, with their
+    latencies and the saturation of the connection pool. Not rate limited,
+    as load balancers poll it.
+    """
+    readiness = get_readiness()
+    if readiness.status == "unavailable":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
@@ -1,7 +1,34 @@
 from datetime import datetime
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
+from ...database import PoolStats
+
 
 class HealthCheckResponse(BaseModel):
     status: str = "ok"
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ProbeResult(BaseModel):
+    """Outcome of the latest background probe of one dependency."""
+
+    ok: bool
+    latency_ms: Optional[float] = Field(
+        None, description="Round trip of the probe; None when it timed out"
+    )
+    error: Optional[str] = None
+    checked_at: datetime
+
+
+class ReadinessResponse(BaseModel):
+    """
+    Whether the worker can serve traffic, from cached probe results.
+    `unavailable` (HTTP 503) when MongoDB is unreachable or its probe is
+    stale; `degraded` when only the optional LLM probe fails.
+    """
+
+    status: Literal["ready", "degraded", "unavailable"]
+    mongo: Optional[ProbeResult] = None
+    llm: Optional[ProbeResult] = None
+    pool: Optional[PoolStats] = None
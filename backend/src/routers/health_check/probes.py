@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from ...database import get_pool_stats, ping_db
+from ..ats.llm import get_llm_client
+from .models import ProbeResult, ReadinessResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProbes:
+    """
+    Probes MongoDB, and optionally the LLM provider, in the background on an
+    interval and keeps the latest results, so readiness checks only read
+    them and never add a round trip or load of their own.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5,
+        timeout: float = 2,
+        llm_interval: float | None = None,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.llm_interval = llm_interval
+        self.mongo: ProbeResult | None = None
+        self.llm: ProbeResult | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def probe(self, check: Callable[[], Awaitable]) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except asyncio.TimeoutError:
+            return ProbeResult(
+                ok=False,
+                error=f"no answer within {self.timeout:g}s",
+                checked_at=datetime.utcnow(),
+            )
+        except Exception as e:
+            return ProbeResult(
+                ok=False,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=str(e) or type(e).__name__,
+                checked_at=datetime.utcnow(),
+            )
+        return ProbeResult(
+            ok=True,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            checked_at=datetime.utcnow(),
+        )
+
+    def _log_change(self, name: str, previous: ProbeResult | None, now: ProbeResult):
+        if not now.ok and (previous is None or previous.ok):
+            logger.warning("%s probe failed: %s", name, now.error)
+        elif now.ok and previous is not None and not previous.ok:
+            logger.info("%s probe recovered", name)
+
+    async def probe_mongo(self):
+        previous, self.mongo = self.mongo, await self.probe(ping_db)
+        self._log_change("MongoDB", previous, self.mongo)
+
+    async def probe_llm(self):
+        previous, self.llm = self.llm, await self.probe(lambda: get_llm_client().ping())
+        self._log_change("LLM", previous, self.llm)
+
+    async def _repeat(self, probe: Callable[[], Awaitable], interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await probe()
+
+    async def start(self):
+        """Run a first round of probes, then keep probing in the background."""
+        probes = [(self.probe_mongo, self.interval)]
+        if self.llm_interval:
+            probes.append((self.probe_llm, self.llm_interval))
+
+        await asyncio.gather(*(probe() for probe, _ in probes))
+        self._tasks = [
+            asyncio.create_task(self._repeat(probe, interval))
+            for probe, interval in probes
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def readiness(self) -> ReadinessResponse:
+        # A probe that stopped reporting says nothing about the database now.
+        stale_after = timedelta(seconds=2 * self.interval + self.timeout)
+        mongo_ready = (
+            self.mongo is not None
+            and self.mongo.ok
+            and datetime.utcnow() - self.mongo.checked_at <= stale_after
+        )
+        if not mongo_ready:
+            status = "unavailable"
+        elif self.llm is not None and not self.llm.ok:
+            status = "degraded"
+        else:
+            status = "ready"
+
+        return ReadinessResponse(
+            status=status, mongo=self.mongo, llm=self.llm, pool=get_pool_stats()
+        )
+
+
+health_probes = HealthProbes(
+    interval=float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "5")),
+    timeout=float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "2")),
+    llm_interval=(
+        float(os.getenv("HEALTH_PROBE_LLM_INTERVAL_SECONDS", "60"))
+        if os.getenv("HEALTH_PROBE_LLM", "false").lower() == "true"
+        else None
+    ),
+)
+
+
+async def start_health_probes():
+    """Start the background probes. Called once from the application lifespan."""
+    await health_probes.start()
+
+
+async def stop_health_probes():
+    await health_probes.stop()
+
+
+def get_readiness() -> ReadinessResponse:
+    return health_probes.readiness()
@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+import logging
+import os
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Iterator, Literal
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from ...database import read_collection
+from ...pagination import sort_spec
+from .models import (
+    JobApplication,
+    JobApplicationImportError,
+    JobApplicationImportResult,
+    JobApplicationRecord,
+)
+from .service import invalidate_job_application_stats
+
+
+logger = logging.getLogger(__name__)
+
+FileFormat = Literal["csv", "ndjson"]
+
+IMPORT_CHUNK_SIZE = int(os.getenv("JOB_APPLICATION_IMPORT_CHUNK_SIZE", "500"))
+EXPORT_BATCH_SIZE = int(os.getenv("JOB_APPLICATION_EXPORT_BATCH_SIZE", "500"))
+
+RECORD_FIELDS = list(JobApplicationRecord.model_fields)
+
+# CSV cells can't hold lists, so interview dates are joined with this.
+LIST_SEPARATOR = ";"
+
+
+def detect_format(filename: str | None, content_type: str | None) -> FileFormat | None:
+    """Guess the format of an upload from its file name or content type."""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return "ndjson"
+    return None
+
+
+def undecodable(text: str) -> bool:
+    """Whether `text` kept bytes that are not UTF-8, as lone surrogates."""
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def read_rows(
+    file: BinaryIO, file_format: FileFormat
+) -> Iterator[tuple[int, dict | str]]:
+    """
+    Yield (line number, raw row) one at a time from an uploaded file. Empty
+    CSV cells are dropped so model defaults apply. Rows that are not UTF-8,
+    and NDJSON lines that are not JSON, are yielded as an error message.
+    """
+    # Undecodable bytes fail their own row, not the whole upload.
+    text = io.TextIOWrapper(
+        file, encoding="utf-8-sig", errors="surrogateescape", newline=""
+    )
+
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            if any(
+                undecodable(cell)
+                for cell in (*row.keys(), *row.values())
+                if isinstance(cell, str)
+            ):
+                yield reader.line_num, "Not valid UTF-8 text"
+                continue
+            cells = {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            }
+            if "interview_dates" in cells:
+                cells["interview_dates"] = [
+                    day.strip()
+                    for day in cells["interview_dates"].split(LIST_SEPARATOR)
+                    if day.strip()
+                ]
+            yield reader.line_num, cells
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        if undecodable(line):
+            yield line_number, "Not valid UTF-8 text"
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e}"
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def insert_chunk(
+    chunk: list[tuple[int, JobApplication]], result: JobApplicationImportResult
+):
+    """Insert a chunk unordered, so one bad document doesn't stop the rest."""
+    try:
+        await JobApplication.insert_many(
+            [application for _, application in chunk], ordered=False
+        )
+        result.inserted += len(chunk)
+    except BulkWriteError as e:
+        result.inserted += e.details["nInserted"]
+        for write_error in e.details["writeErrors"]:
+            result.errors.append(
+                JobApplicationImportError(
+                    row=chunk[write_error["index"]][0], error=write_error["errmsg"]
+                )
+            )
+
+
+async def import_job_applications(
+    user_id: str, file: BinaryIO, file_format: FileFormat
+) -> JobApplicationImportResult:
+    """
+    Validate an uploaded file row by row and store the valid rows for
+    `user_id` in chunks. Invalid rows are reported, not fatal.
+    """
+    result = JobApplicationImportResult(total_rows=0, inserted=0, errors=[])
+    chunk: list[tuple[int, JobApplication]] = []
+
+    for line_number, row in read_rows(file, file_format):
+        result.total_rows += 1
+
+        if isinstance(row, str):
+            result.errors.append(JobApplicationImportError(row=line_number, error=row))
+            continue
+        try:
+            record = JobApplicationRecord.model_validate(row)
+        except ValidationError as e:
+            result.errors.append(
+                JobApplicationImportError(
+                    row=line_number, error=describe_validation_error(e)
+                )
+            )
+            continue
+
+        application = JobApplication(user_id=user_id, **record.model_dump())
+        # insert_many doesn't run document events, so fill the terms here.
+        application.update_search_terms()
+        chunk.append((line_number, application))
+
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await insert_chunk(chunk, result)
+            chunk = []
+
+    if chunk:
+        await insert_chunk(chunk, result)
+    if result.inserted:
+        invalidate_job_application_stats(user_id)
+
+    result.errors.sort(key=lambda error: error.row)
+    return result
+
+
+def stored_value(value):
+    """A stored field as JSON, with dates in the format they are imported in."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, list):
+        return [stored_value(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def export_values(document: dict) -> dict:
+    """
+    The record fields of a stored document, ready for JSON. Documents that
+    no longer validate, such as legacy free-text statuses, are exported as
+    they are stored rather than ending the stream.
+    """
+    try:
+        return JobApplicationRecord.model_validate(document).model_dump(mode="json")
+    except ValidationError as e:
+        logger.warning(
+            "Exporting job application %s as stored: %s",
+            document.get("_id"),
+            describe_validation_error(e),
+        )
+        return {field: stored_value(document.get(field)) for field in RECORD_FIELDS}
+
+
+def csv_line(values: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+async def export_job_applications(
+    user_id: str, file_format: FileFormat
+) -> AsyncIterator[str]:
+    """
+    Stream a user's job applications, newest first, in the import format.
+    Documents are read from the cursor in batches, never all at once.
+    """
+    cursor = (
+        read_collection(JobApplication)
+        .find(
+            {"user_id": user_id},
+            {field: 1 for field in RECORD_FIELDS},
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+        .sort(sort_spec("application_date", "desc"))
+    )
+
+    if file_format == "csv":
+        yield csv_line(RECORD_FIELDS)
+
+    async for document in cursor:
+        values = export_values(document)
+        if file_format == "ndjson":
+            yield json.dumps(values, ensure_ascii=False, separators=(",", ":")) + "\n"
+            continue
+
+        values["interview_dates"] = LIST_SEPARATOR.join(values["interview_dates"] or [])
+        yield csv_line(
+            ["" if values[field] is None else values[field] for field in RECORD_FIELDS]
+        )
@@ -1,11 +1,30 @@
 from datetime import date
 from typing import Literal, Optional
-from fastapi import APIRouter, Query, Request, status
+from fastapi import APIRouter, File, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
+from ...etag import (
+    document_version,
+    etag_matches,
+    not_modified,
+    strong_etag,
+    weak_etag,
+)
+from ...pagination import CountMode
 from ...rate_limiter import limiter
+from ...responses import ModelJSONRoute
+from .bulk import (
+    FileFormat,
+    detect_format,
+    export_job_applications,
+    import_job_applications,
+)
+from .exceptions import UnsupportedImportFormatError
 from .models import (
     JobApplication,
+    JobApplicationImportResult,
     JobApplicationListItem,
+    JobApplicationStats,
     JobApplicationUpdate,
     PaginatedJobApplications,
 )
@@ -15,9 +34,14 @@ from .service import (
     update_job_application,
     delete_job_application_by_id,
     fetch_job_applications,
+    get_job_application_stats,
 )
 
-router = APIRouter(prefix="/api/v1/job_applications", tags=["Job Applications"])
+router = APIRouter(
+    prefix="/api/v1/job_applications",
+    tags=["Job Applications"],
+    route_class=ModelJSONRoute,
+)
 
 
 @router.get(
@@ -28,16 +52,29 @@ router = APIRouter(prefix="/api/v1/job_applications", tags=["Job Applications"])
 @limiter.limit("10/minute;50/hour")
 async def list_job_applications(
     request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page; takes precedence over page"
+    ),
+    count: CountMode = Query(
+        "exact",
+        description=(
+            "exact: count matching items; estimated: use collection metadata "
+            "when unfiltered; none: skip the count"
+        ),
+    ),
     user_id: Optional[str] = Query(
         None, description="Filter by specific user ID (required for typical usage)"
     ),
     job_title: Optional[str] = Query(
-        None, description="Filter by job title (case-insensitive partial match)"
+        None,
+        description="Filter by words or word prefixes of the job title (case-insensitive)",
     ),
     company_name: Optional[str] = Query(
-        None, description="Filter by company name (case-insensitive partial match)"
+        None,
+        description="Filter by words or word prefixes of the company name (case-insensitive)",
     ),
     status: Optional[str] = Query(None, description="Filter by application status"),
     min_application_date: Optional[date] = Query(
@@ -73,21 +110,123 @@ async def list_job_applications(
         has_interviews=has_interviews,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        count=count,
     )
+
+    etag = weak_etag(
+        request.url.query,
+        applications.total,
+        applications.next_cursor,
+        versions=[(item.id, item.last_updated) for item in applications.items],
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return applications
 
 
+@router.get(
+    "/stats",
+    response_model=JobApplicationStats,
+    summary="Get the application pipeline metrics of a user",
+)
+@limiter.limit("20/minute;200/hour")
+async def get_job_applications_stats(
+    request: Request,
+    user_id: str = Query(..., description="Owner of the applications"),
+    min_application_date: Optional[date] = Query(
+        None, description="Only count applications from this date"
+    ),
+    max_application_date: Optional[date] = Query(
+        None, description="Only count applications up to this date"
+    ),
+):
+    """
+    Returns counts per status, applications per week, the response rate and
+    the time to a first interview, computed in the database.
+    """
+    return await get_job_application_stats(
+        user_id=user_id,
+        min_application_date=min_application_date,
+        max_application_date=max_application_date,
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=JobApplicationImportResult,
+    summary="Import job applications from a CSV or NDJSON file",
+)
+@limiter.limit("2/minute;10/hour")
+async def post_job_applications_bulk(
+    request: Request,
+    user_id: str = Query(..., description="Owner of the imported applications"),
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    file_format: Optional[FileFormat] = Query(
+        None,
+        alias="format",
+        description="File format; guessed from the file name when omitted",
+    ),
+):
+    """
+    Imports job applications in bulk. Rows are validated one at a time and
+    stored in chunks; rows that fail are listed with their line number.
+    """
+    file_format = file_format or detect_format(file.filename, file.content_type)
+    if file_format is None:
+        raise UnsupportedImportFormatError()
+
+    return await import_job_applications(user_id, file.file, file_format)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export a user's job applications as CSV or NDJSON",
+)
+@limiter.limit("5/minute;20/hour")
+async def export_job_applications_file(
+    request: Request,
+    user_id: str = Query(..., description="Owner of the exported applications"),
+    file_format: FileFormat = Query("ndjson", alias="format"),
+):
+    """
+    Streams every job application of a user in the import format.
+    """
+    media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_job_applications(user_id, file_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="job_applications.{file_format}"'
+            )
+        },
+    )
+
+
 @router.get(
     "/{app_id}",
     response_model=JobApplication,
+    response_model_exclude={"search_terms"},
     summary="Get a single job application by ID",
 )
 @limiter.limit("5/minute;20/hour")
-async def get_job_application(request: Request, app_id: str):
+async def get_job_application(request: Request, response: Response, app_id: str):
     """
-    Retrieves a single job application by its ID.
+    Retrieves a single job application by its ID. Answers 304 to a matching
+    If-None-Match after reading only `last_updated`.
     """
+    if request.headers.get("if-none-match"):
+        version = await document_version(JobApplication, app_id, "last_updated")
+        if version is not None:
+            etag = strong_etag(app_id, version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
     application = await get_job_application_by_id(app_id)
+    response.headers["ETag"] = strong_etag(application.id, application.last_updated)
     return application
 
 
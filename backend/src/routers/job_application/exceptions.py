@@ -39,3 +39,13 @@ class JobApplicationAlreadyExistsError(JobApplicationError):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Job application with id {id} already exists.",
         )
+
+
+class UnsupportedImportFormatError(JobApplicationError):
+    """Exception raised when an uploaded file is neither CSV nor NDJSON."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload a .csv or .ndjson file, or pass format=csv|ndjson.",
+        )
@@ -1,9 +1,12 @@
 from datetime import date, datetime
-from typing import List, Optional
-from beanie import Document, Indexed, PydanticObjectId
+from typing import Dict, List, Optional
+from beanie import Document, Insert, PydanticObjectId, Replace, Save, before_event
 from pydantic import BaseModel, Field, HttpUrl
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from enum import Enum
 
+from ...search import build_search_terms
+
 
 class ApplicationStatus(str, Enum):
     APPLIED = "Applied"
@@ -18,7 +21,7 @@ class JobApplication(Document):
     Pydantic and Beanie model for a job application entry.
     """
 
-    user_id: str = Indexed(str)
+    user_id: str
 
     job_title: str
     company_name: str
@@ -43,16 +46,118 @@ class JobApplication(Document):
         default=None, description="ID of the ATS analysis for this application"
     )
 
+    search_terms: List[str] = Field(
+        default_factory=list,
+        description="Word prefixes of the job title and company name, for search",
+    )
+
     class Settings:
         name = "job_applications"
+        # Listings filter on one user (and often a status or search terms),
+        # then sort on one field with `_id` as the cursor tie breaker:
+        # equality fields first, then the sort, so no listing sorts in
+        # memory. Listings across all users sort on the bare field.
+        indexes = [
+            IndexModel([("application_date", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("last_updated", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("job_title", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("company_name", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("application_date", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("application_date", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("last_updated", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("last_updated", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [("user_id", ASCENDING), ("job_title", ASCENDING), ("_id", ASCENDING)]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("company_name", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("search_terms", ASCENDING),
+                    ("application_date", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("search_terms", ASCENDING),
+                    ("last_updated", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("search_terms", ASCENDING),
+                    ("job_title", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("search_terms", ASCENDING),
+                    ("company_name", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
+        ]
 
     async def save(self, *args, **kwargs):
         self.last_updated = datetime.utcnow()
         await super().save(*args, **kwargs)
 
+    @before_event(Insert, Replace, Save)
+    def update_search_terms(self):
+        self.search_terms = job_application_search_terms(
+            self.job_title, self.company_name
+        )
+
+
+def job_application_search_terms(
+    job_title: str | None, company_name: str | None
+) -> list[str]:
+    return build_search_terms({"job_title": job_title, "company_name": company_name})
+
 
 class JobApplicationListItem(BaseModel):
-    """Response model for job application list items."""
+    """
+    Response model for job application list items. Listings project the
+    collection onto these fields.
+    """
 
     id: PydanticObjectId = Field(alias="_id")
     user_id: str
@@ -76,10 +181,77 @@ class JobApplicationListItem(BaseModel):
 class PaginatedJobApplications(BaseModel):
     """Response model for paginated job application list."""
 
-    total: int
+    total: Optional[int] = Field(
+        None, description="Matching items; omitted when count=none"
+    )
     page: int
     page_size: int
     items: List[JobApplicationListItem]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page"
+    )
+
+
+class JobApplicationRecord(BaseModel):
+    """A job application as imported and exported in bulk, without its owner."""
+
+    job_title: str
+    company_name: str
+    company_website: Optional[HttpUrl] = None
+    job_url: Optional[HttpUrl] = None
+    location: Optional[str] = None
+    status: ApplicationStatus = ApplicationStatus.APPLIED
+    application_date: date = Field(default_factory=date.today)
+    interview_dates: List[date] = Field(default_factory=list)
+    notes: Optional[str] = None
+    associated_resume_id: Optional[str] = None
+    associated_analysis_id: Optional[str] = None
+
+
+class JobApplicationImportError(BaseModel):
+    """A row of a bulk import that was not stored."""
+
+    row: int = Field(description="Line number of the row in the uploaded file")
+    error: str
+
+
+class JobApplicationImportResult(BaseModel):
+    """Response model for a bulk import."""
+
+    total_rows: int
+    inserted: int
+    errors: List[JobApplicationImportError]
+
+
+class WeeklyApplications(BaseModel):
+    """Applications sent in the week starting on a Monday."""
+
+    week_start: date
+    count: int
+
+
+class TimeToInterview(BaseModel):
+    """Days from applying to the first interview, over applications with one."""
+
+    applications: int
+    average_days: Optional[float] = None
+    min_days: Optional[float] = None
+    max_days: Optional[float] = None
+
+
+class JobApplicationStats(BaseModel):
+    """Response model for the application pipeline dashboard."""
+
+    total: int
+    status_counts: Dict[ApplicationStatus, int]
+    applications_per_week: List[WeeklyApplications]
+    responded: int = Field(
+        description="Applications that got an interview, an offer or a rejection"
+    )
+    response_rate: Optional[float] = Field(
+        None, description="responded / total; omitted when there are no applications"
+    )
+    time_to_interview: TimeToInterview
 
 
 class JobApplicationUpdate(BaseModel):
@@ -90,7 +262,7 @@ class JobApplicationUpdate(BaseModel):
     company_website: Optional[HttpUrl] = None
     job_url: Optional[HttpUrl] = None
     location: Optional[str] = None
-    status: Optional[str] = None
+    status: Optional[ApplicationStatus] = None
     application_date: Optional[date] = None
     interview_dates: Optional[List[date]] = None
     notes: Optional[str] = None
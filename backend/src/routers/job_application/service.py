@@ -1,12 +1,25 @@
-from datetime import datetime
-from beanie import PydanticObjectId, SortDirection
+from datetime import date, datetime
+import os
+
+from beanie import PydanticObjectId
+from beanie.odm.utils.encoder import Encoder
+from beanie.odm.utils.projection import get_projection
 from fastapi import HTTPException, status
+from pymongo import ReturnDocument
 
+from ...cache import LRUCache
+from ...database import read_collection
+from ...pagination import CountMode, paginate
+from ...search import replace_search_terms, search_filter
 from .models import (
+    ApplicationStatus,
     JobApplication,
+    JobApplicationStats,
     JobApplicationListItem,
     JobApplicationUpdate,
     PaginatedJobApplications,
+    TimeToInterview,
+    WeeklyApplications,
 )
 from .exceptions import (
     InvalidIDFormatError,
@@ -15,9 +28,23 @@ from .exceptions import (
 )
 
 
-async def fetch_job_applications(
-    page: int = 1,
-    page_size: int = 10,
+# Per (user, date range); writes evict a user's entries, and the TTL bounds
+# how stale the cache of another worker can be.
+_stats_cache = LRUCache(
+    maxsize=int(os.getenv("JOB_APPLICATION_STATS_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("JOB_APPLICATION_STATS_CACHE_TTL_SECONDS", "300")),
+)
+
+MILLISECONDS_PER_DAY = 24 * 60 * 60 * 1000
+
+RESPONDED_STATUSES = [
+    ApplicationStatus.INTERVIEWING.value,
+    ApplicationStatus.OFFER_RECEIVED.value,
+    ApplicationStatus.REJECTED.value,
+]
+
+
+def build_job_application_query(
     user_id: str = None,
     job_title: str = None,
     company_name: str = None,
@@ -26,21 +53,18 @@ async def fetch_job_applications(
     max_application_date: datetime = None,
     has_notes: bool = None,
     has_interviews: bool = None,
-    sort_by: str = "application_date",
-    sort_order: str = "desc",
-) -> PaginatedJobApplications:
-    """
-    Fetches a paginated list of job applications with optional filters.
-    """
+) -> dict:
+    """Build the Mongo filter of a job application listing."""
     query = {}
 
     if user_id:
         query["user_id"] = user_id
 
-    if job_title:
-        query["job_title"] = {"$regex": job_title, "$options": "i"}
-    if company_name:
-        query["company_name"] = {"$regex": company_name, "$options": "i"}
+    terms = search_filter("job_title", job_title) + search_filter(
+        "company_name", company_name
+    )
+    if terms:
+        query["search_terms"] = {"$all": terms}
     if status:
         query["status"] = status
 
@@ -67,33 +91,193 @@ async def fetch_job_applications(
                 {"interview_dates": None},
             ]
 
-    sort_direction = (
-        SortDirection.ASCENDING if sort_order == "asc" else SortDirection.DESCENDING
-    )
-    sort_field = (sort_by, sort_direction)
+    return query
 
-    total_applications = await JobApplication.find(query).count()
 
-    applications_cursor = JobApplication.find(query).sort(sort_field)
-    applications = (
-        await applications_cursor.skip((page - 1) * page_size)
-        .limit(page_size)
-        .to_list()
+async def fetch_job_applications(
+    page: int = 1,
+    page_size: int = 10,
+    user_id: str = None,
+    job_title: str = None,
+    company_name: str = None,
+    status: str = None,
+    min_application_date: datetime = None,
+    max_application_date: datetime = None,
+    has_notes: bool = None,
+    has_interviews: bool = None,
+    sort_by: str = "application_date",
+    sort_order: str = "desc",
+    cursor: str = None,
+    count: CountMode = "exact",
+) -> PaginatedJobApplications:
+    """
+    Fetches a paginated list of job applications with optional filters.
+    Pass the `next_cursor` of a page as `cursor` to page without skipping.
+    """
+    query = build_job_application_query(
+        user_id=user_id,
+        job_title=job_title,
+        company_name=company_name,
+        status=status,
+        min_application_date=min_application_date,
+        max_application_date=max_application_date,
+        has_notes=has_notes,
+        has_interviews=has_interviews,
     )
 
-    items = [
-        JobApplicationListItem.model_validate(app.model_dump(by_alias=True))
-        for app in applications
-    ]
+    items, next_cursor, total_applications = await paginate(
+        JobApplication,
+        query,
+        sort_by,
+        sort_order,
+        page,
+        page_size,
+        cursor,
+        projection_model=JobApplicationListItem,
+        count=count,
+    )
 
     return PaginatedJobApplications(
         total=total_applications,
         page=page,
         page_size=page_size,
         items=items,
+        next_cursor=next_cursor,
     )
 
 
+def stats_pipeline() -> list[dict]:
+    """
+    One $facet stage computing every dashboard metric in a single pass over
+    the matched applications.
+    """
+    has_interviews = {"$gt": [{"$size": {"$ifNull": ["$interview_dates", []]}}, 0]}
+    responded = {"$or": [{"$in": ["$status", RESPONDED_STATUSES]}, has_interviews]}
+    # Application dates are stored at midnight, so stepping back to Monday
+    # lands on the start of the week without $dateTrunc (MongoDB 5.0+).
+    week_start = {
+        "$subtract": [
+            "$application_date",
+            {
+                "$multiply": [
+                    {"$subtract": [{"$isoDayOfWeek": "$application_date"}, 1]},
+                    MILLISECONDS_PER_DAY,
+                ]
+            },
+        ]
+    }
+    days_to_interview = {
+        "$divide": [
+            {"$subtract": [{"$min": "$interview_dates"}, "$application_date"]},
+            MILLISECONDS_PER_DAY,
+        ]
+    }
+
+    return [
+        {
+            "$facet": {
+                "status_counts": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "applications_per_week": [
+                    {
+                        "$group": {
+                            "_id": week_start,
+                            "count": {"$sum": 1},
+                        }
+                    },
+                    {"$sort": {"_id": 1}},
+                ],
+                "responses": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total": {"$sum": 1},
+                            "responded": {"$sum": {"$cond": [responded, 1, 0]}},
+                        }
+                    }
+                ],
+                "time_to_interview": [
+                    {"$match": {"interview_dates.0": {"$exists": True}}},
+                    {"$project": {"days": days_to_interview}},
+                    {
+                        "$group": {
+                            "_id": None,
+                            "applications": {"$sum": 1},
+                            "average_days": {"$avg": "$days"},
+                            "min_days": {"$min": "$days"},
+                            "max_days": {"$max": "$days"},
+                        }
+                    },
+                ],
+            }
+        }
+    ]
+
+
+async def get_job_application_stats(
+    user_id: str,
+    min_application_date: date = None,
+    max_application_date: date = None,
+) -> JobApplicationStats:
+    """
+    Computes the application pipeline metrics of a user in one aggregation,
+    optionally limited to an application date range. Results are cached
+    until the user's applications change.
+    """
+    cache_key = (user_id, min_application_date, max_application_date)
+    cached = _stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    query = build_job_application_query(
+        user_id=user_id,
+        min_application_date=min_application_date,
+        max_application_date=max_application_date,
+    )
+    # find() encodes the dates of the filter for the $match stage.
+    match = {"$match": JobApplication.find(query).get_filter_query()}
+    [facets] = (
+        await read_collection(JobApplication)
+        .aggregate([match, *stats_pipeline()])
+        .to_list(None)
+    )
+
+    status_counts = {status: 0 for status in ApplicationStatus}
+    for row in facets["status_counts"]:
+        # Updates used to accept any string; those statuses are not counted.
+        status = ApplicationStatus._value2member_map_.get(row["_id"])
+        if status is not None:
+            status_counts[status] = row["count"]
+
+    responses = facets["responses"][0] if facets["responses"] else {}
+    total = responses.get("total", 0)
+    responded = responses.get("responded", 0)
+
+    time_to_interview = (
+        facets["time_to_interview"][0]
+        if facets["time_to_interview"]
+        else {"applications": 0}
+    )
+
+    stats = JobApplicationStats(
+        total=total,
+        status_counts=status_counts,
+        applications_per_week=[
+            WeeklyApplications(week_start=row["_id"].date(), count=row["count"])
+            for row in facets["applications_per_week"]
+        ],
+        responded=responded,
+        response_rate=responded / total if total else None,
+        time_to_interview=TimeToInterview.model_validate(time_to_interview),
+    )
+    _stats_cache.set(cache_key, stats)
+    return stats
+
+
+def invalidate_job_application_stats(user_id: str):
+    """Evict every cached stats entry of a user after one of their writes."""
+    _stats_cache.delete_where(lambda key, value: key[0] == user_id)
+
+
 async def get_job_application_by_id(app_id: str) -> JobApplication:
     """
     Retrieves a single job application by its ID.
@@ -119,6 +303,7 @@ async def create_job_application(
         if existing_application:
             raise JobApplicationAlreadyExistsError(id=job_application.id)
     await job_application.insert()
+    invalidate_job_application_stats(job_application.user_id)
     return job_application
 
 
@@ -126,7 +311,8 @@ async def update_job_application(
     app_id: str, update_data: JobApplicationUpdate
 ) -> JobApplicationListItem:
     """
-    Partially updates an existing job application entry.
+    Partially updates an existing job application entry in one atomic
+    find-and-update round trip.
     """
 
     try:
@@ -134,32 +320,42 @@ async def update_job_application(
     except Exception:
         raise InvalidIDFormatError(id=app_id)
 
-    job_app = await JobApplication.get(app_obj_id)
-    if not job_app:
-        raise JobApplicationNotFoundError(id=app_id)
-
     update_dict = update_data.model_dump(exclude_unset=True)
 
-    if (
-        "associated_resume_id" in update_dict
-        and update_dict["associated_resume_id"] is not None
-    ):
-        update_dict["associated_resume_id"] = PydanticObjectId(
-            update_dict["associated_resume_id"]
-        )
-    if (
-        "associated_analysis_id" in update_dict
-        and update_dict["associated_analysis_id"] is not None
-    ):
-        update_dict["associated_analysis_id"] = PydanticObjectId(
-            update_dict["associated_analysis_id"]
-        )
+    for field in ["associated_resume_id", "associated_analysis_id"]:
+        if update_dict.get(field) is not None:
+            try:
+                update_dict[field] = str(PydanticObjectId(update_dict[field]))
+            except Exception:
+                raise InvalidIDFormatError(id=update_dict[field])
 
     update_dict["last_updated"] = datetime.utcnow()
 
-    await job_app.set(update_dict)
+    # An update pipeline, so search terms of a changed title or company can
+    # be recomputed next to the other field's terms without reading first.
+    encoded = Encoder(
+        custom_encoders=JobApplication.get_settings().bson_encoders
+    ).encode(update_dict)
+    changes = {field: {"$literal": value} for field, value in encoded.items()}
+    search_fields = {
+        field: update_dict[field]
+        for field in ["job_title", "company_name"]
+        if field in update_dict
+    }
+    if search_fields:
+        changes["search_terms"] = replace_search_terms(search_fields)
+
+    updated = await JobApplication.get_pymongo_collection().find_one_and_update(
+        {"_id": app_obj_id},
+        [{"$set": changes}],
+        projection=get_projection(JobApplicationListItem),
+        return_document=ReturnDocument.AFTER,
+    )
+    if not updated:
+        raise JobApplicationNotFoundError(id=app_id)
+    invalidate_job_application_stats(updated["user_id"])
 
-    return JobApplicationListItem.model_validate(job_app.model_dump(by_alias=True))
+    return JobApplicationListItem.model_validate(updated)
 
 
 async def delete_job_application_by_id(app_id: str) -> dict:
@@ -176,4 +372,5 @@ async def delete_job_application_by_id(app_id: str) -> dict:
         raise JobApplicationNotFoundError(id=app_id)
 
     await job_app.delete()
+    invalidate_job_application_stats(job_app.user_id)
     return {"detail": "Job application deleted successfully"}
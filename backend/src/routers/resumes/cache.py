@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+from pymongo.errors import OperationFailure
+
+from ...cache import LRUCache
+from .models import Resume, ResumeCacheStats
+
+
+logger = logging.getLogger(__name__)
+
+# Error code of a change stream opened on a standalone server; change
+# streams need a replica set or a sharded cluster.
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+MAX_WATCH_RETRY_SECONDS = 60
+
+
+class ResumeCache:
+    """
+    Read-through cache of `Resume` documents by ID, shared by the resume and
+    ATS routes. Entries remember the `updated_at` they were read at, so an
+    invalidation for a version the cache already holds leaves it in place.
+    Cached resumes are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        # Bumped on every invalidation; a read that overlaps one is not
+        # cached, as it may have returned the version just replaced.
+        self._generation = 0
+        self.invalidations = 0
+        self.change_stream = False
+
+    async def get(self, resume_id: str) -> Resume | None:
+        resume = self._entries.get(resume_id)
+        if resume is not None:
+            return resume
+
+        generation = self._generation
+        resume = await Resume.get(resume_id)
+        if resume is not None and generation == self._generation:
+            self._entries.set(resume_id, resume)
+        return resume
+
+    def invalidate(self, resume_id: str, version: datetime | None = None):
+        """Evict a resume, unless the cached copy is already at `version`."""
+        self._generation += 1
+        cached = self._entries.peek(resume_id)
+        if cached is None:
+            return
+        if version is not None and cached.updated_at >= version:
+            return
+        self._entries.delete(resume_id)
+        self.invalidations += 1
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> ResumeCacheStats:
+        return ResumeCacheStats(
+            cache=self._entries.stats(),
+            invalidations=self.invalidations,
+            change_stream=self.change_stream,
+        )
+
+    async def watch(self):
+        """
+        Evict resumes changed by any worker, as reported by a change stream
+        on the resumes collection. Reconnects with backoff; gives up on
+        servers without change streams, leaving the TTL to bound staleness.
+        """
+        pipeline = [
+            {"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}
+        ]
+        retry_delay = 1.0
+
+        while True:
+            try:
+                async with Resume.get_pymongo_collection().watch(pipeline) as stream:
+                    # Changes made while no stream was open were missed.
+                    self.clear()
+                    self.change_stream = True
+                    retry_delay = 1.0
+                    async for change in stream:
+                        self.invalidate(
+                            str(change["documentKey"]["_id"]), change_version(change)
+                        )
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_UNSUPPORTED:
+                    logger.info(
+                        "Change streams are not supported by the server; "
+                        "resume cache entries expire by TTL only"
+                    )
+                    self.change_stream = False
+                    return
+                logger.warning("Resume change stream failed: %s", e)
+            except Exception as e:
+                logger.warning("Resume change stream failed: %s", e)
+
+            self.change_stream = False
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, MAX_WATCH_RETRY_SECONDS)
+
+
+def change_version(change: dict) -> datetime | None:
+    """The new `updated_at` of an update event; None for replaces and deletes."""
+    updated_fields = change.get("updateDescription", {}).get("updatedFields", {})
+    return updated_fields.get("updated_at")
+
+
+resume_cache = ResumeCache(
+    maxsize=int(os.getenv("RESUME_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("RESUME_CACHE_TTL_SECONDS", "300")) or None,
+)
+
+_watcher: asyncio.Task | None = None
+
+
+async def get_resume(resume_id: str) -> Resume | None:
+    """Fetch a resume by ID through the cache."""
+    return await resume_cache.get(resume_id)
+
+
+def invalidate_resume(resume_id: str):
+    resume_cache.invalidate(resume_id)
+
+
+def get_resume_cache_stats() -> ResumeCacheStats:
+    return resume_cache.stats()
+
+
+async def start_resume_cache_watcher():
+    """Start following resume changes. Called once from the application lifespan."""
+    global _watcher
+
+    if os.getenv("RESUME_CACHE_CHANGE_STREAM", "true").lower() != "false":
+        _watcher = asyncio.create_task(
+            resume_cache.watch(), name="resume-cache-watcher"
+        )
+
+
+async def stop_resume_cache_watcher():
+    global _watcher
+
+    if _watcher is not None:
+        _watcher.cancel()
+        await asyncio.gather(_watcher, return_exceptions=True)
+        _watcher = None
@@ -1,9 +1,19 @@
 from datetime import datetime
 from typing import Literal, Optional
-from fastapi import APIRouter, Query, Request, status
+from fastapi import APIRouter, Query, Request, Response, status
 
+from ...etag import (
+    document_version,
+    etag_matches,
+    not_modified,
+    strong_etag,
+    weak_etag,
+)
+from ...pagination import CountMode
 from ...rate_limiter import limiter
-from .models import PaginatedResumes, Resume, ResumeUpdate
+from ...responses import ModelJSONRoute
+from .cache import get_resume_cache_stats
+from .models import PaginatedResumes, Resume, ResumeCacheStats, ResumeUpdate
 from .service import (
     create_resume,
     delete_resume_by_id,
@@ -12,19 +22,33 @@ from .service import (
     update_resume,
 )
 
-router = APIRouter(prefix="/api/v1/resumes", tags=["Resumes"])
+router = APIRouter(
+    prefix="/api/v1/resumes", tags=["Resumes"], route_class=ModelJSONRoute
+)
 
 
 @router.get("/", response_model=PaginatedResumes, summary="List Resumes")
 @limiter.limit("10/minute;50/hour")
 async def get_all_resumes(
     request: Request,
+    response: Response,
     # Pagination
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page; takes precedence over page"
+    ),
+    count: CountMode = Query(
+        "exact",
+        description=(
+            "exact: count matching items; estimated: use collection metadata "
+            "when unfiltered; none: skip the count"
+        ),
+    ),
     # Filtering options
     search_name: Optional[str] = Query(
-        None, description="Search by resume name (case-insensitive)"
+        None,
+        description="Search by words or word prefixes of the resume name (case-insensitive)",
     ),
     starred: Optional[bool] = Query(
         None, description="Filter by starred status (true/false)"
@@ -52,26 +76,68 @@ async def get_all_resumes(
         sort_order=sort_order,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        count=count,
     )
+
+    etag = weak_etag(
+        request.url.query,
+        resumes.total,
+        resumes.next_cursor,
+        versions=[(item.id, item.updated_at) for item in resumes.items],
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return resumes
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED, response_model=Resume)
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=Resume,
+    response_model_exclude={"search_terms"},
+)
 @limiter.limit("5/minute;20/hour")
 async def post_resume(request: Request, resume_data: Resume):
     resume = await create_resume(resume_data)
     return resume
 
 
-@router.get("/{resume_id}", response_model=Resume)
+@router.get(
+    "/stats", summary="Get Resume Cache Counters", response_model=ResumeCacheStats
+)
+@limiter.limit("60/minute")
+async def get_stats(request: Request):
+    """
+    Get resume cache counters of the worker serving the call.
+    """
+    return get_resume_cache_stats()
+
+
+@router.get(
+    "/{resume_id}", response_model=Resume, response_model_exclude={"search_terms"}
+)
 @limiter.limit("5/minute;20/hour")
-async def get_resume(request: Request, resume_id: str):
+async def get_resume(request: Request, response: Response, resume_id: str):
+    # A conditional GET reads only `updated_at` and skips serialization.
+    if request.headers.get("if-none-match"):
+        version = await document_version(Resume, resume_id, "updated_at")
+        if version is not None:
+            etag = strong_etag(resume_id, version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
     resume = await fetch_resume_by_id(resume_id)
+    response.headers["ETag"] = strong_etag(resume.id, resume.updated_at)
     return resume
 
 
 @router.patch(
-    "/{resume_id}", response_model=Resume, summary="Partially Update a Resume"
+    "/{resume_id}",
+    response_model=Resume,
+    response_model_exclude={"search_terms"},
+    summary="Partially Update a Resume",
 )
 @limiter.limit("5/minute;20/hour")
 async def patch_resume(request: Request, resume_id: str, update_data: ResumeUpdate):
@@ -1,8 +1,20 @@
 from typing import List, Optional
 from datetime import datetime
 
-from beanie import Document, Indexed
+from beanie import (
+    Document,
+    Indexed,
+    Insert,
+    PydanticObjectId,
+    Replace,
+    Save,
+    before_event,
+)
 from pydantic import BaseModel, Field, EmailStr
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from ...cache import CacheStats
+from ...search import build_search_terms
 
 
 class Contact(BaseModel):
@@ -58,7 +70,7 @@ class SkillCategory(BaseModel):
 class Resume(Document):
     """Main Pydantic model for a resume document."""
 
-    user_id: str = Indexed(str)
+    user_id: Indexed(str)
     resume_info: str = Indexed(str, unique=True)
     name: str = Indexed(str, unique=True)
     starred: bool = False
@@ -69,14 +81,63 @@ class Resume(Document):
     skills: List[SkillCategory] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    search_terms: List[str] = Field(
+        default_factory=list, description="Word prefixes of the name, for search"
+    )
 
     class Settings:
         name = "resumes"
+        # Listings sort on created_at, updated_at or name with `_id` as the
+        # cursor tie breaker, optionally filtered on starred or name terms.
+        indexes = [
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("updated_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("name", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel(
+                [
+                    ("search_terms", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("search_terms", ASCENDING),
+                    ("updated_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [("search_terms", ASCENDING), ("name", ASCENDING), ("_id", ASCENDING)]
+            ),
+            IndexModel(
+                [
+                    ("starred", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("starred", ASCENDING),
+                    ("updated_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+        ]
 
     async def save(self, *args, **kwargs):
         self.updated_at = datetime.utcnow()
         await super().save(*args, **kwargs)
 
+    @before_event(Insert, Replace, Save)
+    def update_search_terms(self):
+        self.search_terms = resume_search_terms(self.name)
+
+
+def resume_search_terms(name: str | None) -> list[str]:
+    return build_search_terms({"name": name})
+
 
 class ResumeUpdate(BaseModel):
     resume_info: Optional[str] = None
@@ -89,7 +150,10 @@ class ResumeUpdate(BaseModel):
 
 
 class ResumeListItem(BaseModel):
-    id: str = Field(alias="_id")
+    """Projection of a resume for listings; only these fields are read."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
     resume_info: str
     starred: bool
     created_at: datetime
@@ -102,7 +166,22 @@ class ResumeListItem(BaseModel):
 class PaginatedResumes(BaseModel):
     """Response model for paginated resume list."""
 
-    total: int
+    total: Optional[int] = Field(
+        None, description="Matching items; omitted when count=none"
+    )
     page: int
     page_size: int
     items: List[ResumeListItem]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page"
+    )
+
+
+class ResumeCacheStats(BaseModel):
+    """Counters of the resume cache of the worker serving the call."""
+
+    cache: CacheStats
+    invalidations: int
+    change_stream: bool = Field(
+        description="Whether changes made by other workers evict entries"
+    )
@@ -1,26 +1,31 @@
 from datetime import datetime
-from beanie import PydanticObjectId, SortDirection
-from .models import PaginatedResumes, Resume, ResumeListItem, ResumeUpdate
-from .exceptions import ResumeAlreadyExistsError, ResumeNotFoundError, ResumeUpdateError
-
-
-async def fetch_resumes(
+from beanie import PydanticObjectId, UpdateResponse
+from ...pagination import CountMode, paginate
+from ...search import search_filter
+from ..ats.service import invalidate_resume_analyses
+from .cache import get_resume, invalidate_resume
+from .models import (
+    PaginatedResumes,
+    Resume,
+    ResumeListItem,
+    ResumeUpdate,
+    resume_search_terms,
+)
+from .exceptions import ResumeAlreadyExistsError, ResumeNotFoundError
+
+
+def build_resume_query(
     search_name: str = None,
     starred: bool = None,
     min_created_at: datetime = None,
     max_created_at: datetime = None,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
-    page: int = 1,
-    page_size: int = 10,
-):
-    """
-    Retrieves a paginated list of all resumes, with optional filtering and sorting.
-    """
+) -> dict:
+    """Build the Mongo filter of a resume listing."""
     query = {}
 
-    if search_name:
-        query["name"] = {"$regex": search_name, "$options": "i"}
+    name_terms = search_filter("name", search_name)
+    if name_terms:
+        query["search_terms"] = {"$all": name_terms}
     if starred is not None:
         query["starred"] = starred
     if min_created_at:
@@ -31,32 +36,50 @@ async def fetch_resumes(
         else:
             query["created_at"] = {"$lte": max_created_at}
 
-    sort_direction = (
-        SortDirection.ASCENDING if sort_order == "asc" else SortDirection.DESCENDING
-    )
-    sort_field = (sort_by, sort_direction)
+    return query
 
-    total_resumes = await Resume.find(query).count()
 
-    resumes_cursor = Resume.find(query).sort(sort_field)
-    resumes = (
-        await resumes_cursor.skip((page - 1) * page_size).limit(page_size).to_list()
+async def fetch_resumes(
+    search_name: str = None,
+    starred: bool = None,
+    min_created_at: datetime = None,
+    max_created_at: datetime = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    page: int = 1,
+    page_size: int = 10,
+    cursor: str = None,
+    count: CountMode = "exact",
+):
+    """
+    Retrieves a paginated list of all resumes, with optional filtering and sorting.
+    Pass the `next_cursor` of a page as `cursor` to page without skipping.
+    """
+    query = build_resume_query(
+        search_name=search_name,
+        starred=starred,
+        min_created_at=min_created_at,
+        max_created_at=max_created_at,
     )
 
-    items = []
-    for resume in resumes:
-        resume_dict = resume.model_dump(by_alias=True)
-
-        if "_id" in resume_dict and isinstance(resume_dict["_id"], PydanticObjectId):
-            resume_dict["_id"] = str(resume_dict["_id"])
-
-        items.append(ResumeListItem.model_validate(resume_dict))
+    items, next_cursor, total_resumes = await paginate(
+        Resume,
+        query,
+        sort_by,
+        sort_order,
+        page,
+        page_size,
+        cursor,
+        projection_model=ResumeListItem,
+        count=count,
+    )
 
     return PaginatedResumes(
         total=total_resumes,
         page=page,
         page_size=page_size,
         items=items,
+        next_cursor=next_cursor,
     )
 
 
@@ -71,28 +94,33 @@ async def create_resume(resume_data: Resume):
 
 
 async def fetch_resume_by_id(resume_id: str):
-    """Fetch a resume by its ID."""
-    resume = await Resume.get(resume_id)
+    """Fetch a resume by its ID, through the resume cache."""
+    resume = await get_resume(resume_id)
     if not resume:
         raise ResumeNotFoundError(id=resume_id)
     return resume
 
 
 async def update_resume(resume_id: str, update_data: ResumeUpdate):
-    """Partially update an existing resume."""
-    resume = await Resume.get(resume_id)
-    if not resume:
+    """Partially update an existing resume in one atomic round trip."""
+    try:
+        resume_obj_id = PydanticObjectId(resume_id)
+    except Exception:
         raise ResumeNotFoundError(id=resume_id)
 
     update_dict = update_data.model_dump(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
+    if "name" in update_dict:
+        update_dict["search_terms"] = resume_search_terms(update_dict["name"])
 
-    await resume.update({"$set": update_dict})
-
-    updated_resume = await Resume.get(resume_id)
+    updated_resume = await Resume.find_one(Resume.id == resume_obj_id).update(
+        {"$set": update_dict}, response_type=UpdateResponse.NEW_DOCUMENT
+    )
     if not updated_resume:
-        raise ResumeUpdateError(id=resume_id)
+        raise ResumeNotFoundError(id=resume_id)
 
+    invalidate_resume(resume_id)
+    invalidate_resume_analyses(resume_id)
     return updated_resume
 
 
@@ -103,4 +131,6 @@ async def delete_resume_by_id(resume_id: str):
         raise ResumeNotFoundError(id=resume_id)
 
     await result.delete()
+    invalidate_resume(resume_id)
+    invalidate_resume_analyses(resume_id)
     return {"message": "Resume deleted successfully"}
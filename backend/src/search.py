@@ -0,0 +1,59 @@
+import re
+import unicodedata
+
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Longest prefix stored per word; longer search words are truncated to it.
+MAX_PREFIX_LENGTH = 20
+
+
+def normalize_words(text: str | None) -> list[str]:
+    """Lowercase, accent-free words of `text`."""
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return WORD_PATTERN.findall(stripped)
+
+
+def build_search_terms(fields: dict[str, str | None]) -> list[str]:
+    """
+    Index terms for a document: every prefix of every word of each field,
+    tagged with the field key so one multikey index serves all fields.
+    `{"t": "Data Engineer"}` gives t:d, t:da, t:dat, t:data, t:e, ...
+    """
+    terms = set()
+    for key, text in fields.items():
+        for word in normalize_words(text):
+            for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1):
+                terms.add(f"{key}:{word[:length]}")
+    return sorted(terms)
+
+
+def search_filter(key: str, text: str | None) -> list[str]:
+    """Terms a document must all have to match `text` in field `key`."""
+    return [f"{key}:{word[:MAX_PREFIX_LENGTH]}" for word in normalize_words(text)]
+
+
+def replace_search_terms(fields: dict[str, str | None]) -> dict:
+    """
+    Aggregation expression for an update pipeline that swaps the terms of
+    `fields` in `search_terms` and keeps those of every other field, so a
+    partial update doesn't need to read the document first.
+    """
+    kept = {
+        "$filter": {
+            "input": {"$ifNull": ["$search_terms", []]},
+            "as": "term",
+            "cond": {
+                "$not": {
+                    "$in": [
+                        {"$arrayElemAt": [{"$split": ["$$term", ":"]}, 0]},
+                        list(fields),
+                    ]
+                }
+            },
+        }
+    }
+    return {"$setUnion": [kept, {"$literal": build_search_terms(fields)}]}
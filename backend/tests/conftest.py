@@ -0,0 +1,74 @@
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def evaluate(expression, document: dict, variables: dict | None = None):
+    """
+    Evaluate the aggregation expressions the services build against one
+    document, so tests can check what an update pipeline stores.
+    """
+    variables = variables or {}
+
+    def value(item):
+        return evaluate(item, document, variables)
+
+    if isinstance(expression, str) and expression.startswith("$$"):
+        return variables[expression[2:]]
+    if isinstance(expression, str) and expression.startswith("$"):
+        return document.get(expression[1:])
+    if isinstance(expression, list):
+        return [value(item) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+    if len(expression) != 1 or not next(iter(expression)).startswith("$"):
+        return {key: value(item) for key, item in expression.items()}
+
+    [(operator, argument)] = expression.items()
+    if operator == "$literal":
+        return argument
+    if operator == "$ifNull":
+        first, fallback = value(argument)
+        return fallback if first is None else first
+    if operator == "$filter":
+        name = argument["as"]
+        return [
+            item
+            for item in value(argument["input"])
+            if evaluate(argument["cond"], document, {**variables, name: item})
+        ]
+    if operator == "$not":
+        [operand] = argument if isinstance(argument, list) else [argument]
+        return not value(operand)
+    if operator == "$in":
+        item, items = value(argument)
+        return item in items
+    if operator == "$arrayElemAt":
+        items, index = value(argument)
+        return items[index]
+    if operator == "$split":
+        text, separator = value(argument)
+        return text.split(separator)
+    if operator == "$setUnion":
+        return sorted({item for items in value(argument) for item in items})
+    raise NotImplementedError(operator)
+
+
+def apply_update_pipeline(document: dict, pipeline: list[dict]) -> dict:
+    """The document as an update pipeline of $set stages leaves it."""
+    for stage in pipeline:
+        [(operator, changes)] = stage.items()
+        assert operator == "$set", operator
+        document = {
+            **document,
+            **{field: evaluate(change, document) for field, change in changes.items()},
+        }
+    return document
+
+
+@pytest.fixture
+def update_pipeline():
+    return apply_update_pipeline
@@ -0,0 +1,90 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.cache import LRUCache
+from src.main import app
+from src.rate_limiter import limiter
+from src.routers.ats import service
+from src.routers.ats.exceptions import DataValidationError
+from src.routers.ats.models import ATSCoreOutput
+
+
+ANALYSIS = ATSCoreOutput(
+    relevance_score=75,
+    skills=["Python", "FastAPI"],
+    total_years_of_experience=3,
+    project_categories=["Backend"],
+)
+
+
+class FakeATSAnalysis(SimpleNamespace):
+    """Stands in for the ATSAnalysis document; records what would be stored."""
+
+    stored: list = []
+
+    @classmethod
+    async def insert_many(cls, documents, ordered=True):
+        cls.stored.extend(documents)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def get_resume(resume_id):
+        return SimpleNamespace(id=resume_id)
+
+    async def get_cached_analysis(cache_key):
+        return None
+
+    async def request_llm_analysis(prompt):
+        if "invalid answer" in prompt:
+            raise DataValidationError(detail="LLM output validation failed")
+        if "provider down" in prompt:
+            raise RuntimeError("connection reset")
+        return ANALYSIS
+
+    FakeATSAnalysis.stored = []
+    monkeypatch.setattr(service, "get_resume", get_resume)
+    monkeypatch.setattr(service, "resume_fingerprint", lambda resume: "fingerprint")
+    monkeypatch.setattr(service, "serialize_resume_for_prompt", lambda resume: "")
+    monkeypatch.setattr(service, "get_cached_analysis", get_cached_analysis)
+    monkeypatch.setattr(service, "request_llm_analysis", request_llm_analysis)
+    monkeypatch.setattr(service, "ATSAnalysis", FakeATSAnalysis)
+    monkeypatch.setattr(service, "_analysis_cache", LRUCache(maxsize=16))
+    monkeypatch.setattr(limiter, "enabled", False)
+    return TestClient(app)
+
+
+def test_batch_streams_one_line_per_job_with_partial_failures(client):
+    jobs = [
+        {"job_title": "Backend", "job_description": "Python and FastAPI"},
+        {"job_title": "Data", "job_description": "an invalid answer"},
+        {"job_title": "Platform", "job_description": "Go and Kubernetes"},
+        {"job_title": "ML", "job_description": "provider down"},
+    ]
+
+    response = client.post(
+        "/api/v1/ats/analyze/batch", json={"resume_id": "resume-1", "jobs": jobs}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results = {line["index"]: line for line in lines}
+    assert len(lines) == len(results) == 4
+
+    for index in (0, 2):
+        assert results[index]["job_title"] == jobs[index]["job_title"]
+        assert results[index]["analysis"]["relevance_score"] == 75
+        assert results[index]["error"] is None
+    assert results[1]["analysis"] is None
+    assert results[1]["error"] == "LLM output validation failed"
+    assert results[3]["analysis"] is None
+    assert results[3]["error"] == "connection reset"
+
+    assert sorted(stored.job_title for stored in FakeATSAnalysis.stored) == [
+        "Backend",
+        "Platform",
+    ]
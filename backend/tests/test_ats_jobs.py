@@ -0,0 +1,186 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from src.routers.ats import jobs
+from src.routers.ats.models import ATSJobStatus, ATSRequest, ATSResponse
+
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeField:
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return (self.name, value)
+
+
+class FakeQuery:
+    def __init__(self, model, condition):
+        self.model = model
+        self.condition = condition
+
+    def __await__(self):
+        return self.model.lookup(self.condition).__await__()
+
+    async def update(self, update, **kwargs):
+        self.model.updates.append((self.condition, update))
+        if self.model.failing_updates:
+            self.model.failing_updates -= 1
+            raise PyMongoError("connection reset")
+
+
+class FakeATSJob:
+    """Stands in for the ATSJob document, backed by a dict instead of Mongo."""
+
+    id = FakeField("_id")
+    active_key = FakeField("active_key")
+
+    stored: dict = {}
+    updates: list = []
+    failing_updates = 0
+    misses_before_insert = 0
+    next_id = 0
+
+    def __init__(self, request, active_key=None, attempts=1):
+        self.id = None
+        self.request = request
+        self.active_key = active_key
+        self.attempts = attempts
+        self.status = ATSJobStatus.QUEUED
+        self.result = None
+        self.error = None
+
+    @classmethod
+    def reset(cls):
+        cls.stored = {}
+        cls.updates = []
+        cls.failing_updates = 0
+        cls.misses_before_insert = 0
+        cls.next_id = 0
+
+    @classmethod
+    def find_one(cls, condition):
+        return FakeQuery(cls, condition)
+
+    @classmethod
+    async def lookup(cls, condition):
+        field, value = condition
+        if field == "active_key" and cls.misses_before_insert:
+            # Another request inserts the job between our read and write.
+            cls.misses_before_insert -= 1
+            await FakeATSJob(request=None, active_key=value).insert()
+            return None
+        for job in cls.stored.values():
+            if getattr(job, "id" if field == "_id" else field) == value:
+                return job
+        return None
+
+    async def insert(self):
+        if any(job.active_key == self.active_key for job in self.stored.values()):
+            raise DuplicateKeyError("E11000 duplicate key error")
+        FakeATSJob.next_id += 1
+        self.id = f"job-{FakeATSJob.next_id}"
+        FakeATSJob.stored[self.id] = self
+
+
+@pytest.fixture
+def fake_jobs(monkeypatch):
+    FakeATSJob.reset()
+    monkeypatch.setattr(jobs, "ATSJob", FakeATSJob)
+    monkeypatch.setattr(jobs, "_worker_pool", None)
+    return FakeATSJob
+
+
+def make_request(**overrides) -> ATSRequest:
+    fields = dict(
+        resume_id="resume-1",
+        job_title="Backend Engineer",
+        job_description="Python, FastAPI and MongoDB",
+    )
+    return ATSRequest(**{**fields, **overrides})
+
+
+async def test_identical_requests_share_a_job(fake_jobs):
+    first = await jobs.enqueue_analysis(make_request())
+    second = await jobs.enqueue_analysis(make_request(job_title="Other title"))
+    other_mode = await jobs.enqueue_analysis(make_request(mode="fast"))
+
+    assert first.status == ATSJobStatus.QUEUED
+    assert second.job_id == first.job_id
+    assert other_mode.job_id != first.job_id
+    assert len(fake_jobs.stored) == 2
+
+
+async def test_duplicate_key_on_insert_returns_existing_job(fake_jobs):
+    fake_jobs.misses_before_insert = 1
+
+    job = await jobs.enqueue_analysis(make_request())
+
+    assert len(fake_jobs.stored) == 1
+    assert job.job_id == next(iter(fake_jobs.stored))
+
+
+def test_background_analyze_returns_202_with_job(fake_jobs, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+    from src.rate_limiter import limiter
+
+    monkeypatch.setattr(limiter, "enabled", False)
+    client = TestClient(app)
+    payload = make_request().model_dump()
+
+    first = client.post("/api/v1/ats/analyze?background=true", json=payload)
+    second = client.post("/api/v1/ats/analyze?background=true", json=payload)
+
+    assert first.status_code == 202
+    assert first.json()["status"] == "queued"
+    assert second.status_code == 202
+    assert second.json()["job_id"] == first.json()["job_id"]
+
+
+async def test_worker_survives_failed_status_write(fake_jobs, monkeypatch):
+    analysis = ATSResponse(
+        relevance_score=80,
+        skills=["python"],
+        total_years_of_experience=3,
+        project_categories=["Backend"],
+    )
+    queue = [
+        SimpleNamespace(id="job-1", request=make_request(), attempts=1),
+        SimpleNamespace(id="job-2", request=make_request(), attempts=1),
+    ]
+
+    async def fake_analyze(request):
+        return analysis
+
+    pool = jobs.ATSJobWorkerPool(concurrency=1, poll_interval=0.01)
+
+    async def claim():
+        return queue.pop(0) if queue else None
+
+    monkeypatch.setattr(jobs, "analyze_resume", fake_analyze)
+    monkeypatch.setattr(pool, "_claim", claim)
+    fake_jobs.failing_updates = 1
+
+    pool.start()
+    try:
+        for _ in range(100):
+            if len(fake_jobs.updates) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        assert [condition for condition, _ in fake_jobs.updates] == [
+            ("_id", "job-1"),
+            ("_id", "job-2"),
+        ]
+        _, update = fake_jobs.updates[1]
+        assert update["$set"]["status"] == ATSJobStatus.DONE
+        assert not any(worker.done() for worker in pool._workers)
+    finally:
+        await pool.stop()
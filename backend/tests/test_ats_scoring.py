@@ -0,0 +1,34 @@
+from src.routers.ats.scoring import relevance_score, tokenize
+
+
+JOB = tokenize(
+    "Backend engineer with Python, FastAPI and MongoDB. Experience with Docker "
+    "and Redis is a plus."
+)
+
+
+def test_matched_skills_score_full_marks():
+    skills = tokenize("Python, FastAPI, MongoDB, Docker, Redis, Engineer, Backend")
+    assert relevance_score(skills, [], JOB) == 100
+
+
+def test_shared_terms_are_not_penalised():
+    # With a two-document IDF every term both sides share weighed zero.
+    partial = relevance_score(tokenize("Python, FastAPI"), [], JOB)
+    unrelated = relevance_score(tokenize("Swift, Kotlin, Figma"), [], JOB)
+    assert unrelated == 0
+    assert 20 <= partial < 100
+
+
+def test_more_overlap_scores_higher():
+    scores = [
+        relevance_score(tokenize(skills), [], JOB)
+        for skills in ("Python", "Python, FastAPI", "Python, FastAPI, MongoDB")
+    ]
+    assert scores == sorted(scores)
+    assert len(set(scores)) == 3
+
+
+def test_empty_inputs_score_zero():
+    assert relevance_score([], [], JOB) == 0
+    assert relevance_score(tokenize("Python"), [], []) == 0
@@ -0,0 +1,239 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from src.routers.ats import singleflight
+from src.routers.ats.singleflight import SingleFlight
+
+
+pytestmark = pytest.mark.anyio
+
+KEY = "resume-1:job-1"
+
+
+class FakeField:
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return lambda lock: getattr(lock, self.name) == value
+
+    def __lt__(self, value):
+        return lambda lock: getattr(lock, self.name) < value
+
+
+class FakeQuery:
+    def __init__(self, model, conditions):
+        self.model = model
+        self.conditions = conditions
+
+    def match(self):
+        for lock in self.model.stored.values():
+            if all(condition(lock) for condition in self.conditions):
+                return lock
+        return None
+
+    def __await__(self):
+        async def find():
+            return self.match()
+
+        return find().__await__()
+
+    async def update(self, update):
+        lock = self.match()
+        if lock is not None:
+            for name, value in update["$set"].items():
+                setattr(lock, name, value)
+        return SimpleNamespace(modified_count=int(lock is not None))
+
+    async def delete(self):
+        lock = self.match()
+        if lock is not None:
+            del self.model.stored[lock.key]
+
+
+class FakeATSLock:
+    """Stands in for the ATSLock document, shared by every SingleFlight."""
+
+    key = FakeField("key")
+    owner = FakeField("owner")
+    expires_at = FakeField("expires_at")
+
+    stored: dict = {}
+
+    def __init__(self, key, owner, expires_at):
+        self.key = key
+        self.owner = owner
+        self.expires_at = expires_at
+
+    @classmethod
+    def find_one(cls, *conditions):
+        return FakeQuery(cls, conditions)
+
+    async def insert(self):
+        if self.key in self.stored:
+            raise DuplicateKeyError("duplicate key")
+        self.stored[self.key] = self
+
+
+@pytest.fixture(autouse=True)
+def fake_locks(monkeypatch):
+    FakeATSLock.stored = {}
+    monkeypatch.setattr(singleflight, "ATSLock", FakeATSLock)
+    return FakeATSLock
+
+
+class Call:
+    """A call that blocks until released and counts how often it ran."""
+
+    def __init__(self, result="analysis"):
+        self.result = result
+        self.started = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        await self.release.wait()
+        return self.result
+
+
+async def no_result():
+    return None
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_calls_run_once():
+    flight = SingleFlight()
+    call = Call()
+    tasks = [asyncio.create_task(flight.do(KEY, call, no_result)) for _ in range(3)]
+    await settle()
+    call.release.set()
+
+    assert await asyncio.gather(*tasks) == ["analysis"] * 3
+    assert call.started == 1
+    stats = flight.stats()
+    assert (stats.executed, stats.coalesced_local, stats.in_flight) == (1, 2, 0)
+    assert FakeATSLock.stored == {}
+
+
+async def test_followers_share_the_leaders_error():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("model unavailable")
+
+    results = await asyncio.gather(
+        flight.do(KEY, fail, no_result),
+        flight.do(KEY, fail, no_result),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert flight.stats().executed == 1
+
+
+async def test_a_follower_takes_over_when_the_leader_is_cancelled():
+    flight = SingleFlight()
+    call = Call()
+    leader = asyncio.create_task(flight.do(KEY, call, no_result))
+    await settle()
+    followers = [
+        asyncio.create_task(flight.do(KEY, call, no_result)) for _ in range(3)
+    ]
+    await settle()
+
+    leader.cancel()
+    await settle()
+    call.release.set()
+
+    assert await asyncio.gather(*followers) == ["analysis"] * 3
+    assert leader.cancelled()
+    # One follower re-ran the call; the other two waited on it.
+    assert call.started == 2
+    assert flight.stats().in_flight == 0
+    assert FakeATSLock.stored == {}
+
+
+async def test_a_cancelled_follower_leaves_the_others_waiting():
+    flight = SingleFlight()
+    call = Call()
+    leader = asyncio.create_task(flight.do(KEY, call, no_result))
+    await settle()
+    follower = asyncio.create_task(flight.do(KEY, call, no_result))
+    other = asyncio.create_task(flight.do(KEY, call, no_result))
+    await settle()
+
+    follower.cancel()
+    await settle()
+    call.release.set()
+
+    assert await asyncio.gather(leader, other) == ["analysis"] * 2
+    assert follower.cancelled()
+    assert call.started == 1
+
+
+async def test_other_workers_wait_for_the_lock_holders_result():
+    leader, waiter = SingleFlight(), SingleFlight(poll_interval=0.01)
+    call = Call()
+    stored = []
+
+    async def load_result():
+        return stored[0] if stored else None
+
+    leading = asyncio.create_task(leader.do(KEY, call, load_result))
+    await settle()
+    assert FakeATSLock.stored[KEY].owner == leader.owner
+
+    waiting = asyncio.create_task(waiter.do(KEY, Call("duplicate"), load_result))
+    await asyncio.sleep(0.03)
+    stored.append("analysis")
+    call.release.set()
+
+    assert await asyncio.gather(leading, waiting) == ["analysis"] * 2
+    assert (waiter.stats().executed, waiter.stats().coalesced_remote) == (0, 1)
+    assert FakeATSLock.stored == {}
+
+
+async def test_workers_run_the_call_when_the_lock_goes_away_without_a_result():
+    waiter = SingleFlight(poll_interval=0.01)
+    await FakeATSLock(
+        key=KEY, owner="crashed", expires_at=datetime.utcnow() + timedelta(minutes=1)
+    ).insert()
+
+    async def release_lock():
+        await asyncio.sleep(0.03)
+        del FakeATSLock.stored[KEY]
+
+    call = Call()
+    call.release.set()
+    result, _ = await asyncio.gather(
+        waiter.do(KEY, call, no_result), release_lock()
+    )
+
+    assert result == "analysis"
+    assert (waiter.stats().executed, waiter.stats().coalesced_remote) == (1, 1)
+
+
+async def test_expired_locks_are_taken_over():
+    flight = SingleFlight()
+    await FakeATSLock(
+        key=KEY, owner="crashed", expires_at=datetime.utcnow() - timedelta(seconds=1)
+    ).insert()
+    owners = []
+
+    async def call():
+        owners.append(FakeATSLock.stored[KEY].owner)
+        return "analysis"
+
+    assert await flight.do(KEY, call, no_result) == "analysis"
+    assert owners == [flight.owner]
+    assert flight.stats().coalesced_remote == 0
+    assert FakeATSLock.stored == {}
@@ -0,0 +1,60 @@
+import json
+
+from src.routers.ats.streaming import IncrementalJSONParser, format_sse
+
+
+DOCUMENT = {
+    "relevance_score": 82,
+    "skills": ["C++", "REST {APIs}", 'say "hi", then: leave', "back\\slash"],
+    "total_years_of_experience": 4,
+    "project_categories": ["Backend", "Data, Science]"],
+}
+
+
+def feed_all(parser: IncrementalJSONParser, text: str, size: int):
+    completed = []
+    for start in range(0, len(text), size):
+        completed.extend(parser.feed(text[start : start + size]))
+    return completed
+
+
+def test_fields_complete_as_they_stream_in():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"relevance_score": 82, "skills": ["Py') == [
+        ("relevance_score", 82)
+    ]
+    assert parser.feed('thon"], "total_years') == [("skills", ["Python"])]
+    assert not parser.done
+    assert parser.feed('_of_experience": 4}') == [("total_years_of_experience", 4)]
+    assert parser.done
+
+
+def test_chatter_around_the_object_is_ignored():
+    text = (
+        "Sure! Here is the analysis you asked for:\n```json\n"
+        + json.dumps(DOCUMENT, indent=2)
+        + "\n```\nLet me know if {you} need anything else."
+    )
+    parser = IncrementalJSONParser()
+
+    completed = feed_all(parser, text, size=1)
+
+    assert completed == list(DOCUMENT.items())
+    assert parser.document == DOCUMENT
+    assert parser.fields == DOCUMENT
+
+
+def test_delimiters_inside_strings_do_not_split_fields():
+    text = json.dumps(DOCUMENT)
+
+    for size in (1, 3, 7, len(text)):
+        parser = IncrementalJSONParser()
+        assert feed_all(parser, text, size) == list(DOCUMENT.items())
+        assert parser.document == DOCUMENT
+
+
+def test_format_sse():
+    assert format_sse("field", {"skills": ["Python"]}) == (
+        'event: field\ndata: {"skills": ["Python"]}\n\n'
+    )
@@ -0,0 +1,50 @@
+import inspect
+from typing import get_args
+
+from src.cli import canonical_queries
+from src.routers.job_application.controller import list_job_applications
+from src.routers.resumes.controller import get_all_resumes
+
+
+def index_keys(model) -> list[list[str]]:
+    return [
+        [field for field, _ in index.document["key"].items()]
+        for index in model.Settings.indexes
+    ]
+
+
+def filter_fields(query: dict) -> set[str]:
+    # A cursor's seek predicate sits next to the listing filter in an $and.
+    if "$and" in query:
+        query = query["$and"][0]
+    return {field for field in query if not field.startswith("$")}
+
+
+def test_every_canonical_query_has_an_index_for_its_filter_and_sort():
+    for label, model, query, sort_by, _ in canonical_queries():
+        equality = filter_fields(query) - {sort_by}
+        assert any(
+            set(keys[: len(equality)]) == equality
+            and keys[len(equality) :] == [sort_by, "_id"]
+            for keys in index_keys(model)
+        ), label
+
+
+def test_canonical_queries_cover_every_accepted_sort():
+    shapes = {
+        (label.split(", sort")[0], sort_by)
+        for label, _, _, sort_by, _ in canonical_queries()
+    }
+    listings = {
+        list_job_applications: [
+            "applications",
+            "applications by user",
+            "applications by title search",
+        ],
+        get_all_resumes: ["resumes", "resumes by name search"],
+    }
+    for endpoint, labels in listings.items():
+        sort_by = inspect.signature(endpoint).parameters["sort_by"]
+        for label in labels:
+            for accepted in get_args(sort_by.annotation):
+                assert (label, accepted) in shapes
@@ -0,0 +1,134 @@
+import gzip
+import zlib
+
+import brotli
+import pytest
+
+from src.compression import CompressionMiddleware, choose_encoding
+
+
+pytestmark = pytest.mark.anyio
+
+BODY = b'{"items": [' + b'{"status": "Applied"}, ' * 100 + b"]}"
+
+
+def response_app(body_messages, content_type="application/json", headers=()):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    *[(name.encode(), value.encode()) for name, value in headers],
+                ],
+            }
+        )
+        for message in body_messages:
+            await send({"type": "http.response.body", **message})
+
+    return app
+
+
+async def call(app, accept_encoding="gzip, br", **options):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {
+        "type": "http",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    await CompressionMiddleware(app, **options)(scope, receive, send)
+    start, *bodies = sent
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    return headers, bodies
+
+
+def test_brotli_is_preferred_on_a_tie():
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5") == "gzip"
+    assert choose_encoding("identity") is None
+
+
+async def test_large_json_is_compressed():
+    headers, bodies = await call(response_app([{"body": BODY}]))
+
+    assert headers["content-encoding"] == "br"
+    assert headers["vary"] == "Accept-Encoding"
+    assert brotli.decompress(bodies[0]["body"]) == BODY
+    assert headers["content-length"] == str(len(bodies[0]["body"]))
+
+
+async def test_bodies_under_the_minimum_size_pass_through():
+    small = b'{"status": "ok"}'
+    headers, bodies = await call(response_app([{"body": small}]), minimum_size=1024)
+
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert bodies[0]["body"] == small
+
+    headers, _ = await call(response_app([{"body": small}]), minimum_size=1)
+    assert headers["content-encoding"] == "br"
+
+
+async def test_event_streams_pass_through_uncompressed():
+    events = [
+        {"body": b"event: skills\ndata: []\n\n", "more_body": True},
+        {"body": b"event: done\ndata: {}\n\n", "more_body": False},
+    ]
+    headers, bodies = await call(
+        response_app(events, content_type="text/event-stream")
+    )
+
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+    assert bodies == [{"type": "http.response.body", **event} for event in events]
+
+
+async def test_ndjson_chunks_are_flushed_as_they_stream():
+    lines = [b'{"index": 0}\n', b'{"index": 1}\n', b'{"index": 2}\n']
+    chunks = [{"body": line, "more_body": True} for line in lines]
+    chunks.append({"body": b"", "more_body": False})
+    headers, bodies = await call(
+        response_app(chunks, content_type="application/x-ndjson"),
+        accept_encoding="gzip",
+    )
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    # Each compressed chunk decodes to its line before the next one is sent.
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for line, body in zip(lines, bodies):
+        assert body["more_body"] is True
+        assert decoder.decompress(body["body"]) == line
+    assert bodies[-1]["more_body"] is False
+    decoder.decompress(bodies[-1]["body"])
+    assert decoder.eof
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"".join(
+        lines
+    )
+
+
+async def test_strong_etags_are_weakened():
+    headers, _ = await call(response_app([{"body": BODY}], headers=[("etag", '"v1"')]))
+    assert headers["etag"] == 'W/"v1"'
+
+    headers, _ = await call(
+        response_app([{"body": BODY}], headers=[("etag", 'W/"v1"')])
+    )
+    assert headers["etag"] == 'W/"v1"'
+
+
+async def test_uncompressed_responses_keep_their_etag():
+    headers, _ = await call(
+        response_app([{"body": BODY}], headers=[("etag", '"v1"')]),
+        accept_encoding="identity",
+    )
+
+    assert "content-encoding" not in headers
+    assert headers["etag"] == '"v1"'
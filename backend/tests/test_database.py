@@ -0,0 +1,96 @@
+import pytest
+
+from src import database
+from src.routers.ats.models import ATSJob, ATSLock
+
+
+pytestmark = pytest.mark.anyio
+
+FULL_INDEXES = {
+    ATSJob: {
+        "_id_": {"key": [("_id", 1)]},
+        "active_key_1": {"key": [("active_key", 1)], "unique": True, "sparse": True},
+    },
+    ATSLock: {
+        "_id_": {"key": [("_id", 1)]},
+        "key_1": {"key": [("key", 1)], "unique": True},
+        "expires_at_1": {"key": [("expires_at", 1)], "expireAfterSeconds": 0},
+    },
+}
+
+
+class FakeCollection:
+    def __init__(self, name, indexes):
+        self.name = name
+        self.indexes = indexes
+
+    async def index_information(self):
+        return self.indexes
+
+
+@pytest.fixture
+def indexes(monkeypatch):
+    """Index information per model, as the server would report it."""
+    indexes = {
+        model: dict(FULL_INDEXES.get(model, {})) for model in database.DOCUMENT_MODELS
+    }
+    for model in database.DOCUMENT_MODELS:
+        collection = FakeCollection(model.Settings.name, indexes[model])
+        monkeypatch.setattr(
+            model, "get_pymongo_collection", lambda collection=collection: collection
+        )
+    return indexes
+
+
+def test_constraint_indexes_are_the_unique_and_ttl_ones():
+    names = {
+        model.__name__: [
+            index.document["name"] for index in database.constraint_indexes(model)
+        ]
+        for model in database.DOCUMENT_MODELS
+    }
+
+    assert names == {
+        "Resume": [],
+        "ATSAnalysis": [],
+        "ATSJob": ["active_key_1"],
+        "ATSLock": ["key_1", "expires_at_1"],
+        "JobApplication": [],
+    }
+
+
+async def test_nothing_missing_once_synced(indexes):
+    assert await database.missing_constraint_indexes() == []
+
+
+async def test_missing_and_mismatched_indexes_are_reported(indexes):
+    del indexes[ATSJob]["active_key_1"]
+    # Same keys, but a plain index doesn't expire anything.
+    indexes[ATSLock]["expires_at_1"] = {"key": [("expires_at", 1)]}
+
+    assert await database.missing_constraint_indexes() == [
+        "ats_jobs.active_key_1",
+        "ats_locks.expires_at_1",
+    ]
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    async def nothing(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(database, "init_beanie", nothing)
+    monkeypatch.setattr(database.MongoConnection, "warm_up", nothing)
+    yield
+    database._connection = None
+
+
+async def test_startup_fails_while_skipped_indexes_are_missing(indexes, connect):
+    indexes[ATSLock].clear()
+
+    with pytest.raises(RuntimeError, match="ats_locks.key_1.*sync-indexes"):
+        await database.init_db(skip_indexes=True)
+
+    # sync-indexes itself starts without them, and so do builds at startup.
+    await database.init_db(skip_indexes=True, check_indexes=False)
+    await database.init_db(skip_indexes=False)
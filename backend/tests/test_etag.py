@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+from src.etag import etag_matches, strong_etag, weak_etag
+from src.main import app
+from src.rate_limiter import limiter
+from src.routers.job_application import controller
+from src.routers.job_application.exceptions import JobApplicationNotFoundError
+
+
+APP_ID = "64b7f0c2a1e4d5f6a7b8c9d0"
+LAST_UPDATED = datetime(2025, 3, 1, 12, 30, 15, 123456)
+
+
+def request_with(if_none_match: str | None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode("latin-1")))
+    return Request({"type": "http", "headers": headers})
+
+
+def test_strong_etag_ignores_sub_millisecond_precision():
+    stored = LAST_UPDATED.replace(microsecond=123000)
+
+    assert strong_etag(APP_ID, LAST_UPDATED) == strong_etag(APP_ID, stored)
+    assert strong_etag(APP_ID, LAST_UPDATED) != strong_etag(
+        APP_ID, LAST_UPDATED.replace(second=16)
+    )
+
+
+def test_weak_etag_depends_on_page_parameters_and_items():
+    versions = [(APP_ID, LAST_UPDATED)]
+    etag = weak_etag("user-1", 1, 10, versions=versions)
+
+    assert etag.startswith('W/"')
+    assert etag == weak_etag("user-1", 1, 10, versions=versions)
+    assert etag != weak_etag("user-1", 2, 10, versions=versions)
+    assert etag != weak_etag("user-1", 1, 10, versions=[])
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", W/"abc"', True),
+        ('"other"', False),
+        ("abc", False),
+    ],
+)
+def test_if_none_match_uses_weak_comparison(header, matches):
+    assert etag_matches(request_with(header), '"abc"') is matches
+    assert etag_matches(request_with(header), 'W/"abc"') is matches
+
+
+@pytest.fixture
+def client(monkeypatch):
+    loads = []
+
+    async def document_version(model, document_id, field):
+        return LAST_UPDATED if document_id == APP_ID else None
+
+    async def get_job_application_by_id(app_id):
+        loads.append(app_id)
+        raise JobApplicationNotFoundError(id=app_id)
+
+    monkeypatch.setattr(controller, "document_version", document_version)
+    monkeypatch.setattr(
+        controller, "get_job_application_by_id", get_job_application_by_id
+    )
+    monkeypatch.setattr(limiter, "enabled", False)
+    client = TestClient(app)
+    client.loads = loads
+    return client
+
+
+def test_matching_if_none_match_answers_304_without_loading(client):
+    etag = strong_etag(APP_ID, LAST_UPDATED)
+
+    for header in (etag, f"W/{etag}", f'"stale", {etag}'):
+        response = client.get(
+            f"/api/v1/job_applications/{APP_ID}", headers={"If-None-Match": header}
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    assert client.loads == []
+
+
+def test_stale_if_none_match_loads_the_document(client):
+    stale = strong_etag(APP_ID, LAST_UPDATED.replace(year=2024))
+
+    response = client.get(
+        f"/api/v1/job_applications/{APP_ID}", headers={"If-None-Match": stale}
+    )
+
+    assert response.status_code == 404
+    assert client.loads == [APP_ID]
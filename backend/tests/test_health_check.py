@@ -0,0 +1,20 @@
+import time
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def test_liveness_reports_the_current_time():
+    client = TestClient(app)
+
+    first = client.get("/api/v1/health-check/live")
+    time.sleep(0.01)
+    second = client.get("/api/v1/health-check/live")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["status"] == "ok"
+    assert datetime.fromisoformat(second.json()["timestamp"]) > datetime.fromisoformat(
+        first.json()["timestamp"]
+    )
@@ -0,0 +1,222 @@
+import io
+import json
+from datetime import datetime
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from src.routers.job_application import bulk
+
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeJobApplication:
+    """Stands in for the JobApplication document; insert_many records its calls."""
+
+    inserted: list = []
+    duplicate_titles: set = set()
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.search_terms = None
+
+    def update_search_terms(self):
+        self.search_terms = [self.fields["job_title"].lower()]
+
+    @classmethod
+    async def insert_many(cls, documents, ordered=True):
+        assert ordered is False
+        errors = [
+            {"index": index, "errmsg": "E11000 duplicate key"}
+            for index, document in enumerate(documents)
+            if document.fields["job_title"] in cls.duplicate_titles
+        ]
+        cls.inserted.extend(
+            document
+            for document in documents
+            if document.fields["job_title"] not in cls.duplicate_titles
+        )
+        if errors:
+            raise BulkWriteError(
+                {"nInserted": len(documents) - len(errors), "writeErrors": errors}
+            )
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, spec):
+        return self
+
+    def __aiter__(self):
+        return self.iterate()
+
+    async def iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query, projection, batch_size):
+        self.queries.append(query)
+        return FakeCursor(self.documents)
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    FakeJobApplication.inserted = []
+    FakeJobApplication.duplicate_titles = set()
+    invalidated = []
+    monkeypatch.setattr(bulk, "JobApplication", FakeJobApplication)
+    monkeypatch.setattr(bulk, "invalidate_job_application_stats", invalidated.append)
+    return invalidated
+
+
+def upload(text: str | bytes) -> io.BytesIO:
+    return io.BytesIO(text.encode() if isinstance(text, str) else text)
+
+
+async def test_csv_rows_are_validated_and_stored(stored, monkeypatch):
+    monkeypatch.setattr(bulk, "IMPORT_CHUNK_SIZE", 2)
+    file = upload(
+        "\ufeffjob_title,company_name,status,interview_dates\n"
+        "Backend Engineer,Acme,Interviewing,2025-03-01;2025-03-08\n"
+        "Data Engineer,Globex,,\n"
+        ",Initech,Applied,\n"
+        "Frontend Engineer,Hooli,Hired,\n"
+        "SRE,Umbrella,Applied,\n"
+    )
+
+    result = await bulk.import_job_applications("user-1", file, "csv")
+
+    assert (result.total_rows, result.inserted) == (5, 3)
+    assert [error.row for error in result.errors] == [4, 5]
+    assert "job_title" in result.errors[0].error
+    assert "status" in result.errors[1].error
+    first, second, _ = FakeJobApplication.inserted
+    assert first.fields["user_id"] == "user-1"
+    assert [str(day) for day in first.fields["interview_dates"]] == [
+        "2025-03-01",
+        "2025-03-08",
+    ]
+    assert second.fields["status"] == "Applied"
+    assert first.search_terms == ["backend engineer"]
+    assert stored == ["user-1"]
+
+
+async def test_ndjson_reports_bad_json_and_write_errors(stored):
+    FakeJobApplication.duplicate_titles = {"Taken"}
+    file = upload(
+        '{"job_title": "Backend Engineer", "company_name": "Acme"}\n'
+        "\n"
+        "{not json\n"
+        '{"job_title": "Taken", "company_name": "Acme"}\n'
+    )
+
+    result = await bulk.import_job_applications("user-1", file, "ndjson")
+
+    assert (result.total_rows, result.inserted) == (3, 1)
+    assert [error.row for error in result.errors] == [3, 4]
+    assert result.errors[0].error.startswith("Invalid JSON")
+    assert "duplicate key" in result.errors[1].error
+
+
+@pytest.mark.parametrize("file_format", ["csv", "ndjson"])
+async def test_rows_that_are_not_utf8_fail_on_their_own(stored, file_format):
+    rows = [
+        b'{"job_title": "Backend Engineer", "company_name": "Acme"}\n',
+        b'{"job_title": "Ing\xe9nieur", "company_name": "Soci\xe9t\xe9"}\n',
+        b'{"job_title": "Data Engineer", "company_name": "Globex"}\n',
+    ]
+    if file_format == "csv":
+        rows = [
+            b"job_title,company_name\n",
+            b"Backend Engineer,Acme\n",
+            b"Ing\xe9nieur,Soci\xe9t\xe9\n",
+            b"Data Engineer,Globex\n",
+        ]
+
+    result = await bulk.import_job_applications(
+        "user-1", upload(b"".join(rows)), file_format
+    )
+
+    assert (result.total_rows, result.inserted) == (3, 2)
+    assert [(error.row, error.error) for error in result.errors] == [
+        (len(rows) - 1, "Not valid UTF-8 text")
+    ]
+
+
+async def test_nothing_inserted_leaves_the_stats_cached(stored):
+    result = await bulk.import_job_applications("user-1", upload("{}\n"), "ndjson")
+
+    assert result.inserted == 0
+    assert stored == []
+
+
+def legacy_documents():
+    return [
+        {
+            "_id": "a1",
+            "job_title": "Backend Engineer",
+            "company_name": "Acme",
+            "job_url": "https://acme.example/jobs/1",
+            "status": "Interviewing",
+            "application_date": datetime(2025, 3, 1),
+            "interview_dates": [datetime(2025, 3, 8), datetime(2025, 3, 15)],
+            "notes": 'Said "soon", maybe',
+        },
+        {
+            "_id": "a2",
+            "job_title": "Data Engineer",
+            "company_name": "Globex",
+            "status": "ghosted",
+            "application_date": datetime(2024, 12, 1),
+            "interview_dates": [],
+        },
+    ]
+
+
+async def export(monkeypatch, file_format):
+    collection = FakeCollection(legacy_documents())
+    monkeypatch.setattr(bulk, "read_collection", lambda model: collection)
+    lines = [
+        line async for line in bulk.export_job_applications("user-1", file_format)
+    ]
+    assert collection.queries == [{"user_id": "user-1"}]
+    return lines
+
+
+async def test_ndjson_export_keeps_rows_that_no_longer_validate(monkeypatch):
+    lines = await export(monkeypatch, "ndjson")
+
+    records = [json.loads(line) for line in lines]
+    assert records[0]["status"] == "Interviewing"
+    assert records[0]["interview_dates"] == ["2025-03-08", "2025-03-15"]
+    assert records[1]["status"] == "ghosted"
+    assert records[1]["application_date"] == "2024-12-01"
+    assert set(records[1]) == set(bulk.RECORD_FIELDS)
+
+
+async def test_csv_export_round_trips_through_import(monkeypatch, stored):
+    lines = await export(monkeypatch, "csv")
+
+    assert lines[0].strip() == ",".join(bulk.RECORD_FIELDS)
+    assert len(lines) == 3
+    assert ",ghosted," in lines[2]
+
+    result = await bulk.import_job_applications(
+        "user-2", upload("".join(lines)), "csv"
+    )
+    assert (result.inserted, [error.row for error in result.errors]) == (1, [3])
+    imported = FakeJobApplication.inserted[0].fields
+    assert imported["notes"] == 'Said "soon", maybe'
+    assert [str(day) for day in imported["interview_dates"]] == [
+        "2025-03-08",
+        "2025-03-15",
+    ]
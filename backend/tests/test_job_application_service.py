@@ -0,0 +1,267 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+
+from src.routers.job_application import service
+from src.routers.job_application.exceptions import (
+    InvalidIDFormatError,
+    JobApplicationNotFoundError,
+)
+from src.routers.job_application.models import (
+    ApplicationStatus,
+    JobApplication,
+    JobApplicationUpdate,
+    job_application_search_terms,
+)
+
+
+pytestmark = pytest.mark.anyio
+
+APP_ID = PydanticObjectId()
+
+
+def stored_application(**fields) -> dict:
+    document = {
+        "_id": APP_ID,
+        "user_id": "user-1",
+        "job_title": "Data Engineer",
+        "company_name": "Acme",
+        "status": "Applied",
+        "application_date": datetime(2025, 3, 3),
+        "last_updated": datetime(2025, 3, 3),
+        **fields,
+    }
+    document["search_terms"] = job_application_search_terms(
+        document["job_title"], document["company_name"]
+    )
+    return document
+
+
+class FakeCollection:
+    """find_one_and_update over one stored document, evaluating the pipeline."""
+
+    def __init__(self, document, apply):
+        self.document = document
+        self.apply = apply
+        self.calls = []
+
+    async def find_one_and_update(self, query, pipeline, **kwargs):
+        self.calls.append((query, pipeline))
+        if self.document is None or query["_id"] != self.document["_id"]:
+            return None
+        self.document = self.apply(self.document, pipeline)
+        return self.document
+
+
+@pytest.fixture
+def collection(monkeypatch, update_pipeline):
+    collection = FakeCollection(stored_application(), update_pipeline)
+    invalidated = []
+    monkeypatch.setattr(
+        JobApplication,
+        "get_settings",
+        classmethod(lambda cls: SimpleNamespace(bson_encoders={})),
+    )
+    monkeypatch.setattr(
+        JobApplication, "get_pymongo_collection", classmethod(lambda cls: collection)
+    )
+    monkeypatch.setattr(service, "invalidate_job_application_stats", invalidated.append)
+    collection.invalidated = invalidated
+    return collection
+
+
+async def test_update_sets_user_input_as_literals(collection):
+    update = JobApplicationUpdate(
+        notes="$where: sleep(1000)",
+        location="$$ROOT",
+        interview_dates=[date(2025, 3, 10)],
+    )
+
+    item = await service.update_job_application(str(APP_ID), update)
+
+    [(query, [stage])] = collection.calls
+    assert query == {"_id": APP_ID}
+    changes = stage["$set"]
+    assert changes["notes"] == {"$literal": "$where: sleep(1000)"}
+    assert changes["location"] == {"$literal": "$$ROOT"}
+    assert changes["interview_dates"] == {"$literal": [datetime(2025, 3, 10)]}
+    assert set(changes) == {"notes", "location", "interview_dates", "last_updated"}
+
+    stored = collection.document
+    assert stored["notes"] == "$where: sleep(1000)"
+    assert stored["location"] == "$$ROOT"
+    assert stored["last_updated"] > datetime(2025, 3, 3)
+    assert item.id == APP_ID
+    assert collection.invalidated == ["user-1"]
+
+
+async def test_titles_starting_with_a_dollar_are_stored_and_searchable(collection):
+    update = JobApplicationUpdate(job_title="$Money Engineer", status="Interviewing")
+
+    item = await service.update_job_application(str(APP_ID), update)
+
+    stored = collection.document
+    assert item.job_title == stored["job_title"] == "$Money Engineer"
+    assert stored["status"] == ApplicationStatus.INTERVIEWING.value
+    assert stored["search_terms"] == job_application_search_terms(
+        "$Money Engineer", "Acme"
+    )
+
+
+async def test_renaming_the_company_keeps_the_title_terms(collection):
+    await service.update_job_application(
+        str(APP_ID), JobApplicationUpdate(company_name="Globex")
+    )
+
+    terms = collection.document["search_terms"]
+    assert terms == job_application_search_terms("Data Engineer", "Globex")
+    assert "company_name:acme" not in terms
+
+
+async def test_updates_without_search_fields_leave_the_terms_alone(collection):
+    await service.update_job_application(
+        str(APP_ID), JobApplicationUpdate(notes="Follow up")
+    )
+
+    [(_, [stage])] = collection.calls
+    assert "search_terms" not in stage["$set"]
+
+
+async def test_bad_ids_and_missing_applications_are_rejected(collection):
+    with pytest.raises(InvalidIDFormatError):
+        await service.update_job_application("nope", JobApplicationUpdate())
+    with pytest.raises(InvalidIDFormatError):
+        await service.update_job_application(
+            str(APP_ID), JobApplicationUpdate(associated_resume_id="nope")
+        )
+    assert collection.calls == []
+
+    collection.document = None
+    with pytest.raises(JobApplicationNotFoundError):
+        await service.update_job_application(str(APP_ID), JobApplicationUpdate())
+    assert collection.invalidated == []
+
+
+def test_stats_pipeline_is_one_facet_stage():
+    [stage] = service.stats_pipeline()
+
+    facets = stage["$facet"]
+    assert set(facets) == {
+        "status_counts",
+        "applications_per_week",
+        "responses",
+        "time_to_interview",
+    }
+    assert facets["status_counts"] == [
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]
+    assert facets["applications_per_week"][-1] == {"$sort": {"_id": 1}}
+    responded = facets["responses"][0]["$group"]["responded"]["$sum"]["$cond"][0]
+    assert {"$in": ["$status", service.RESPONDED_STATUSES]} in responded["$or"]
+    assert facets["time_to_interview"][0] == {
+        "$match": {"interview_dates.0": {"$exists": True}}
+    }
+
+
+class FakeAggregation:
+    def __init__(self, result):
+        self.result = result
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return self
+
+    async def to_list(self, length):
+        return [self.result]
+
+
+FACETS = {
+    "status_counts": [
+        {"_id": "Applied", "count": 3},
+        {"_id": "Interviewing", "count": 1},
+        {"_id": "ghosted", "count": 2},
+    ],
+    "applications_per_week": [
+        {"_id": datetime(2025, 3, 3), "count": 4},
+        {"_id": datetime(2025, 3, 10), "count": 2},
+    ],
+    "responses": [{"_id": None, "total": 6, "responded": 2}],
+    "time_to_interview": [
+        {
+            "_id": None,
+            "applications": 1,
+            "average_days": 7.0,
+            "min_days": 7.0,
+            "max_days": 7.0,
+        }
+    ],
+}
+
+
+@pytest.fixture
+def aggregation(monkeypatch):
+    aggregation = FakeAggregation(FACETS)
+    monkeypatch.setattr(service, "read_collection", lambda model: aggregation)
+    monkeypatch.setattr(
+        JobApplication,
+        "find",
+        classmethod(
+            lambda cls, query: SimpleNamespace(get_filter_query=lambda: query)
+        ),
+    )
+    service._stats_cache.clear()
+    yield aggregation
+    service._stats_cache.clear()
+
+
+async def test_stats_match_the_user_then_facet(aggregation):
+    start, end = date(2025, 3, 1), date(2025, 3, 31)
+
+    stats = await service.get_job_application_stats("user-1", start, end)
+
+    [[match, facet]] = aggregation.pipelines
+    assert match == {
+        "$match": {
+            "user_id": "user-1",
+            "application_date": {"$gte": start, "$lte": end},
+        }
+    }
+    assert [facet] == service.stats_pipeline()
+
+    assert stats.total == 6
+    assert stats.status_counts[ApplicationStatus.APPLIED] == 3
+    assert stats.status_counts[ApplicationStatus.OFFER_RECEIVED] == 0
+    assert sum(stats.status_counts.values()) == 4
+    assert [week.week_start for week in stats.applications_per_week] == [
+        date(2025, 3, 3),
+        date(2025, 3, 10),
+    ]
+    assert stats.response_rate == pytest.approx(1 / 3)
+    assert stats.time_to_interview.average_days == 7.0
+
+
+async def test_stats_are_cached_until_invalidated(aggregation):
+    await service.get_job_application_stats("user-1")
+    await service.get_job_application_stats("user-1")
+    assert len(aggregation.pipelines) == 1
+
+    service.invalidate_job_application_stats("user-1")
+    await service.get_job_application_stats("user-1")
+    assert len(aggregation.pipelines) == 2
+
+
+async def test_stats_of_a_user_without_applications(aggregation):
+    aggregation.result = {
+        "status_counts": [],
+        "applications_per_week": [],
+        "responses": [],
+        "time_to_interview": [],
+    }
+
+    stats = await service.get_job_application_stats("user-2")
+
+    assert (stats.total, stats.response_rate) == (0, None)
+    assert stats.time_to_interview.applications == 0
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.metrics import metrics
+from src.routers.ats import service
+from src.routers.ats.models import ATSRequest
+
+
+@pytest.mark.parametrize("multiproc_dir", [None, ""])
+def test_metrics_endpoint_serves_this_worker(monkeypatch, multiproc_dir):
+    if multiproc_dir is None:
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    else:
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", multiproc_dir)
+    client = TestClient(app)
+    client.get("/api/v1/health-check/live")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'applywise_http_request_duration_seconds_count{method="GET",'
+        'route="/api/v1/health-check/live",status="200"}'
+    ) in response.text
+
+
+@pytest.mark.anyio
+async def test_failed_analysis_is_logged_and_counted(monkeypatch, caplog):
+    class FailingSingleFlight:
+        async def do(self, key, call, recheck):
+            raise RuntimeError("connection reset")
+
+    async def get_resume(resume_id):
+        return SimpleNamespace(id=resume_id)
+
+    async def get_cached_analysis(cache_key):
+        return None
+
+    monkeypatch.setattr(service, "get_resume", get_resume)
+    monkeypatch.setattr(service, "resume_fingerprint", lambda resume: "fingerprint")
+    monkeypatch.setattr(service, "serialize_resume_for_prompt", lambda resume: "")
+    monkeypatch.setattr(service, "get_cached_analysis", get_cached_analysis)
+    monkeypatch.setattr(service, "_single_flight", FailingSingleFlight())
+    failures = metrics.ats_failures.labels("analyze", "RuntimeError")
+    before = failures._value.get()
+
+    with pytest.raises(HTTPException) as error:
+        await service.analyze_resume(
+            ATSRequest(resume_id="resume-1", job_title="Backend", job_description="Go")
+        )
+
+    assert error.value.status_code == 500
+    assert failures._value.get() == before + 1
+    assert "General error in analyze_resume" in caplog.text
@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+
+from src import pagination
+from src.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from src.routers.job_application.service import fetch_job_applications
+from src.routers.resumes.service import fetch_resumes
+
+
+def make_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode()
+
+
+def test_cursor_round_trip():
+    id = PydanticObjectId()
+    created_at = datetime(2025, 3, 1, 12, 30)
+
+    cursor = encode_cursor("created_at", "desc", created_at, id)
+
+    assert decode_cursor(cursor, "created_at", "desc") == (created_at, id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        "bm90IGpzb24",
+        make_cursor(["created_at", "desc"]),
+        make_cursor({"f": "created_at", "o": "desc", "v": 1}),
+        make_cursor({"f": "created_at", "o": "desc", "v": 1, "id": "not-an-id"}),
+        make_cursor({"f": "created_at", "o": "desc", "v": {}, "id": "0" * 24}),
+        make_cursor({"f": "job_title", "o": "desc", "v": "a", "id": "0" * 24}),
+        make_cursor({"f": "created_at", "o": "asc", "v": 1, "id": "0" * 24}),
+    ],
+)
+def test_malformed_or_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError) as error:
+        decode_cursor(cursor, "created_at", "desc")
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "fetch, sort_by",
+    [(fetch_resumes, "created_at"), (fetch_job_applications, "application_date")],
+)
+async def test_bad_cursor_is_rejected_before_any_query(monkeypatch, fetch, sort_by):
+    def read_collection(model):
+        raise AssertionError("database queried with an invalid cursor")
+
+    monkeypatch.setattr(pagination, "read_collection", read_collection)
+    cursor = encode_cursor("job_title", "desc", "a", PydanticObjectId())
+
+    with pytest.raises(InvalidCursorError):
+        await fetch(sort_by=sort_by, cursor=cursor, count="exact")
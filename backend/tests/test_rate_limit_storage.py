@@ -0,0 +1,173 @@
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+import pytest
+from limits import parse
+from limits.storage import Storage
+from pymongo.errors import PyMongoError
+
+from src import rate_limit_storage
+from src.rate_limit_storage import LeasedRateLimiter, MongoBucketStorage
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakeBucketStorage(MongoBucketStorage):
+    """Bucket counters in a dict; `down` makes every round trip fail."""
+
+    def __init__(self, clock: FakeClock):
+        Storage.__init__(self, "buckets+mongodb://fake")
+        self.clock = clock
+        self.counts: dict[str, int] = {}
+        self.round_trips = 0
+        self.down = False
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        self.round_trips += 1
+        if self.down:
+            raise PyMongoError("no servers available")
+        start, _ = self.window(key, expiry, self.clock.time())
+        bucket = f"{key}@{start:.0f}"
+        self.counts[bucket] = self.counts.get(bucket, 0) + amount
+        return self.counts[bucket]
+
+
+class DeferredExecutor(Executor):
+    """Runs reservations only when told to, like round trips still in flight."""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.pending.append((fn, args, kwargs))
+        return Future()
+
+    def run_pending(self):
+        while self.pending:
+            fn, args, kwargs = self.pending.pop(0)
+            fn(*args, **kwargs)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit_storage, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def storage(clock):
+    return FakeBucketStorage(clock)
+
+
+def test_window_is_offset_per_key_and_holds_now():
+    now = 1_700_000_000.0
+
+    start, end = MongoBucketStorage.window("user:1", 60, now)
+    other_start, _ = MongoBucketStorage.window("user:2", 60, now)
+
+    assert start <= now < end == start + 60
+    assert MongoBucketStorage.window("user:1", 60, end) == (end, end + 60)
+    assert other_start != start
+
+
+def test_hits_never_wait_on_the_storage(storage):
+    def slow_incr(key, expiry, amount=1):
+        time.sleep(0.5)
+        return amount
+
+    storage.incr = slow_incr
+    limiter = LeasedRateLimiter(storage, executor=ThreadPoolExecutor(max_workers=1))
+
+    started = time.perf_counter()
+    assert limiter.hit(parse("5/minute"), "client")
+    assert time.perf_counter() - started < 0.1
+    limiter.close()
+
+
+@pytest.mark.parametrize("hits_per_round_trip", [1, 4])
+def test_hits_stay_within_a_block_per_limiter_of_the_limit(
+    storage, hits_per_round_trip
+):
+    item = parse("20/minute")
+    executors = [DeferredExecutor(), DeferredExecutor()]
+    limiters = [
+        LeasedRateLimiter(storage, lease_fraction=0.25, executor=executor)
+        for executor in executors
+    ]
+
+    allowed = 0
+    for hit in range(60):
+        allowed += limiters[hit % 2].hit(item, "client")
+        if hit % hits_per_round_trip == 0:
+            for executor in executors:
+                executor.run_pending()
+
+    # A block is 5 hits here; each limiter may let one through unreserved.
+    assert 20 - 2 * 5 <= allowed <= 20 + 2 * 5
+    assert storage.counts and storage.round_trips < 60
+
+
+def test_full_window_rejects_locally_until_reset(clock, storage):
+    item = parse("5/minute")
+    executor = DeferredExecutor()
+    limiter = LeasedRateLimiter(storage, executor=executor)
+
+    results = []
+    for _ in range(8):
+        results.append(limiter.hit(item, "client"))
+        executor.run_pending()
+    assert results == [True] * 5 + [False] * 3
+
+    round_trips = storage.round_trips
+    assert not any(limiter.hit(item, "client") for _ in range(10))
+    executor.run_pending()
+    assert storage.round_trips == round_trips
+
+    _, reset_at = storage.window(item.key_for("client"), item.get_expiry(), clock.now)
+    clock.now = reset_at
+    assert limiter.hit(item, "client")
+    executor.run_pending()
+    assert storage.round_trips > round_trips
+
+
+def test_unreachable_storage_falls_back_to_memory_then_retries(clock, storage):
+    item = parse("2/minute")
+    executor = DeferredExecutor()
+    limiter = LeasedRateLimiter(storage, retry_seconds=30, executor=executor)
+    storage.down = True
+
+    # Let through ahead of a reservation that then fails.
+    assert limiter.hit(item, "client")
+    executor.run_pending()
+    assert storage.round_trips == 1
+
+    assert limiter.hit(item, "client")
+    assert limiter.hit(item, "client")
+    assert not limiter.hit(item, "client")
+    executor.run_pending()
+    assert storage.round_trips == 1
+
+    storage.down = False
+    clock.now += 30
+    assert limiter.hit(item, "other-client")
+    executor.run_pending()
+    assert storage.round_trips > 1
+
+
+def test_closed_limiter_counts_in_memory(storage):
+    item = parse("1/minute")
+    executor = DeferredExecutor()
+    limiter = LeasedRateLimiter(storage, executor=executor)
+
+    limiter.close()
+
+    assert limiter.hit(item, "client")
+    assert not limiter.hit(item, "client")
+    assert executor.pending == []
@@ -0,0 +1,176 @@
+import json
+from typing import Optional
+
+import fastapi.routing
+from fastapi import APIRouter, FastAPI, Response, status
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from src.responses import ModelJSONResponse, ModelJSONRoute
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+    tags: list[str] = []
+    note: Optional[str] = None
+    secret: str = Field("hidden", alias="internalSecret")
+
+
+class DetailedItem(Item):
+    """A subclass still goes through FastAPI, which filters it to Item."""
+
+    margin: float = 0.0
+
+
+ITEM = Item(name="pen", price=1.5, internalSecret="s3")
+
+router = APIRouter(route_class=ModelJSONRoute)
+
+
+@router.get("/item", response_model=Item)
+async def get_item():
+    return ITEM
+
+
+@router.post("/item", response_model=Item, status_code=status.HTTP_201_CREATED)
+async def post_item():
+    return ITEM
+
+
+@router.get("/item/headers", response_model=Item)
+async def get_item_with_headers(response: Response):
+    response.headers["ETag"] = '"v1"'
+    response.set_cookie("seen", "1")
+    return ITEM
+
+
+@router.get("/item/accepted", response_model=Item)
+async def get_accepted_item(response: Response):
+    response.status_code = status.HTTP_202_ACCEPTED
+    return ITEM
+
+
+@router.get("/item/filtered", response_model=Item, response_model_exclude={"tags"})
+async def get_filtered_item():
+    return ITEM
+
+
+@router.get("/item/unset", response_model=Item, response_model_exclude_unset=True)
+async def get_unset_item():
+    return Item(name="pen", price=1.5)
+
+
+@router.get("/item/no-none", response_model=Item, response_model_exclude_none=True)
+async def get_item_without_none():
+    return ITEM
+
+
+@router.get("/item/subclass", response_model=Item)
+async def get_subclass():
+    return DetailedItem(name="pen", price=1.5, margin=0.4)
+
+
+@router.get("/item/dict", response_model=Item)
+async def get_dict():
+    return {"name": "pen", "price": "1.5", "internalSecret": "s3", "extra": 1}
+
+
+@router.get("/item/response", response_model=Item)
+async def get_response():
+    return Response(b"raw", media_type="text/plain", status_code=203)
+
+
+@router.get("/item/sync", response_model=Item)
+def get_item_sync():
+    return ITEM
+
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_matching_model_is_dumped_directly():
+    response = client.get("/item")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "name": "pen",
+        "price": 1.5,
+        "tags": [],
+        "note": None,
+        "internalSecret": "s3",
+    }
+
+
+def test_matching_model_skips_fastapis_serialization(monkeypatch):
+    # The fast path leans on FastAPI passing a returned Response through
+    # untouched; this breaks loudly if an upgrade changes that.
+    serialized = []
+    original = fastapi.routing.serialize_response
+
+    async def serialize_response(*args, **kwargs):
+        serialized.append(kwargs.get("response_content"))
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(fastapi.routing, "serialize_response", serialize_response)
+
+    assert client.get("/item").status_code == 200
+    assert serialized == []
+    assert client.get("/item/subclass").status_code == 200
+    assert len(serialized) == 1
+
+
+def test_route_status_code_is_kept():
+    assert client.post("/item").status_code == 201
+
+
+def test_headers_and_status_set_on_the_injected_response_are_merged():
+    response = client.get("/item/headers")
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"v1"'
+    assert "seen=1" in response.headers["set-cookie"]
+    assert response.headers["content-length"] == str(len(response.content))
+
+    assert client.get("/item/accepted").status_code == 202
+
+
+def test_response_model_dump_options_apply():
+    assert "tags" not in client.get("/item/filtered").json()
+    assert client.get("/item/unset").json() == {"name": "pen", "price": 1.5}
+    assert "note" not in client.get("/item/no-none").json()
+
+
+def test_other_returns_take_fastapis_path():
+    # Filtered to the response model, not dumped as the subclass.
+    assert "margin" not in client.get("/item/subclass").json()
+
+    from_dict = client.get("/item/dict").json()
+    assert from_dict["price"] == 1.5
+    assert "extra" not in from_dict
+
+    raw = client.get("/item/response")
+    assert (raw.status_code, raw.text) == (203, "raw")
+
+
+def test_sync_endpoints_are_left_to_fastapi():
+    assert client.get("/item/sync").json()["internalSecret"] == "s3"
+
+
+def test_injected_response_parameter_stays_out_of_the_schema():
+    operation = app.openapi()["paths"]["/item"]["get"]
+
+    assert "parameters" not in operation
+    schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/Item"}
+
+
+def test_model_json_response_renders_models_and_plain_content():
+    model = ModelJSONResponse(ITEM)
+    assert json.loads(model.body)["internalSecret"] == "s3"
+
+    plain = ModelJSONResponse({"ok": True, "items": [1, 2]})
+    assert json.loads(plain.body) == {"ok": True, "items": [1, 2]}
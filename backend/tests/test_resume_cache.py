@@ -0,0 +1,287 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+from pymongo.errors import OperationFailure
+
+from src import cache as lru
+from src.routers.resumes import cache, service
+from src.routers.resumes.cache import CHANGE_STREAM_UNSUPPORTED, ResumeCache
+from src.routers.resumes.models import Resume, ResumeUpdate
+
+
+pytestmark = pytest.mark.anyio
+
+UPDATED_AT = datetime(2025, 3, 1, 12, 0)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lru.time, "monotonic", clock)
+    return clock
+
+
+class FakeResume(SimpleNamespace):
+    def __init__(self, resumes, **fields):
+        super().__init__(**fields)
+        self._resumes = resumes
+
+    async def delete(self):
+        del self._resumes[self.id]
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Resumes in the fake database by ID, and the IDs read from it."""
+    resumes = {}
+    reads = []
+
+    async def get(cls, resume_id):
+        reads.append(resume_id)
+        resume = resumes.get(resume_id)
+        # Each read returns a new object, as Beanie does.
+        return FakeResume(resumes, **vars(resume)) if resume else None
+
+    monkeypatch.setattr(Resume, "get", classmethod(get))
+    return SimpleNamespace(resumes=resumes, reads=reads)
+
+
+def add_resume(stored, name="Backend CV", updated_at=UPDATED_AT) -> str:
+    resume_id = str(PydanticObjectId())
+    stored.resumes[resume_id] = SimpleNamespace(
+        id=resume_id, name=name, updated_at=updated_at
+    )
+    return resume_id
+
+
+async def test_reads_go_through_the_cache(stored):
+    resume_cache = ResumeCache()
+    resume_id = add_resume(stored)
+
+    first = await resume_cache.get(resume_id)
+    second = await resume_cache.get(resume_id)
+
+    assert first is second
+    assert stored.reads == [resume_id]
+    stats = resume_cache.stats().cache
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+async def test_missing_resumes_are_not_cached(stored):
+    resume_cache = ResumeCache()
+    resume_id = str(PydanticObjectId())
+
+    assert await resume_cache.get(resume_id) is None
+    assert await resume_cache.get(resume_id) is None
+    assert stored.reads == [resume_id, resume_id]
+
+
+async def test_least_recently_used_resume_is_evicted(stored):
+    resume_cache = ResumeCache(maxsize=2)
+    first, second, third = (add_resume(stored) for _ in range(3))
+
+    await resume_cache.get(first)
+    await resume_cache.get(second)
+    await resume_cache.get(first)
+    await resume_cache.get(third)
+    stored.reads.clear()
+
+    await resume_cache.get(first)
+    await resume_cache.get(third)
+    assert stored.reads == []
+    await resume_cache.get(second)
+    assert stored.reads == [second]
+
+
+async def test_entries_expire_after_the_ttl(stored, clock):
+    resume_cache = ResumeCache(ttl=300)
+    resume_id = add_resume(stored)
+
+    await resume_cache.get(resume_id)
+    clock.now += 299
+    await resume_cache.get(resume_id)
+    assert len(stored.reads) == 1
+
+    clock.now += 2
+    await resume_cache.get(resume_id)
+    assert len(stored.reads) == 2
+
+
+async def test_invalidation_skips_versions_the_cache_already_holds(stored):
+    resume_cache = ResumeCache()
+    resume_id = add_resume(stored)
+    await resume_cache.get(resume_id)
+
+    # The change stream reporting our own write of the cached version.
+    resume_cache.invalidate(resume_id, UPDATED_AT)
+    assert resume_cache.invalidations == 0
+
+    resume_cache.invalidate(resume_id, UPDATED_AT + timedelta(seconds=1))
+    assert resume_cache.invalidations == 1
+    await resume_cache.get(resume_id)
+    assert len(stored.reads) == 2
+
+
+async def test_reads_that_overlap_an_invalidation_are_not_cached(stored, monkeypatch):
+    resume_cache = ResumeCache()
+    resume_id = add_resume(stored)
+    read = Resume.get
+
+    async def get_then_invalidate(cls, resume_id):
+        resume = await read(resume_id)
+        resume_cache.invalidate(resume_id)
+        return resume
+
+    monkeypatch.setattr(Resume, "get", classmethod(get_then_invalidate))
+    assert await resume_cache.get(resume_id) is not None
+    assert resume_cache.stats().cache.size == 0
+
+
+class FakeField:
+    def __eq__(self, value):
+        return str(value)
+
+
+class FakeQuery:
+    def __init__(self, stored, resume_id):
+        self.stored = stored
+        self.resume_id = resume_id
+
+    async def update(self, update, response_type):
+        resume = self.stored.resumes.get(self.resume_id)
+        if resume is None:
+            return None
+        for field, value in update["$set"].items():
+            setattr(resume, field, value)
+        return resume
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, stored):
+    """A fresh shared cache, with updates and deletes going to `stored`."""
+    resume_cache = ResumeCache()
+    monkeypatch.setattr(cache, "resume_cache", resume_cache)
+    # Beanie sets the query fields of a document class at init.
+    monkeypatch.setattr(Resume, "id", FakeField(), raising=False)
+    monkeypatch.setattr(
+        Resume,
+        "find_one",
+        classmethod(lambda cls, resume_id: FakeQuery(stored, resume_id)),
+    )
+    monkeypatch.setattr(service, "invalidate_resume_analyses", lambda resume_id: None)
+    return resume_cache
+
+
+async def test_updates_evict_the_cached_resume(stored, shared_cache):
+    resume_id = add_resume(stored)
+    assert (await service.fetch_resume_by_id(resume_id)).name == "Backend CV"
+
+    await service.update_resume(resume_id, ResumeUpdate(name="Frontend CV"))
+
+    assert shared_cache.invalidations == 1
+    assert (await service.fetch_resume_by_id(resume_id)).name == "Frontend CV"
+    assert stored.reads == [resume_id, resume_id]
+
+
+async def test_deletes_evict_the_cached_resume(stored, shared_cache):
+    resume_id = add_resume(stored)
+    await service.fetch_resume_by_id(resume_id)
+
+    await service.delete_resume_by_id(resume_id)
+
+    assert shared_cache.stats().cache.size == 0
+    with pytest.raises(service.ResumeNotFoundError):
+        await service.fetch_resume_by_id(resume_id)
+
+
+class FakeChangeStream:
+    """An open change stream fed from a queue."""
+
+    def __init__(self):
+        self.changes = asyncio.Queue()
+        self.opened = asyncio.Event()
+
+    def watch(self, pipeline):
+        self.opened.set()
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        while True:
+            yield await self.changes.get()
+
+
+def change(resume_id: str, operation: str, updated_at=None) -> dict:
+    event = {
+        "operationType": operation,
+        "documentKey": {"_id": PydanticObjectId(resume_id)},
+    }
+    if updated_at is not None:
+        event["updateDescription"] = {"updatedFields": {"updated_at": updated_at}}
+    return event
+
+
+def watch_with(monkeypatch, watch):
+    monkeypatch.setattr(
+        Resume,
+        "get_pymongo_collection",
+        classmethod(lambda cls: SimpleNamespace(watch=watch)),
+    )
+
+
+async def test_change_stream_evicts_resumes_changed_elsewhere(stored, monkeypatch):
+    resume_cache = ResumeCache()
+    stream = FakeChangeStream()
+    watch_with(monkeypatch, stream.watch)
+    watcher = asyncio.create_task(resume_cache.watch())
+    await stream.opened.wait()
+
+    ours, theirs, deleted = (add_resume(stored) for _ in range(3))
+    for resume_id in (ours, theirs, deleted):
+        await resume_cache.get(resume_id)
+    stream.changes.put_nowait(change(ours, "update", UPDATED_AT))
+    stream.changes.put_nowait(
+        change(theirs, "update", UPDATED_AT + timedelta(minutes=1))
+    )
+    stream.changes.put_nowait(change(deleted, "delete"))
+    while not stream.changes.empty():
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    watcher.cancel()
+    await asyncio.gather(watcher, return_exceptions=True)
+
+    assert resume_cache.change_stream is True
+    assert resume_cache.invalidations == 2
+    stored.reads.clear()
+    for resume_id in (ours, theirs, deleted):
+        await resume_cache.get(resume_id)
+    assert stored.reads == [theirs, deleted]
+
+
+async def test_watch_gives_up_without_change_streams(monkeypatch):
+    resume_cache = ResumeCache()
+
+    def watch(pipeline):
+        raise OperationFailure("not a replica set", code=CHANGE_STREAM_UNSUPPORTED)
+
+    watch_with(monkeypatch, watch)
+
+    await asyncio.wait_for(resume_cache.watch(), timeout=1)
+    assert resume_cache.change_stream is False
@@ -0,0 +1,164 @@
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+
+from src.routers.job_application.models import (
+    JobApplication,
+    job_application_search_terms,
+)
+from src.routers.resumes import service as resume_service
+from src.routers.resumes.models import Resume, ResumeUpdate, resume_search_terms
+from src.search import (
+    MAX_PREFIX_LENGTH,
+    build_search_terms,
+    normalize_words,
+    replace_search_terms,
+    search_filter,
+)
+
+
+def matches(terms: list[str], key: str, text: str) -> bool:
+    return set(search_filter(key, text)) <= set(terms)
+
+
+def test_words_are_casefolded_and_stripped_of_accents():
+    assert normalize_words("Ingénieur Logiciel, STRASSE/Straße-C++") == [
+        "ingenieur",
+        "logiciel",
+        "strasse",
+        "strasse",
+        "c",
+    ]
+    assert normalize_words(None) == normalize_words("") == []
+
+
+def test_every_prefix_of_every_word_is_a_term():
+    assert build_search_terms({"t": "Data Engineer", "c": None}) == sorted(
+        ["t:d", "t:da", "t:dat", "t:data"]
+        + ["t:e", "t:en", "t:eng", "t:engi", "t:engin", "t:engine"]
+        + ["t:enginee", "t:engineer"]
+    )
+
+
+def test_long_words_are_cut_to_the_longest_prefix():
+    word = "a" * (MAX_PREFIX_LENGTH + 10)
+    terms = build_search_terms({"t": word})
+
+    assert len(terms) == MAX_PREFIX_LENGTH
+    assert search_filter("t", word) == [f"t:{'a' * MAX_PREFIX_LENGTH}"]
+    assert matches(terms, "t", word)
+
+
+def test_search_matches_word_prefixes_in_any_order_and_case():
+    terms = job_application_search_terms("Senior Data Engineer", "Acme Corp")
+
+    assert matches(terms, "job_title", "data")
+    assert matches(terms, "job_title", "ENG sen")
+    assert matches(terms, "company_name", "acm")
+    assert not matches(terms, "job_title", "acme")
+    assert not matches(terms, "job_title", "data scientist")
+    assert search_filter("job_title", "  ") == []
+
+
+def test_documents_fill_their_terms_before_they_are_written():
+    resume = SimpleNamespace(name="Backend Résumé")
+    Resume.update_search_terms(resume)
+    assert resume.search_terms == resume_search_terms("Backend Résumé")
+    assert matches(resume.search_terms, "name", "resume back")
+
+    application = SimpleNamespace(job_title="Data Engineer", company_name="Acme")
+    JobApplication.update_search_terms(application)
+    assert application.search_terms == job_application_search_terms(
+        "Data Engineer", "Acme"
+    )
+
+
+def test_replacing_a_fields_terms_drops_its_old_prefixes(update_pipeline):
+    document = {
+        "job_title": "Data Engineer",
+        "company_name": "Acme",
+        "search_terms": job_application_search_terms("Data Engineer", "Acme"),
+    }
+
+    renamed = update_pipeline(
+        document,
+        [
+            {
+                "$set": {
+                    "job_title": {"$literal": "Platform Lead"},
+                    "search_terms": replace_search_terms(
+                        {"job_title": "Platform Lead"}
+                    ),
+                }
+            }
+        ],
+    )
+
+    terms = renamed["search_terms"]
+    assert terms == job_application_search_terms("Platform Lead", "Acme")
+    assert matches(terms, "job_title", "plat")
+    assert not matches(terms, "job_title", "data")
+    assert not matches(terms, "job_title", "eng")
+    assert matches(terms, "company_name", "acme")
+
+
+def test_replacing_terms_of_a_document_that_has_none(update_pipeline):
+    stage = {"$set": {"search_terms": replace_search_terms({"company_name": "Acme"})}}
+
+    terms = update_pipeline({}, [stage])["search_terms"]
+
+    assert terms == build_search_terms({"company_name": "Acme"})
+
+
+class FakeField:
+    def __eq__(self, value):
+        return ("_id", value)
+
+
+class FakeResumeQuery:
+    def __init__(self, updates):
+        self.updates = updates
+
+    async def update(self, update, response_type):
+        self.updates.append(update)
+        return SimpleNamespace(**update["$set"])
+
+
+@pytest.fixture
+def resume_updates(monkeypatch):
+    updates = []
+    # Beanie sets the query fields of a document class at init.
+    monkeypatch.setattr(Resume, "id", FakeField(), raising=False)
+    monkeypatch.setattr(
+        Resume, "find_one", classmethod(lambda cls, *args: FakeResumeQuery(updates))
+    )
+    monkeypatch.setattr(resume_service, "invalidate_resume", lambda resume_id: None)
+    monkeypatch.setattr(
+        resume_service, "invalidate_resume_analyses", lambda resume_id: None
+    )
+    return updates
+
+
+@pytest.mark.anyio
+async def test_renaming_a_resume_replaces_its_search_terms(resume_updates):
+    resume_id = str(PydanticObjectId())
+
+    updated = await resume_service.update_resume(
+        resume_id, ResumeUpdate(name="Frontend CV")
+    )
+
+    [update] = resume_updates
+    assert update["$set"]["search_terms"] == resume_search_terms("Frontend CV")
+    assert matches(updated.search_terms, "name", "front")
+    assert not matches(updated.search_terms, "name", "back")
+
+
+@pytest.mark.anyio
+async def test_other_resume_updates_keep_the_search_terms(resume_updates):
+    await resume_service.update_resume(
+        str(PydanticObjectId()), ResumeUpdate(resume_info="Open to relocation")
+    )
+
+    [update] = resume_updates
+    assert "search_terms" not in update["$set"]